@@ -8,7 +8,6 @@ Connects to Binance for real-time BTC price data and trades
 import sys
 import os
 import asyncio
-import time
 import logging
 
 # Ensure parent is on path for utils imports
@@ -35,6 +34,10 @@ dash_handler = DashboardLogHandler(buffer_size=15)
 dash_handler.setFormatter(logging.Formatter("%(asctime)s | %(message)s", datefmt="%H:%M:%S"))
 logger.addHandler(dash_handler)
 
+# Main-loop schedule (monotonic deadlines)
+TSL_CHECK_SECONDS = 10
+ACCOUNT_CHECK_SECONDS = 30
+
 
 async def main():
     mode = "PAPER" if is_paper_trading() else "LIVE"
@@ -50,22 +53,32 @@ async def main():
     ws_task = asyncio.create_task(market_data.stream_prices())
     logger.info("Bot Started. Waiting for candles...")
 
+    loop = asyncio.get_running_loop()
+    next_tsl = next_value = loop.time()
+    last_view = Dashboard.snapshot()
+
     try:
         Dashboard.render(Dashboard.layout)
         with Live(Dashboard.layout, refresh_per_second=2, screen=True) as live:
             while True:
-                Dashboard.render(Dashboard.layout)
-                Dashboard.export_state()
+                # Live redraws on its own; only rebuild the panel when values moved
+                view = Dashboard.snapshot()
+                if view != last_view:
+                    last_view = view
+                    live.update(Dashboard.render(Dashboard.layout))
+                    Dashboard.export_state(view)
                 await asyncio.sleep(0.5)
 
-                now = time.time()
-                if poly.client and (now % 10 < 1):
+                now = loop.time()
+                if poly.client and now >= next_tsl:
+                    next_tsl = now + TSL_CHECK_SECONDS
                     await poly.check_trailing_stop(
                         current_price=market_data.current_price,
                         current_atr=market_data.current_atr
                     )
 
-                if poly.client and (now % 30 < 1):
+                if poly.client and now >= next_value:
+                    next_value = now + ACCOUNT_CHECK_SECONDS
                     val = await poly.get_total_account_value()
                     if val:
                         market_data.risk.check_circuit_breaker(val)
@@ -79,11 +92,21 @@ async def main():
         ws_task.cancel()
     except Exception:
         logger.exception("Crash:")
+    finally:
+        await market_data.close()
+        await poly.aclose()
 
 
 if __name__ == "__main__":
     if sys.platform == 'win32':
         asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+    else:
+        # uvloop is optional (pip install uvloop); drives every WS stream and REST poller
+        try:
+            import uvloop
+            asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+        except ImportError:
+            pass
     try:
         asyncio.run(main())
     except KeyboardInterrupt:
@@ -2,32 +2,72 @@ import os
 import time
 import json
 import math
-import requests
+import asyncio
+import aiohttp
+import logging
 import sys
 import re
 import json
 import os
-from datetime import datetime, timedelta, timezone
+from datetime import datetime, timezone
+from zoneinfo import ZoneInfo
+import numpy as np
 from strategy_utils import Indicators, BayesianPredictor
 
+# orjson is optional: Rust parser/serializer, falls back to stdlib json
+try:
+    import orjson
+
+    def _json_loads(data):
+        return orjson.loads(data)
+
+    def _json_dumps(obj):
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+except ImportError:
+    def _json_loads(data):
+        return json.loads(data)
+
+    def _json_dumps(obj):
+        return json.dumps(obj, indent=4).encode("utf-8")
+
+# --- Logging ---
+# Per-market parse chatter is DEBUG so it is dropped before formatting at INFO
+log = logging.getLogger("btc15m.strategy")
+log.setLevel(logging.INFO)
+_console = logging.StreamHandler()
+_console.setFormatter(logging.Formatter("%(message)s"))
+log.addHandler(_console)
+
 # State File
 STATE_FILE = "bot_state.json"
 
+# In-memory copy: read from disk once, mutated in place, written only on change
+_STATE = None
+_HAS_POSITION = False # Lets the TP loop bail out before any IO when flat
+
 def load_state():
-    if os.path.exists(STATE_FILE):
-        try:
-            with open(STATE_FILE, "r") as f:
-                return json.load(f)
-        except:
-            return {}
-    return {}
+    global _STATE
+    if _STATE is None:
+        _STATE = {}
+        if os.path.exists(STATE_FILE):
+            try:
+                with open(STATE_FILE, "rb") as f:
+                    _STATE = _json_loads(f.read())
+            except (OSError, ValueError) as e:
+                log.warning("⚠️ State file unreadable, starting fresh: %s", e)
+    return _STATE
 
 def save_state(state):
-    with open(STATE_FILE, "w") as f:
-        json.dump(state, f, indent=4)
+    # Write-then-rename so a crash never leaves a truncated state file
+    tmp = STATE_FILE + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(_json_dumps(state))
+    os.replace(tmp, STATE_FILE)
         
 def update_position_state(token_id, entry_price, size, side="BUY"):
+    global _HAS_POSITION
     state = load_state()
+    _HAS_POSITION = side == "BUY"
     if side == "BUY":
         # Overwrite or Average? For MVP, overwrite (assuming single active trade per 15m)
         state["current_position"] = {
@@ -37,8 +77,9 @@ def update_position_state(token_id, entry_price, size, side="BUY"):
             "timestamp": datetime.now().isoformat()
         }
     else: # SELL (Clear)
-        if "current_position" in state:
-            del state["current_position"]
+        if "current_position" not in state:
+            return # Nothing changed
+        del state["current_position"]
     save_state(state)
 
 # --- CLOB Client Setup ---
@@ -47,7 +88,7 @@ try:
     from py_clob_client.clob_types import OrderArgs, OrderType
     from py_clob_client.order_builder.constants import BUY, SELL
 except ImportError:
-    print("❌ py-clob-client not installed.")
+    log.error("❌ py-clob-client not installed.")
     sys.exit(1)
 
 # --- Configuration ---
@@ -61,7 +102,7 @@ PRIVATE_KEY = os.getenv("POLYGON_PRIVATE_KEY")
 FUNDER_ADDRESS = os.getenv("PROXY_WALLET_ADDRESS") 
 
 if not PRIVATE_KEY:
-    print("❌ POLYGON_PRIVATE_KEY not found in .env")
+    log.error("❌ POLYGON_PRIVATE_KEY not found in .env")
     # Fallback removed for security
     pass
 
@@ -75,15 +116,50 @@ CANDLE_LIMIT = 200 # For accurate EMA/RSI
 
 # Indicators moved to strategy_utils.py
 
+# --- HTTP Session ---
+# One pooled keep-alive session for Binance + Gamma (created inside the running loop)
+_SESSION = None
+_HTTP_HEADERS = {"Accept-Encoding": "gzip, deflate", "User-Agent": "btc15m/1.0"}
+_HTTP_RETRIES = 2
+_HTTP_BACKOFF = 0.2
+
+def get_session():
+    global _SESSION
+    if _SESSION is None or _SESSION.closed:
+        _SESSION = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=8, limit_per_host=4, ttl_dns_cache=300, keepalive_timeout=75),
+            timeout=aiohttp.ClientTimeout(total=10),
+            headers=_HTTP_HEADERS,
+        )
+    return _SESSION
+
+async def close_session():
+    global _SESSION
+    if _SESSION is not None and not _SESSION.closed:
+        await _SESSION.close()
+    _SESSION = None
+
+async def _get_json(url, params=None):
+    # Retry transient failures (connection reset, 5xx) with a short backoff
+    for attempt in range(_HTTP_RETRIES + 1):
+        try:
+            async with get_session().get(url, params=params) as resp:
+                resp.raise_for_status()
+                return _json_loads(await resp.read())
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError, aiohttp.ClientResponseError) as e:
+            if attempt == _HTTP_RETRIES:
+                raise
+            if isinstance(e, aiohttp.ClientResponseError) and e.status < 500:
+                raise
+            await asyncio.sleep(_HTTP_BACKOFF * (2 ** attempt))
+
 # --- Data Fetching ---
-def fetch_binance_candles(symbol="BTCUSDT", interval="15m", limit=200):
+async def fetch_binance_candles(symbol="BTCUSDT", interval="15m", limit=200):
     try:
         url = f"{BINANCE_API_URL}?symbol={symbol}&interval={interval}&limit={limit}"
-        resp = requests.get(url, timeout=10)
-        resp.raise_for_status()
-        return resp.json()
+        return await _get_json(url)
     except Exception as e:
-        print(f"⚠️ Binance Error: {e}")
+        log.warning("⚠️ Binance Error: %s", e)
         return []
 
 # score_direction moved to strategy_utils.py
@@ -91,144 +167,177 @@ def fetch_binance_candles(symbol="BTCUSDT", interval="15m", limit=200):
 # --- Execution Logic ---
 GAMMA_API_URL = "https://gamma-api.polymarket.com/events"
 
-def get_btc_markets(limit=100):
+# Market title patterns (compiled once, used per market in get_btc_markets)
+_RANGE_RE = re.compile(r'\d+(?::\d+)?(?:AM|PM)?\s*-\s*\d+(?::\d+)?(?:AM|PM)')
+_TITLE_RE = re.compile(r'([A-Z][a-z]+) (\d{1,2}).*?-\s*(\d{1,2}(?::\d{2})?)([AP]M) ET')
+_ET = ZoneInfo("America/New_York") # Title times are ET (DST-aware)
+
+# Flash markets only rotate every 15 minutes: keep (bucket, parsed candidates) for the window.
+# Candidates are cached before the expiry-window check, which is re-applied on every call.
+_MKT_CACHE = None
+
+def _in_trade_window(market, now_utc):
+    """API and title expiry both in the future, title expiry 2-25 minutes away."""
+    question = market["question"]
+    if market["end_dt"] <= now_utc:
+        return False
+
+    # VALIDATION LOGIC
+    # 1. If Expiry < Now: OLD (Don't trade)
+    # 2. If Expiry > Now + 25min: FUTURE (Don't trade)
+    expiry_utc = market["expiry_utc"]
+    log.debug("      [Parsed] %s -> %s (Now: %s)", question, expiry_utc, now_utc)
+
+    # Buffer: Allow 1 minute grace? No, strict.
+    if expiry_utc < now_utc:
+        log.debug("      [Skip] Title Expired: %s", question)
+        return False
+
+    diff_minutes = (expiry_utc - now_utc).total_seconds() / 60
+    if diff_minutes < 2:
+        log.debug("      [Skip] Expires Soon: %s (%.1fm left)", question, diff_minutes)
+        return False
+
+    if diff_minutes > 25:
+        log.debug("      [Skip] Too Future: %s (+%.0f mins)", question, diff_minutes)
+        return False
+    return True
+
+async def get_btc_markets(limit=100):
+    global _MKT_CACHE
+    # Filter for markets expiring in the future (removes 2025 zombies)
+    now_utc = datetime.now(timezone.utc)
+    bucket = int(now_utc.timestamp() // 900)
+    if _MKT_CACHE and _MKT_CACHE[0] == bucket:
+        return [m for m in _MKT_CACHE[1] if _in_trade_window(m, now_utc)]
+
     try:
-        # Filter for markets expiring in the future (removes 2025 zombies)
-        now_utc = datetime.now(timezone.utc)
-        
-        resp = requests.get(GAMMA_API_URL, params={
+        events = await _get_json(GAMMA_API_URL, params={
             "limit": 500, "active": "true", "archived": "false", "closed": "false",
             "order": "endDate", "ascending": "true", # Soonest Expiry
             "end_date_min": now_utc.isoformat()
         })
-        resp.raise_for_status()
-        events = resp.json()
     except Exception as e:
-        print(f"Error fetching markets: {e}")
+        log.warning("Error fetching markets: %s", e)
         return []
 
-    targets = []
+    parsed = []
     
-    for event in events:
-        markets = event.get("markets", [])
-        for market in markets:
-            question = market.get("question", "")
-            
-            if "Bitcoin" not in question and "BTC" not in question: continue
+    # Cheap substring pre-filter in one pass; only BTC flash questions reach the regexes
+    candidates = [
+        m for e in events for m in e.get("markets", ())
+        if ("Bitcoin" in (q := m.get("question", "")) or "BTC" in q) and "Up or Down" in q
+    ]
+    
+    # Parse for "Up or Down" (Flash) ONLY
+    # Format: "Bitcoin Up or Down - January 30, 3PM ET"
+    for market in candidates:
+        question = market["question"]
+        
+        # Token IDs
+        raw_tokens = market.get("clobTokenIds")
+        if not raw_tokens: continue
+        if isinstance(raw_tokens, str): tokens = _json_loads(raw_tokens)
+        else: tokens = raw_tokens
+        if len(tokens) != 2: continue
+        
+        # STRICT FILTER: Must be "15m" type (Time Range "X-Y")
+        # Ex: "10:00AM-10:15AM" or "6PM-6:15PM" or "6:45-7PM"
+        # Excludes "6PM ET" (Hourly/Daily)
+        # Regex: Digits(:Digits)? (AM/PM)? - Digits(:Digits)? (AM/PM)
+        if not _RANGE_RE.search(question):
+            # log.debug("      [Skip] Not a 15m Range: %s", question)
+            continue
+        
+        # Check Expiry
+        end_date_str = market.get("endDate") # ISO 8601
+        if not end_date_str: continue
+        
+        # Simple ISO parse (Python 3.11+ handles Z, 3.10 might need replace)
+        end_date_str = end_date_str.replace("Z", "+00:00")
+        end_dt = datetime.fromisoformat(end_date_str)
+        
+        # 1. Check API Expiry
+        if end_dt <= now_utc:
+            continue
             
-            # Parse for "Up or Down" (Flash) ONLY
-            # Format: "Bitcoin Up or Down - January 30, 3PM ET"
-            if "Up or Down" in question:
-                # Token IDs
-                raw_tokens = market.get("clobTokenIds")
-                if not raw_tokens: continue
-                if isinstance(raw_tokens, str): tokens = json.loads(raw_tokens)
-                else: tokens = raw_tokens
-                if len(tokens) != 2: continue
-                
-                # STRICT FILTER: Must be "15m" type (Time Range "X-Y")
-                # Ex: "10:00AM-10:15AM" or "6PM-6:15PM" or "6:45-7PM"
-                # Excludes "6PM ET" (Hourly/Daily)
-                # Regex: Digits(:Digits)? (AM/PM)? - Digits(:Digits)? (AM/PM)
-                if not re.search(r'\d+(?::\d+)?(?:AM|PM)?\s*-\s*\d+(?::\d+)?(?:AM|PM)', question):
-                    # print(f"      [Skip] Not a 15m Range: {question}")
-                    continue
+        # 2. STRICT TITLE CHECK (Source of Truth)
+        # Parse: "January 30, ... X PM ET"
+        try:
+            # Regex to find Date and END Time (After the dash)
+            # Matches: "January 30" ... "- 7PM ET" or "- 6:15PM ET"
+            match = _TITLE_RE.search(question)
+            if match:
+                month_str, day_str, time_str, ampm_str = match.groups()
                 
-                # Check Expiry
-                end_date_str = market.get("endDate") # ISO 8601
-                if not end_date_str: continue
+                # Parse Month
+                try:
+                    month = datetime.strptime(month_str, "%B").month
+                except:
+                    continue # Fail safe
+                    
+                # Parse Time
+                # 6PM -> 6:00, 6:45PM -> 6:45
+                if ":" in time_str:
+                    h, m = map(int, time_str.split(":"))
+                else:
+                    h = int(time_str)
+                    m = 0
+                    
+                # 12AM -> 0, 12PM -> 12, 1-11PM -> 13-23
+                h = (h % 12) + (12 if ampm_str == "PM" else 0)
                 
-                # Simple ISO parse (Python 3.11+ handles Z, 3.10 might need replace)
-                end_date_str = end_date_str.replace("Z", "+00:00")
-                end_dt = datetime.fromisoformat(end_date_str)
-                now_utc = datetime.now(timezone.utc)
+                # Construct Expiry DT in ET, then convert to UTC
+                # Note: We assume current year.
+                year = now_utc.year
+                # Handle Year Rollover (Dec market in Jan) - Unlikely for flash
                 
-                # 1. Check API Expiry
-                if end_dt <= now_utc:
-                    continue
-                    
-                # 2. STRICT TITLE CHECK (Source of Truth)
-                # Parse: "January 30, ... X PM ET"
-                try:
-                    # Regex to find Date and END Time (After the dash)
-                    # Matches: "January 30" ... "- 7PM ET" or "- 6:15PM ET"
-                    match = re.search(r'([A-Z][a-z]+) (\d{1,2}).*?-\s*(\d{1,2}(?::\d{2})?)([AP]M) ET', question)
-                    if match:
-                        month_str, day_str, time_str, ampm_str = match.groups()
-                        
-                        # Parse Month
-                        try:
-                            month = datetime.strptime(month_str, "%B").month
-                        except:
-                            continue # Fail safe
-                            
-                        # Parse Time
-                        # 6PM -> 6:00, 6:45PM -> 6:45
-                        if ":" in time_str:
-                            h, m = map(int, time_str.split(":"))
-                        else:
-                            h = int(time_str)
-                            m = 0
-                            
-                        if ampm_str == "PM" and h != 12: h += 12
-                        if ampm_str == "AM" and h == 12: h = 0
-                        
-                        # Construct Expiry DT (ET Timezone approx UTC-5)
-                        # Note: We assume current year.
-                        year = now_utc.year
-                        # Handle Year Rollover (Dec market in Jan) - Unlikely for flash
-                        
-                        # Create naive then force UTC-5
-                        # ET is UTC-5 (Standard) or UTC-4 (DST). Jan is Standard.
-                        # We used fixed offset for simplicity or safe buffer.
-                        # Better: Use UTC and adjust. 6PM ET = 23:00 UTC.
-                        expiry_et = datetime(year, month, int(day_str), h, m)
-                        expiry_utc = expiry_et + timedelta(hours=5) # Add 5h to ET to get UTC
-                        expiry_utc = expiry_utc.replace(tzinfo=timezone.utc)
-                        
-                        # VALIDATION LOGIC
-                        # 1. If Expiry < Now: OLD (Don't trade)
-                        # 2. If Expiry > Now + 20min: FUTURE (Don't trade)
-                        
-                        # Debug Parse Result
-                        print(f"      [Parsed] {question} -> {expiry_utc} (Now: {now_utc})")
-                        
-                        # Buffer: Allow 1 minute grace? No, strict.
-                        if expiry_utc < now_utc:
-                             print(f"      [Skip] Title Expired: {question}")
-                             continue
-                            
-                        diff_minutes = (expiry_utc - now_utc).total_seconds() / 60
-                        if diff_minutes < 2:
-                             print(f"      [Skip] Expires Soon: {question} ({diff_minutes:.1f}m left)")
-                             continue
-                             
-                        if diff_minutes > 25:
-                             print(f"      [Skip] Too Future: {question} (+{diff_minutes:.0f} mins)")
-                             continue
-                            
-                    else:
-                        print(f"      [Skip] Regex Failed to Match: {question}")
-                        continue # STRICT MODE: If we can't parse title, don't trust it.
-                        
-                except Exception as parse_e:
-                    print(f"      [Error] Parse Exception: {parse_e} - SKIPPING")
-                    continue # IMPORTANT: If parsing fails, DO NOT trade. Skip.
+                expiry_et = datetime(year, month, int(day_str), h, m, tzinfo=_ET)
+                expiry_utc = expiry_et.astimezone(timezone.utc)
                     
-                targets.append({
-                    "question": question,
-                    "strike": 0, 
-                    "yes_id": tokens[0],
-                    "no_id": tokens[1],
-                    "type": "flash_up_down",
-                    "end_dt": end_dt
-                })
+            else:
+                log.debug("      [Skip] Regex Failed to Match: %s", question)
+                continue # STRICT MODE: If we can't parse title, don't trust it.
+                
+        except Exception as parse_e:
+            log.debug("      [Error] Parse Exception: %s - SKIPPING", parse_e)
+            continue # IMPORTANT: If parsing fails, DO NOT trade. Skip.
+            
+        parsed.append({
+            "question": question,
+            "strike": 0, 
+            "yes_id": tokens[0],
+            "no_id": tokens[1],
+            "type": "flash_up_down",
+            "end_dt": end_dt,
+            "expiry_utc": expiry_utc
+        })
 
     # Sort targets by Expiry (Soonest First) to catch the current 15m window
     # instead of tomorrow's window.
-    targets.sort(key=lambda x: x.get("end_dt", datetime.max.replace(tzinfo=timezone.utc)))
+    parsed.sort(key=lambda x: x.get("end_dt", datetime.max.replace(tzinfo=timezone.utc)))
     
-    return targets
+    # Don't pin an empty result for the whole window (market may list late)
+    if parsed:
+        _MKT_CACHE = (bucket, parsed)
+    return [m for m in parsed if _in_trade_window(m, now_utc)]
+
+# --- Order Book Cache ---
+# Reuse a book fetched within the last second (TP check -> sell, signal -> buy).
+# Top of book is parsed from the string prices once per fetch and cached with it.
+_OB_CACHE = {}
+_OB_TTL = 1.0
+
+def _get_ob(client, token_id):
+    """Return (ob, best_bid, best_ask); a side's price is None when it is empty."""
+    entry = _OB_CACHE.get(token_id)
+    if entry and time.monotonic() - entry[0] < _OB_TTL:
+        return entry[1:]
+    ob = client.get_order_book(token_id)
+    best_bid = max(map(float, (b.price for b in ob.bids)), default=None)
+    best_ask = min(map(float, (a.price for a in ob.asks)), default=None)
+    _OB_CACHE[token_id] = (time.monotonic(), ob, best_bid, best_ask)
+    return ob, best_bid, best_ask
 
 def get_position_balance(clob_client, token_id):
     if not clob_client: return 0.0
@@ -248,15 +357,14 @@ def get_position_balance(clob_client, token_id):
 def sell_position(client, token_id, amount):
     try:
         # Check limit price (Sell into Bid)
-        ob = client.get_order_book(token_id)
-        if not ob.bids:
-            print("   ⚠️ No Bids to sell into.")
+        _, best_bid, _ = _get_ob(client, token_id)
+        if best_bid is None:
+            log.warning("   ⚠️ No Bids to sell into.")
             return
             
-        best_bid = float(ob.bids[0].price)
         limit_price = max(best_bid - 0.02, 0.01) # Aggressive sell
         
-        print(f"   🔻 SELLING {amount} Shares @ {limit_price}...")
+        log.info("   🔻 SELLING %s Shares @ %s...", amount, limit_price)
         resp = client.create_and_post_order(
             OrderArgs(
                 price=limit_price,
@@ -265,16 +373,16 @@ def sell_position(client, token_id, amount):
                 token_id=token_id
             )
         )
-        print(f"   ✅ Sell Order Sent! ID: {resp.get('orderID')}")
+        log.info("   ✅ Sell Order Sent! ID: %s", resp.get('orderID'))
         
         # Update State
         update_position_state(token_id, 0, 0, side="SELL")
         
     except Exception as e:
-        print(f"   ❌ Sell Failed: {e}")
+        log.error("   ❌ Sell Failed: %s", e)
 
-def check_take_profit(client):
-    if not client: return
+async def check_take_profit(client):
+    if not client or not _HAS_POSITION: return
     
     state = load_state()
     pos = state.get("current_position")
@@ -285,7 +393,7 @@ def check_take_profit(client):
     size = pos["size"]
     
     # 1. Check if we still hold it (in case manual sell or expire)
-    real_bal = get_position_balance(client, token_id)
+    real_bal = await asyncio.to_thread(get_position_balance, client, token_id)
     if real_bal < 0.1:
         # We lost it? Clear state
         update_position_state(token_id, 0, 0, side="SELL")
@@ -293,17 +401,14 @@ def check_take_profit(client):
 
     # 2. Check Price
     try:
-        ob = client.get_order_book(token_id)
-        if not ob.bids: 
-            print(f"   ⚠️ TP Check: No Liquidity (Bid 0.00). Asks: {[a.price for a in ob.asks[:3]]}")
+        # Book order is not guaranteed: best bid is the max, not bids[0] (Fix PnL Bug)
+        ob, best_bid, _ = await asyncio.to_thread(_get_ob, client, token_id)
+        if best_bid is None: 
+            log.warning("   ⚠️ TP Check: No Liquidity (Bid 0.00). Asks: %s", [a.price for a in ob.asks[:3]])
             return
-            
-        # SORTING CRITICAL (Fix PnL Bug)
-        sorted_bids = sorted(ob.bids, key=lambda x: float(x.price), reverse=True)
-        best_bid = float(sorted_bids[0].price)
         
         # DEBUG: Print Book
-        # print(f"      [Book] Bids: {[b.price for b in ob.bids[:3]]}")
+        # log.debug("      [Book] Bids: %s", [b.price for b in ob.bids[:3]])
         
         # Calc ROI
         if entry_price <= 0: return # div by zero
@@ -311,24 +416,23 @@ def check_take_profit(client):
         roi_pct = roi * 100
         
         # Periodic Status (Use simple counter or time check to avoid spam?)
-        print(f"   💰 Holding: {size} @ {entry_price:.2f} | Bid: {best_bid:.2f} | PnL: {roi_pct:+.2f}%")
+        log.info("   💰 Holding: %s @ %.2f | Bid: %.2f | PnL: %+.2f%%", size, entry_price, best_bid, roi_pct)
         
         # TARGET: 10% (User requested increase)
         # Logic: If Gain > 10% OR (Safety: Gain < -20%?) No, hold.
         if roi_pct >= 10.0:
-            print(f"   🤑 TAKE PROFIT TRIGGERED! (+{roi_pct:.2f}%)")
-            sell_position(client, token_id, real_bal)
+            log.info("   🤑 TAKE PROFIT TRIGGERED! (+%.2f%%)", roi_pct)
+            await asyncio.to_thread(sell_position, client, token_id, real_bal)
             
     except Exception as e:
-        print(f"   ⚠️ TP Check Error: {e}")
+        log.warning("   ⚠️ TP Check Error: %s", e)
 
-def execute_signal(direction, current_price, client):
+async def execute_signal(direction, current_price, client, markets):
     if not client: 
-        print("   ⚠️ No Client (Dry Run Mode)")
+        log.warning("   ⚠️ No Client (Dry Run Mode)")
         return
         
-    print(f"   🔎 Searching for best market to trade {direction}...")
-    markets = get_btc_markets(50)
+    log.info("   🔎 Searching for best market to trade %s...", direction)
     
     # Filter for ATM (At The Money)
     # We want closest strike to current price
@@ -345,15 +449,15 @@ def execute_signal(direction, current_price, client):
                 best_market = m
             
     if best_market:
-        print(f"   ⚡ Found Target Market: {best_market['question']}")
+        log.info("   ⚡ Found Target Market: %s", best_market['question'])
             
     if not best_market:
-        print("   ❌ No suitable market found.")
+        log.warning("   ❌ No suitable market found.")
         return
         
-    print(f"   🎯 Target: {best_market['question']} (Strike: {best_market['strike']})")
+    log.info("   🎯 Target: %s (Strike: %s)", best_market['question'], best_market['strike'])
     
-    print(f"   🎯 Target: {best_market['question']} (Strike: {best_market['strike']})")
+    log.info("   🎯 Target: %s (Strike: %s)", best_market['question'], best_market['strike'])
     
     # IDs
     yes_id = best_market['yes_id']
@@ -363,17 +467,28 @@ def execute_signal(direction, current_price, client):
     target_token_id = yes_id if direction == "UP" else no_id
     opposing_token_id = no_id if direction == "UP" else yes_id
     
+    # Both balances + the target book are independent: fetch them concurrently
+    try:
+        opposing_bal, bal, book = await asyncio.gather(
+            asyncio.to_thread(get_position_balance, client, opposing_token_id),
+            asyncio.to_thread(get_position_balance, client, target_token_id),
+            asyncio.to_thread(_get_ob, client, target_token_id),
+        )
+        ob, _, best_ask = book
+    except Exception as e:
+        log.error("   ❌ Execution Failed: %s", e)
+        return
+    
     # 1. Check & Sell Opposing Position (Hedge/Flip)
-    opposing_bal = get_position_balance(client, opposing_token_id)
     if opposing_bal > 0.1:
-        print(f"   🔄 FLIP: Holding {opposing_bal} of WRONG side. Selling first...")
-        sell_position(client, opposing_token_id, opposing_bal)
-        time.sleep(2) # Wait for processing
+        log.info("   🔄 FLIP: Holding %s of WRONG side. Selling first...", opposing_bal)
+        await asyncio.to_thread(sell_position, client, opposing_token_id, opposing_bal)
+        await asyncio.sleep(2) # Wait for processing
+        ob = None # Book is stale after the wait
         
     # 2. Check Target Position
-    bal = get_position_balance(client, target_token_id)
     if bal >= 5.0:
-        print(f"   🛡️ Safety: Already own {bal} shares of Correct Side. Holding.")
+        log.info("   🛡️ Safety: Already own %s shares of Correct Side. Holding.", bal)
         return
         
     # 3. Execute Buy logic
@@ -389,39 +504,25 @@ def execute_signal(direction, current_price, client):
         # But Client.create_market_order requires Level 1? We have Level 2.
         
         # Checking Orderbook for Price
-        ob = client.get_order_book(token_id)
-        if not ob.asks:
-            print("   ⚠️ No Asks in Orderbook.")
+        if ob is None:
+            ob, _, best_ask = await asyncio.to_thread(_get_ob, client, token_id)
+        if best_ask is None:
+            log.warning("   ⚠️ No Asks in Orderbook.")
             return
             
-        best_ask = float(ob.asks[0].price)
-        print(f"   💲 Best Ask: {best_ask}")
+        log.debug("      [Debug] Raw Asks: %s", [a.price for a in ob.asks[:3]])
         
-        if best_ask > 0.99:
-            print("   ⚠️ Price too high (>0.99). Skipping.")
-            return
-            
-        print(f"      [Debug] Raw Asks: {[a.price for a in ob.asks[:3]]}")
-        
-        # SORTING CRITICAL
-        sorted_asks = sorted(ob.asks, key=lambda x: float(x.price))
-        sorted_bids = sorted(ob.bids, key=lambda x: float(x.price), reverse=True)
-        
-        if not sorted_asks:
-             print("   ⚠️ No Asks after sort.")
-             return
-
-        best_ask = float(sorted_asks[0].price)
-        print(f"   💲 Best Ask (Real): {best_ask}")
+        log.info("   💲 Best Ask (Real): %s", best_ask)
         
         if best_ask > 0.99:
-            print("   ⚠️ Price too high (>0.99). Skipping.")
+            log.warning("   ⚠️ Price too high (>0.99). Skipping.")
             return
 
         limit_price = min(best_ask + 0.02, 0.99)
         
-        print(f"   💸 Placing Buy for 6.0 Shares @ {limit_price} (est fill: {best_ask})...")
-        resp = client.create_and_post_order(
+        log.info("   💸 Placing Buy for 6.0 Shares @ %s (est fill: %s)...", limit_price, best_ask)
+        resp = await asyncio.to_thread(
+            client.create_and_post_order,
             OrderArgs(
                 price=limit_price,
                 size=6.0,
@@ -429,7 +530,7 @@ def execute_signal(direction, current_price, client):
                 token_id=token_id
             )
         )
-        print(f"   ✅ Order Sent! ID: {resp.get('orderID')}")
+        log.info("   ✅ Order Sent! ID: %s", resp.get('orderID'))
         
         # Save State for TP
         # CRITICAL: Use `best_ask` (Market Price) as entry, not `limit_price` (Cap)
@@ -437,9 +538,9 @@ def execute_signal(direction, current_price, client):
         update_position_state(token_id, best_ask, 6.0, side="BUY")
         
     except Exception as e:
-        print(f"   ❌ Execution Failed: {e}")
-def main():
-    print("--- BTC 15m Strategy Bot ---")
+        log.error("   ❌ Execution Failed: %s", e)
+async def main():
+    log.info("--- BTC 15m Strategy Bot ---")
     
     # Init CLOB
     clob_client = None
@@ -454,95 +555,118 @@ def main():
             )
             creds = clob_client.create_or_derive_api_creds()
             clob_client.set_api_creds(creds)
-            print(f"✅ Executing from: {clob_client.get_address()}")
+            log.info("✅ Executing from: %s", clob_client.get_address())
         except Exception as e:
-            print(f"❌ Execution Init Failed: {e}")
+            log.error("❌ Execution Init Failed: %s", e)
             return
     else:
-        print("⚠️ No Private Key (Monitoring Only)")
+        log.warning("⚠️ No Private Key (Monitoring Only)")
 
-    print("🚀 Starting High-Frequency Logic Loop...")
+    global _HAS_POSITION
+    _HAS_POSITION = "current_position" in load_state()
+    
+    log.info("🚀 Starting High-Frequency Logic Loop...")
     
     last_strategy_check = 0
     
-    while True:
-        try:
-            # --- 1. Fast Loop: Take Profit & Management (Every 10s) ---
-            if clob_client:
-                check_take_profit(clob_client)
+    try:
+        while True:
+            try:
+                # --- 1. Fast Loop: Take Profit & Management (Every 10s) ---
+                if clob_client:
+                    await check_take_profit(clob_client)
             
-            # --- 2. Slow Loop: Strategy & Entry (Every 60s) ---
-            if time.time() - last_strategy_check > 60:
-                last_strategy_check = time.time()
+                # --- 2. Slow Loop: Strategy & Entry (Every 60s) ---
+                if time.time() - last_strategy_check > 60:
+                    last_strategy_check = time.time()
                 
-                # 1. Get Data
-                candles = fetch_binance_candles("BTCUSDT", "15m", 250)
-                if not candles:
-                    time.sleep(10)
-                    continue
+                    # 1. Get Data (Binance + Gamma overlap on the shared session)
+                    candles, markets = await asyncio.gather(
+                        fetch_binance_candles("BTCUSDT", "15m", 250),
+                        get_btc_markets(50),
+                    )
+                    if not candles:
+                        await asyncio.sleep(10)
+                        continue
                     
-                # Parse Closes for Indicators
-                closes = [float(c[4]) for c in candles]
-                current_price = closes[-1]
+                    # Parse klines once: [ts, o, h, l, c, v] strings -> float64 columns
+                    ohlcv = np.array([k[:6] for k in candles], dtype=np.float64)
+                    closes = ohlcv[:, 4]
+                    current_price = float(closes[-1])
                 
-                # 2. Calculate Indicators
-                # RSI
-                rsi = Indicators.calculate_rsi(closes)
-                rsi_prev = Indicators.calculate_rsi(closes[:-1])
-                rsi_slope = rsi - rsi_prev if (rsi and rsi_prev) else 0
+                    # 2. Calculate Indicators
+                    # RSI (single pass: previous bar's RSI is the series' second-to-last value)
+                    rsi_series = Indicators.rsi_series(closes, RSI_PERIOD)
+                    rsi = float(rsi_series[-1]) if len(closes) > RSI_PERIOD else None
+                    rsi_prev = float(rsi_series[-2]) if len(closes) > RSI_PERIOD + 1 else None
+                    rsi_slope = rsi - rsi_prev if (rsi and rsi_prev) else 0
                 
-                # MACD
-                macd = Indicators.calculate_macd(closes)
+                    # MACD
+                    macd = Indicators.calculate_macd(closes)
                 
-                # VWAP
-                vwap_series = Indicators.calculate_vwap_intraday(candles)
-                vwap = vwap_series[-1] if vwap_series else None
-                # Slope (last 3 candles)
-                vwap_slope = 0
-                if vwap_series and len(vwap_series) > 3:
-                    vwap_slope = vwap_series[-1] - vwap_series[-4]
+                    # VWAP
+                    vwap_series = Indicators.calculate_vwap_intraday(ohlcv)
+                    vwap = vwap_series[-1] if vwap_series else None
+                    # Slope (last 3 candles)
+                    vwap_slope = 0
+                    if vwap_series and len(vwap_series) > 3:
+                        vwap_slope = vwap_series[-1] - vwap_series[-4]
                 
-                # Heiken Ashi
-                ha = Indicators.calculate_heiken_ashi(candles)
+                    # Heiken Ashi
+                    ha = Indicators.calculate_heiken_ashi(ohlcv)
                 
-                # 3. Score
-                # Updated to use BayesianPredictor (Legacy score_direction removed)
-                score, predictor = BayesianPredictor.calculate_bayes_score(
-                    current_price, vwap, vwap_slope, 
-                    rsi, rsi_slope, 
-                    macd, 
-                    ha['color'], ha['count'],
-                    poly_price=None, # Not fetching poly data in sync loop for now
-                    last_close=closes[-2] if len(closes) > 1 else None
-                )
+                    # 3. Score
+                    # Updated to use BayesianPredictor (Legacy score_direction removed)
+                    score, predictor = BayesianPredictor.calculate_bayes_score(
+                        current_price, vwap, vwap_slope, 
+                        rsi, rsi_slope, 
+                        macd, 
+                        ha['color'], ha['count'],
+                        poly_price=None, # Not fetching poly data in sync loop for now
+                        last_close=float(closes[-2]) if len(closes) > 1 else None
+                    )
                 
-                # 4. Display Status in One Line
-                tstamp = datetime.now().strftime("%H:%M:%S")
+                    # 4. Display Status in One Line
+                    tstamp = time.strftime("%H:%M:%S")
                 
-                # Resolution Logic: Price(End) >= Price(Start)
-                candle_open = float(candles[-1][1])
-                gap = current_price - candle_open
-                market_state = "WINNING" if gap >= 0 else "LOSING"
+                    # Resolution Logic: Price(End) >= Price(Start)
+                    candle_open = float(ohlcv[-1, 1])
+                    gap = current_price - candle_open
+                    market_state = "WINNING" if gap >= 0 else "LOSING"
                 
-                print(f"[{tstamp}] BTC: ${current_price:,.0f} | Gap: {gap:+.2f} ({market_state}) | Score: {score:.2f} | RSI: {rsi:.1f}")
-                if vwap:
-                     print(f"            VWAP: ${vwap:,.0f} | MACD Hist: {macd['hist']:.2f} | HA: {ha['color']} x{ha['count']}")
-
-                if score >= 0.7:
-                     print("   ✅ SIGNAL: STRONG BUY (YES) - Trend Up")
-                     execute_signal("UP", current_price, clob_client)
-                elif score <= 0.3:
-                     print("   🔻 SIGNAL: STRONG SHORT (NO/Buy NO) - Trend Down")
-                     execute_signal("DOWN", current_price, clob_client)
+                    log.info("[%s] BTC: $%.0f | Gap: %+.2f (%s) | Score: %.2f | RSI: %.1f",
+                             tstamp, current_price, gap, market_state, score, rsi)
+                    if vwap:
+                         log.info("            VWAP: $%.0f | MACD Hist: %.2f | HA: %s x%s", vwap, macd['hist'], ha['color'], ha['count'])
+
+                    if score >= 0.7:
+                         log.info("   ✅ SIGNAL: STRONG BUY (YES) - Trend Up")
+                         await execute_signal("UP", current_price, clob_client, markets)
+                    elif score <= 0.3:
+                         log.info("   🔻 SIGNAL: STRONG SHORT (NO/Buy NO) - Trend Down")
+                         await execute_signal("DOWN", current_price, clob_client, markets)
                      
-            # Fast Loop (1s for Real-Time PnL)
-            time.sleep(1)
+                # Fast Loop (1s for Real-Time PnL)
+                await asyncio.sleep(1)
             
-        except Exception as e:
-            print(f"Error in loop: {e}")
-            import traceback
-            traceback.print_exc()
-            time.sleep(10)
+            except Exception as e:
+                log.exception("Error in loop: %s", e)
+                await asyncio.sleep(10)
+    finally:
+        await close_session()
+
 
 if __name__ == "__main__":
-    main()
+    if sys.platform == 'win32':
+        asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+    else:
+        # uvloop is optional (pip install uvloop); libuv-backed loop for the aiohttp traffic
+        try:
+            import uvloop
+            asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+        except ImportError:
+            pass
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
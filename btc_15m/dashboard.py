@@ -1,5 +1,10 @@
 import json
 import logging
+import os
+import queue
+import threading
+from collections import deque
+from dataclasses import dataclass, fields
 
 from rich.console import Console
 from rich.layout import Layout
@@ -9,19 +14,70 @@ from rich.align import Align
 
 from btc_15m.config import is_paper_trading, DASHBOARD_STATE_FILE
 
+# orjson is optional: serialize the bridge state straight to bytes
+try:
+    import orjson
+
+    def _json_dumps(obj):
+        return orjson.dumps(obj)
+except ImportError:
+    def _json_dumps(obj):
+        return json.dumps(obj).encode("utf-8")
+
+@dataclass(slots=True)
+class DashboardSnapshot:
+    """Strategy-derived dashboard fields; built once per run and swapped in as a whole."""
+    market_question: str = "-"
+    time_left: str = "-"
+    price_to_beat: float = 0.0
+    predict_label: str = "NEUTRAL"
+    predict_conf: float = 0.0
+    rsi_val: float = 0.0
+    rsi_arrow: str = "-"
+    macd_label: str = "-"
+    ha_label: str = "-"
+    vwap_val: float = 0.0
+    delta_1m: float = 0.0
+    delta_3m: float = 0.0
+    poly_up: float = 0.0
+    poly_down: float = 0.0
+    impulse: float = 0.0
+    entry_blocked: bool = False
+    minutes_to_expiry: float = 0.0
+
+
+_SNAPSHOT_FIELDS = tuple(f.name for f in fields(DashboardSnapshot))
+
+MODE_PAPER_MARKUP = "[bold yellow]PAPER[/]"
+MODE_LIVE_MARKUP = "[bold green]LIVE[/]"
+
+# Single-slot hand-off to a background writer: newest state wins, callers never block on disk
+_export_queue = queue.Queue(maxsize=1)
+_export_thread = None
+
+
+def _export_worker():
+    while True:
+        state = _export_queue.get()
+        try:
+            tmp = DASHBOARD_STATE_FILE + ".tmp"
+            with open(tmp, "wb") as f:
+                f.write(_json_dumps(state))
+            os.replace(tmp, DASHBOARD_STATE_FILE)
+        except Exception:
+            Dashboard._last_state_key = None  # Retry on the next export
+
 
 class DashboardLogHandler(logging.Handler):
     def __init__(self, buffer_size=10):
         super().__init__()
-        self.buffer = []
-        self.max_len = buffer_size
+        # Ring buffer sized for the largest handler; deque evicts the oldest line itself
+        if buffer_size > (Dashboard.logs.maxlen or 0):
+            Dashboard.logs = deque(Dashboard.logs, maxlen=buffer_size)
 
     def emit(self, record):
         try:
-            msg = self.format(record)
-            Dashboard.logs.append(msg)
-            if len(Dashboard.logs) > self.max_len:
-                Dashboard.logs.pop(0)
+            Dashboard.logs.append(self.format(record))
         except Exception:
             self.handleError(record)
 
@@ -29,37 +85,31 @@ class DashboardLogHandler(logging.Handler):
 class Dashboard:
     console = Console()
     layout = Layout()
-    logs = []
-
-    market_question = "-"
-    time_left = "-"
+    logs = deque(maxlen=10)
 
-    predict_label = "NEUTRAL"
-    predict_conf = 0.0
+    # Rebound (never mutated) by the strategy; readers grab one consistent reference
+    state = DashboardSnapshot()
 
-    ha_label = "-"
-    rsi_val = 0.0
-    rsi_arrow = "-"
-    macd_label = "-"
-
-    delta_1m = 0.0
-    delta_3m = 0.0
-
-    vwap_val = 0.0
     vwap_dist = 0.0
     vwap_slope = "-"
-
-    poly_up = 0.0
-    poly_down = 0.0
     liquidity = 0
-    price_to_beat = 0.0
 
+    # Tick-driven prices are written straight from the feeds
     btc_price = 0.0
     binance_price = 0.0
 
-    impulse = 0.0
-    entry_blocked = False
-    minutes_to_expiry = 0.0
+    _last_state_key = None
+
+    _render_cache_key = None
+
+    # Status panel built once; renders swap the text inside the two row cells
+    _row1 = None
+    _row2 = None
+    _panel = None
+
+    # Truncated market label, recomputed only when market_question is rebound
+    _market_question_src = None
+    _market_text = ""
 
     @staticmethod
     def render(layout=None):
@@ -69,55 +119,77 @@ class Dashboard:
         if not layout.children:
             layout.update(Panel(Align.center("Initialize..."), title="Status"))
 
-        mode_text = "[bold yellow]PAPER[/]" if is_paper_trading() else "[bold green]LIVE[/]"
-        btc_text = f"BTC: [bold white]${Dashboard.btc_price:,.0f}[/]"
+        paper = is_paper_trading()
+        s = Dashboard.state
+        key = (Dashboard.btc_price, s.market_question, s.price_to_beat,
+               s.time_left, s.predict_label, s.predict_conf, paper)
+        if key == Dashboard._render_cache_key:
+            layout.update(Dashboard._panel)
+            return layout
 
-        market_text = f"Market: [cyan]{Dashboard.market_question[:30]}...[/]"
-        strike_text = f"Strike: [bold white]${Dashboard.price_to_beat:,.0f}[/]"
-        time_text = f"Exp: [bold cyan]{Dashboard.time_left}[/]"
+        mode_text = MODE_PAPER_MARKUP if paper else MODE_LIVE_MARKUP
+        btc_text = f"BTC: [bold white]${Dashboard.btc_price:,.0f}[/]"
 
-        sig_color = "green" if "BULL" in Dashboard.predict_label else ("red" if "BEAR" in Dashboard.predict_label else "white")
-        signal_text = f"Signal: [{sig_color}]{Dashboard.predict_label}[/] ({Dashboard.predict_conf:.0f}%)"
+        if s.market_question is not Dashboard._market_question_src:
+            Dashboard._market_question_src = s.market_question
+            Dashboard._market_text = f"Market: [cyan]{s.market_question[:30]}...[/]"
+        market_text = Dashboard._market_text
+        strike_text = f"Strike: [bold white]${s.price_to_beat:,.0f}[/]"
+        time_text = f"Exp: [bold cyan]{s.time_left}[/]"
 
-        status_content = Table.grid(padding=(0, 2))
-        status_content.add_column(justify="center")
+        sig_color = "green" if "BULL" in s.predict_label else ("red" if "BEAR" in s.predict_label else "white")
+        signal_text = f"Signal: [{sig_color}]{s.predict_label}[/] ({s.predict_conf:.0f}%)"
 
-        row1 = f"{mode_text} | {btc_text} | {market_text}"
-        row2 = f"{strike_text} | {time_text} | {signal_text}"
+        if Dashboard._panel is None:
+            Dashboard._row1 = Align.center("")
+            Dashboard._row2 = Align.center("")
+            status_content = Table.grid(padding=(0, 2))
+            status_content.add_column(justify="center")
+            status_content.add_row(Dashboard._row1)
+            status_content.add_row(Dashboard._row2)
+            Dashboard._panel = Panel(status_content, title="Polymarket BTC 15m (Minimal)", border_style="blue")
 
-        status_content.add_row(Align.center(row1))
-        status_content.add_row(Align.center(row2))
+        Dashboard._row1.renderable = f"{mode_text} | {btc_text} | {market_text}"
+        Dashboard._row2.renderable = f"{strike_text} | {time_text} | {signal_text}"
 
-        layout.update(Panel(status_content, title="Polymarket BTC 15m (Minimal)", border_style="blue"))
+        Dashboard._render_cache_key = key
+        layout.update(Dashboard._panel)
 
         return layout
 
     @staticmethod
-    def export_state():
-        """Write dashboard state to JSON for the web dashboard bridge."""
-        state = {
-            "btc_price": Dashboard.btc_price,
-            "binance_price": Dashboard.binance_price,
-            "market_question": Dashboard.market_question,
-            "time_left": Dashboard.time_left,
-            "price_to_beat": Dashboard.price_to_beat,
-            "predict_label": Dashboard.predict_label,
-            "predict_conf": Dashboard.predict_conf,
-            "rsi_val": Dashboard.rsi_val,
-            "rsi_arrow": Dashboard.rsi_arrow,
-            "macd_label": Dashboard.macd_label,
-            "ha_label": Dashboard.ha_label,
-            "vwap_val": Dashboard.vwap_val,
-            "delta_1m": Dashboard.delta_1m,
-            "delta_3m": Dashboard.delta_3m,
-            "poly_up": Dashboard.poly_up,
-            "poly_down": Dashboard.poly_down,
-            "impulse": Dashboard.impulse,
-            "entry_blocked": Dashboard.entry_blocked,
-            "minutes_to_expiry": Dashboard.minutes_to_expiry,
-        }
+    def snapshot():
+        """Current dashboard values as a plain dict."""
+        s = Dashboard.state
+        view = {"btc_price": Dashboard.btc_price, "binance_price": Dashboard.binance_price}
+        for name in _SNAPSHOT_FIELDS:
+            view[name] = getattr(s, name)
+        return view
+
+    @staticmethod
+    def export_state(state=None):
+        """Queue dashboard state for the web dashboard bridge writer (skipped if unchanged)."""
+        if state is None:
+            state = Dashboard.snapshot()
+        # Compare the items themselves (not a hash, which can collide) before paying for serialization
+        key = tuple(state.items())
+        if key == Dashboard._last_state_key:
+            return
+        Dashboard._last_state_key = key
+
+        global _export_thread
+        if _export_thread is None:
+            _export_thread = threading.Thread(target=_export_worker, name="dashboard-export", daemon=True)
+            _export_thread.start()
         try:
-            with open(DASHBOARD_STATE_FILE, "w") as f:
-                json.dump(state, f)
-        except Exception:
-            pass
+            _export_queue.put_nowait(state)
+        except queue.Full:
+            # Replace the pending (older) snapshot with this one
+            try:
+                _export_queue.get_nowait()
+            except queue.Empty:
+                pass
+            try:
+                _export_queue.put_nowait(state)
+            except queue.Full:
+                pass
@@ -1,11 +1,25 @@
+import io
 import os
+import itertools
 import csv
+import atexit
 import json
 import sqlite3
+import time
 import logging
+import queue
+import threading
+from collections import deque
+from contextlib import contextmanager
 from datetime import datetime, timezone
 from filelock import FileLock
 
+# POSIX: lock the open CSV fd with flock (one syscall, no .lock sidecar); Windows keeps FileLock
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
 from btc_15m.config import (
     DB_FILE, STATE_FILE, DATA_DIR,
     TRADES_CSV, SIGNALS_CSV, POSITIONS_JSON, SETTINGS_JSON,
@@ -14,20 +28,61 @@ from btc_15m.config import (
 
 logger = logging.getLogger("bot")
 
+# orjson is optional: faster (de)serializer producing bytes, falls back to stdlib json
+try:
+    import orjson
+
+    def _json_loads(data):
+        return orjson.loads(data)
+
+    def _json_dumps(obj, pretty=True):
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else None)
+except ImportError:
+    def _json_loads(data):
+        return json.loads(data)
+
+    def _json_dumps(obj, pretty=True):
+        return json.dumps(obj, indent=2 if pretty else None).encode("utf-8")
+
 # Ensure data directory exists
 os.makedirs(DATA_DIR, exist_ok=True)
 
 # --- CSV Field Definitions ---
+# Column order here is the positional row order used by log_trade/log_signal
 TRADES_FIELDS = ["timestamp", "token_id", "side", "price", "size", "roi", "is_paper", "outcome", "market_id"]
 SIGNALS_FIELDS = ["timestamp", "price", "rsi", "atr", "score", "up", "down", "result"]
 
 
+# Second-resolution ISO prefix, reformatted only when the second changes
+_ts_cached_sec = 0
+_ts_cached_prefix = ""
+
+
+def _iso_now():
+    """UTC now as ISO 8601 with microseconds (same shape as datetime.isoformat())."""
+    global _ts_cached_sec, _ts_cached_prefix
+    t = time.time()
+    sec = int(t)
+    if sec != _ts_cached_sec:
+        _ts_cached_sec = sec
+        _ts_cached_prefix = datetime.fromtimestamp(sec, timezone.utc).strftime("%Y-%m-%dT%H:%M:%S")
+    return f"{_ts_cached_prefix}.{int((t - sec) * 1e6):06d}+00:00"
+
+
+# CSVs whose header was created/checked this process (header can't change at runtime)
+_verified_csv = set()
+
+
 def _ensure_csv(filepath, fields):
     """Create CSV with header if it doesn't exist or has no header."""
+    if filepath in _verified_csv:
+        return
+
     if not os.path.exists(filepath):
         with open(filepath, "w", newline="", encoding="utf-8") as f:
             writer = csv.DictWriter(f, fieldnames=fields)
             writer.writeheader()
+        _verified_csv.add(filepath)
         return
 
     # Check if existing file has a header
@@ -37,6 +92,7 @@ def _ensure_csv(filepath, fields):
         if first_line and first_line != ",".join(fields):
             # Header mismatch — might be old schema. Migrate columns.
             _migrate_csv_columns(filepath, fields)
+        _verified_csv.add(filepath)
     except Exception:
         pass
 
@@ -67,52 +123,234 @@ def _migrate_csv_columns(filepath, new_fields):
         logger.error(f"CSV migration failed for {filepath}: {e}")
 
 
-def _append_csv(filepath, fields, row_dict):
-    """Append a single row to a CSV file (thread-safe via file lock)."""
-    _ensure_csv(filepath, fields)
-    lock = FileLock(filepath + ".lock", timeout=5)
+# Append handles kept open per CSV: filepath -> (file, csv.writer, lock)
+# The lock is a threading.Lock on POSIX (flock covers other processes) or a FileLock on Windows.
+_writer_cache = {}
+
+
+def _get_writer(filepath):
+    entry = _writer_cache.get(filepath)
+    if entry is None:
+        f = open(filepath, "a", newline="", encoding="utf-8", buffering=1)
+        lock = threading.Lock() if fcntl else FileLock(filepath + ".lock", timeout=5)
+        entry = (f, csv.writer(f), lock)
+        _writer_cache[filepath] = entry
+    return entry
+
+
+@contextmanager
+def _csv_lock(filepath):
+    """Exclusive lock on a CSV across threads and processes."""
+    f, _, lock = _get_writer(filepath)
     with lock:
-        with open(filepath, "a", newline="", encoding="utf-8") as f:
-            writer = csv.DictWriter(f, fieldnames=fields)
-            writer.writerow(row_dict)
+        if fcntl is None:
+            yield
+            return
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+@atexit.register
+def _close_writers():
+    for f, _, _ in _writer_cache.values():
+        try:
+            f.close()
+        except Exception:
+            pass
+    _writer_cache.clear()
+
+
+def _append_csv(filepath, fields, row):
+    """Append a single row (values already in `fields` order) to a CSV file (thread-safe via file lock)."""
+    _ensure_csv(filepath, fields)
+    f, writer, _ = _get_writer(filepath)
+    with _csv_lock(filepath):
+        writer.writerow(row)
+        f.flush()
+
+
+class _CsvBatcher:
+    """Buffers CSV rows and appends them in one locked write per batch.
+
+    Flushes when max_rows are pending or the oldest flush is older than max_age seconds;
+    a timer armed with the first buffered row flushes a burst's tail within max_age.
+    """
+
+    def __init__(self, filepath, fields, max_rows=32, max_age=0.5):
+        self.filepath = filepath
+        self.fields = fields
+        self.max_rows = max_rows
+        self.max_age = max_age
+        self._buf = []
+        self._last_flush = time.monotonic()
+        self._mutex = threading.Lock()
+        self._timer = None
+
+    def add(self, row):
+        """Queue a row whose values are already in `fields` order."""
+        with self._mutex:
+            self._buf.append(row)
+            if len(self._buf) >= self.max_rows or time.monotonic() - self._last_flush > self.max_age:
+                self._flush_locked()
+            elif self._timer is None:
+                self._timer = threading.Timer(self.max_age, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self):
+        with self._mutex:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        self._last_flush = time.monotonic()
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._buf:
+            return
+        _ensure_csv(self.filepath, self.fields)
+        f, writer, _ = _get_writer(self.filepath)
+        with _csv_lock(self.filepath):
+            writer.writerows(self._buf)
+            f.flush()
+        self._buf.clear()
+
+
+# Signals tolerate a short delay; trades are written immediately (see log_trade)
+_signals_batcher = _CsvBatcher(SIGNALS_CSV, SIGNALS_FIELDS)
+atexit.register(_signals_batcher.flush)
 
 
 def _read_csv(filepath, fields, limit=None):
     """Read all rows from CSV, newest first. Returns list of dicts."""
     _ensure_csv(filepath, fields)
-    rows = []
     try:
         with open(filepath, "r", newline="", encoding="utf-8") as f:
             reader = csv.DictReader(f)
-            rows = list(reader)
+            if limit:
+                # Stream through the file keeping only the last `limit` rows
+                rows = list(deque(reader, maxlen=limit))
+            else:
+                rows = list(reader)
     except Exception:
         return []
     rows.reverse()  # newest first
-    if limit:
-        rows = rows[:limit]
     return rows
 
 
+def _iter_csv_reverse(filepath, chunk_size=65536):
+    """Yield rows as dicts from the end of a CSV backwards, reading chunk_size blocks."""
+    with open(filepath, "rb") as f:
+        header = next(csv.reader([f.readline().decode("utf-8")]), None)
+        if not header:
+            return
+        data_start = f.tell()
+        pos = f.seek(0, os.SEEK_END)
+        partial = b""
+        while pos > data_start:
+            step = min(chunk_size, pos - data_start)
+            pos -= step
+            f.seek(pos)
+            lines = (f.read(step) + partial).split(b"\n")
+            # The first line may be cut off mid-row unless we reached the header
+            partial = lines.pop(0) if pos > data_start else b""
+            for line in reversed(lines):
+                line = line.rstrip(b"\r")
+                if line:
+                    yield dict(zip(header, next(csv.reader([line.decode("utf-8")]))))
+
+
+def _iter_csv_from(filepath, offset=None):
+    """Yield (row_start, row_end, row) byte offsets and dicts from `offset` to EOF.
+
+    offset must be the start of a row; None (or an offset that is not on a row boundary)
+    starts at the first data row. A trailing row without its newline is not yielded yet.
+    """
+    with open(filepath, "rb") as f:
+        header = next(csv.reader([f.readline().decode("utf-8")]), None)
+        if not header:
+            return
+        pos = f.tell()
+        if offset is not None and offset > pos:
+            f.seek(offset - 1)
+            if f.read(1) == b"\n":
+                pos = offset
+        f.seek(pos)
+        for line in f:
+            if not line.endswith(b"\n"):
+                return
+            start, pos = pos, pos + len(line)
+            line = line.rstrip(b"\r\n")
+            if line:
+                yield start, pos, dict(zip(header, next(csv.reader([line.decode("utf-8")]))))
+
+
+def _patch_last_row(filepath, match, update, chunk_size=65536):
+    """Update the newest row where match(row) is true, rewriting only from that row to EOF.
+
+    Scans backward from the end of the file in chunk_size blocks. Returns True if a row
+    was patched. Caller holds the file lock.
+    """
+    with open(filepath, "r+b") as f:
+        header = next(csv.reader([f.readline().decode("utf-8")]), None)
+        if not header:
+            return False
+        data_start = f.tell()
+        pos = f.seek(0, os.SEEK_END)
+        buf = b""
+        checked = 0
+        while pos > data_start:
+            step = min(chunk_size, pos - data_start)
+            pos -= step
+            f.seek(pos)
+            buf = f.read(step) + buf
+            lines = buf.split(b"\n")
+            # The first line may be cut off mid-row unless we reached the header
+            first_complete = 0 if pos == data_start else 1
+            for k in range(checked, len(lines) - first_complete):
+                i = len(lines) - 1 - k
+                checked += 1
+                line = lines[i].rstrip(b"\r")
+                if not line:
+                    continue
+                row = dict(zip(header, next(csv.reader([line.decode("utf-8")]))))
+                if not match(row):
+                    continue
+                update(row)
+                out = io.StringIO()
+                csv.writer(out).writerow([row.get(h, "") for h in header])
+                line_start = sum(len(l) + 1 for l in lines[:i])
+                rest = buf[line_start + len(lines[i]) + 1:]
+                f.seek(pos + line_start)
+                f.write(out.getvalue().encode("utf-8") + rest)
+                f.truncate()
+                return True
+    return False
+
+
 def _read_json(filepath, default=None):
     """Read JSON file, return default if missing or corrupt."""
     if default is None:
         default = {}
     try:
         if os.path.exists(filepath):
-            with open(filepath, "r", encoding="utf-8") as f:
-                return json.load(f)
-    except (json.JSONDecodeError, IOError):
+            with open(filepath, "rb") as f:
+                return _json_loads(f.read())
+    except (ValueError, IOError):
         pass
     return default
 
 
-def _write_json(filepath, data):
-    """Atomically write JSON file."""
+def _write_json(filepath, data, pretty=True):
+    """Atomically write JSON file. pretty=False skips indentation for machine-read files."""
     lock = FileLock(filepath + ".lock", timeout=5)
     with lock:
         tmp = filepath + ".tmp"
-        with open(tmp, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2)
+        with open(tmp, "wb") as f:
+            f.write(_json_dumps(data, pretty))
         os.replace(tmp, filepath)
 
 
@@ -122,124 +360,193 @@ class DatabaseManager:
     def __init__(self):
         _ensure_csv(TRADES_CSV, TRADES_FIELDS)
         _ensure_csv(SIGNALS_CSV, SIGNALS_FIELDS)
+        # Parsed positions.json, re-read only when the file's mtime changes
+        self._positions_cache = None
+        self._positions_mtime = -1
+        # Bumped on every positions write so in-process readers can cache StateManager.load()
+        self.positions_version = 0
+        # Serializes positions read-modify-write between the caller and the background state writer
+        self._positions_mutex = threading.RLock()
+        # settings.json is owned by this process: keep it in memory, debounce writes
+        self._settings_cache = None
+        self._settings_mutex = threading.Lock()
+        self._settings_timer = None
+        atexit.register(self.flush_settings)
+        # (inode, byte offset) of the oldest unresolved SELL in trades.csv, or EOF if none
+        self._pending_cursor = None
+        self._pending_full_scan = 0.0
 
     # --- Positions (JSON) ---
 
     def _load_positions(self):
-        return _read_json(POSITIONS_JSON, default=[])
+        """Positions indexed by is_paper (0/1). Stored on disk as a list for the web dashboard."""
+        try:
+            mtime = os.stat(POSITIONS_JSON).st_mtime_ns
+        except OSError:
+            mtime = 0
+        if mtime != self._positions_mtime:
+            data = _read_json(POSITIONS_JSON, default=[])
+            if isinstance(data, dict):
+                data = [data] if data else []  # legacy single-position file
+            index = {}
+            for p in data:
+                index.setdefault(int(p.get("is_paper", 0)), p)
+            self._positions_cache = index
+            self._positions_mtime = mtime
+        # Callers mutate positions before saving: hand out copies
+        return {k: dict(p) for k, p in self._positions_cache.items()}
 
     def _save_positions(self, positions):
-        _write_json(POSITIONS_JSON, positions)
+        _write_json(POSITIONS_JSON, list(positions.values()), pretty=False)
+        self._positions_cache = {k: dict(p) for k, p in positions.items()}
+        self.positions_version += 1
+        try:
+            self._positions_mtime = os.stat(POSITIONS_JSON).st_mtime_ns
+        except OSError:
+            self._positions_mtime = -1
 
     def get_position(self, is_paper=False):
-        paper_val = 1 if is_paper else 0
-        for p in self._load_positions():
-            if int(p.get("is_paper", 0)) == paper_val:
-                return p
-        return None
+        return self._load_positions().get(1 if is_paper else 0)
 
     def get_all_positions(self):
-        return self._load_positions()
+        return list(self._load_positions().values())
 
     def save_position(self, pos_data, is_paper=False):
         paper_val = 1 if is_paper else 0
-        positions = self._load_positions()
-        # Upsert: replace existing position with same paper mode
-        positions = [p for p in positions if int(p.get("is_paper", 0)) != paper_val]
-        pos_data["is_paper"] = paper_val
-        positions.append(pos_data)
-        self._save_positions(positions)
+        with self._positions_mutex:
+            positions = self._load_positions()
+            # Upsert: replace existing position with same paper mode
+            pos_data["is_paper"] = paper_val
+            positions[paper_val] = pos_data
+            self._save_positions(positions)
 
     def clear_position(self, is_paper=False):
+        with self._positions_mutex:
+            positions = self._load_positions()
+            if positions.pop(1 if is_paper else 0, None) is not None:
+                self._save_positions(positions)
+
+    def replace_position_if_current(self, pos_data, is_paper=False):
+        """save_position, but only while the stored position is the same entry (token + timestamp)."""
         paper_val = 1 if is_paper else 0
-        positions = self._load_positions()
-        positions = [p for p in positions if int(p.get("is_paper", 0)) != paper_val]
-        self._save_positions(positions)
+        with self._positions_mutex:
+            positions = self._load_positions()
+            cur = positions.get(paper_val)
+            if (not cur or cur.get("token_id") != pos_data.get("token_id")
+                    or cur.get("timestamp") != pos_data.get("timestamp")):
+                return False
+            pos_data["is_paper"] = paper_val
+            positions[paper_val] = pos_data
+            self._save_positions(positions)
+            return True
 
     # --- Trades (CSV) ---
 
     def log_trade(self, token_id, side, price, size, roi=0.0, is_paper=False,
                   outcome="", market_id=""):
         paper_val = 1 if is_paper else 0
-        _append_csv(TRADES_CSV, TRADES_FIELDS, {
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-            "token_id": token_id,
-            "side": side,
-            "price": price,
-            "size": size,
-            "roi": roi,
-            "is_paper": paper_val,
-            "outcome": outcome,
-            "market_id": market_id,
-        })
+        # Positional row in TRADES_FIELDS order
+        _append_csv(TRADES_CSV, TRADES_FIELDS, (
+            _iso_now(), token_id, side, price, size, roi, paper_val, outcome, market_id,
+        ))
 
     def get_trades(self, limit=50):
         return _read_csv(TRADES_CSV, TRADES_FIELDS, limit=limit)
 
     def update_trade_outcome(self, token_id, outcome, side_filter="SELL"):
         """Retroactively set outcome (WIN/LOSS) on the most recent matching SELL trade."""
+        def match(row):
+            return (row.get("token_id") == token_id and
+                    row.get("side", "").upper() == side_filter and
+                    not row.get("outcome"))
+
         try:
-            lock = FileLock(TRADES_CSV + ".lock", timeout=5)
-            with lock:
-                with open(TRADES_CSV, "r", newline="", encoding="utf-8") as f:
-                    reader = csv.DictReader(f)
-                    rows = list(reader)
-
-                updated = False
-                for row in reversed(rows):
-                    if (row.get("token_id") == token_id and
-                            row.get("side", "").upper() == side_filter and
-                            not row.get("outcome")):
-                        row["outcome"] = outcome
-                        updated = True
-                        break
-
-                if updated:
-                    with open(TRADES_CSV, "w", newline="", encoding="utf-8") as f:
-                        writer = csv.DictWriter(f, fieldnames=TRADES_FIELDS)
-                        writer.writeheader()
-                        writer.writerows(rows)
+            with _csv_lock(TRADES_CSV):
+                # The pending SELL is almost always near the tail: only that suffix is rewritten
+                if _patch_last_row(TRADES_CSV, match, lambda row: row.update(outcome=outcome)):
                     logger.info(f"✅ Trade outcome updated: {token_id[:20]}... → {outcome}")
         except Exception as e:
             logger.error(f"Failed to update trade outcome: {e}")
 
+    PENDING_RESCAN_SECS = 600  # full trades.csv scan at least this often, in case of outside edits
+
     def get_pending_outcomes(self):
-        """Get SELL trades that don't have an outcome yet."""
-        trades = _read_csv(TRADES_CSV, TRADES_FIELDS)
+        """Get SELL trades that don't have an outcome yet (newest first).
+
+        Resumes from the oldest unresolved SELL found by the previous call: every row before
+        it is settled, and _patch_last_row only rewrites from an unresolved row onwards, so
+        the offset stays valid. Falls back to a full scan when the file was replaced or
+        truncated, and every PENDING_RESCAN_SECS.
+        """
+        _ensure_csv(TRADES_CSV, TRADES_FIELDS)
         pending = []
-        for t in trades:
-            if t.get("side", "").upper() == "SELL" and not t.get("outcome"):
-                market_id = t.get("market_id", "")
-                if market_id:
-                    pending.append(t)
+        try:
+            with _csv_lock(TRADES_CSV):
+                st = os.stat(TRADES_CSV)
+                now = time.monotonic()
+                offset = None
+                if self._pending_cursor and now - self._pending_full_scan < self.PENDING_RESCAN_SECS:
+                    ino, off = self._pending_cursor
+                    if ino == st.st_ino and off <= st.st_size:
+                        offset = off
+                if offset is None:
+                    self._pending_full_scan = now
+                oldest = None
+                end = offset
+                for start, end, t in _iter_csv_from(TRADES_CSV, offset):
+                    if t.get("side", "").upper() != "SELL" or t.get("outcome"):
+                        continue
+                    if oldest is None:
+                        oldest = start
+                    if t.get("market_id", ""):
+                        pending.append(t)
+                cursor = oldest if oldest is not None else end
+                self._pending_cursor = (st.st_ino, cursor) if cursor is not None else None
+        except Exception as e:
+            self._pending_cursor = None
+            logger.error(f"Failed to scan pending outcomes: {e}")
+        pending.reverse()
         return pending
 
     # --- Settings (JSON) ---
 
+    SETTINGS_FLUSH_DELAY = 0.1  # seconds; a burst of save_setting calls becomes one write
+
+    def _load_settings(self):
+        if self._settings_cache is None:
+            self._settings_cache = _read_json(SETTINGS_JSON, default={})
+        return self._settings_cache
+
     def get_setting(self, key, default=None):
-        settings = _read_json(SETTINGS_JSON, default={})
-        return settings.get(key, default)
+        with self._settings_mutex:
+            return self._load_settings().get(key, default)
 
     def save_setting(self, key, value):
-        settings = _read_json(SETTINGS_JSON, default={})
-        settings[key] = str(value)
-        _write_json(SETTINGS_JSON, settings)
+        with self._settings_mutex:
+            self._load_settings()[key] = str(value)
+            if self._settings_timer is not None:
+                self._settings_timer.cancel()
+            self._settings_timer = threading.Timer(self.SETTINGS_FLUSH_DELAY, self.flush_settings)
+            self._settings_timer.daemon = True
+            self._settings_timer.start()
+
+    def flush_settings(self):
+        """Write pending settings to disk now."""
+        with self._settings_mutex:
+            if self._settings_timer is None:
+                return
+            self._settings_timer.cancel()
+            self._settings_timer = None
+            _write_json(SETTINGS_JSON, dict(self._settings_cache))
 
     # --- Signals (CSV) ---
 
     def log_signal(self, price, rsi, atr, score, up, down, result):
-        _append_csv(SIGNALS_CSV, SIGNALS_FIELDS, {
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-            "price": price,
-            "rsi": rsi,
-            "atr": atr,
-            "score": score,
-            "up": up,
-            "down": down,
-            "result": result,
-        })
+        # Positional row in SIGNALS_FIELDS order
+        _signals_batcher.add((_iso_now(), price, rsi, atr, score, up, down, result))
 
     def get_signals(self, limit=100):
+        _signals_batcher.flush()
         return _read_csv(SIGNALS_CSV, SIGNALS_FIELDS, limit=limit)
 
 
@@ -247,6 +554,36 @@ class DatabaseManager:
 db = DatabaseManager()
 
 
+# Single-slot hand-off to the state writer thread: the newest position update wins
+_state_queue = queue.Queue(maxsize=1)
+_state_thread = None
+_state_thread_lock = threading.Lock()
+
+
+def _write_queued_state(item):
+    pos, is_paper = item
+    try:
+        # A close/replace that landed first wins: never resurrect a finished position
+        db.replace_position_if_current(pos, is_paper=is_paper)
+    except Exception as e:
+        logger.warning(f"Background state save failed: {e}")
+
+
+def _state_worker():
+    while True:
+        _write_queued_state(_state_queue.get())
+
+
+def _flush_state_queue():
+    try:
+        _write_queued_state(_state_queue.get_nowait())
+    except queue.Empty:
+        pass
+
+
+atexit.register(_flush_state_queue)
+
+
 class StateManager:
     @staticmethod
     def load():
@@ -264,6 +601,36 @@ class StateManager:
         else:
             db.clear_position(is_paper=is_paper)
 
+    @staticmethod
+    def save_async(state):
+        """Queue an update of the current position for the background writer; never blocks on disk.
+
+        Bursts coalesce to the latest snapshot, and the write is dropped if the position
+        was closed or replaced before it lands. Use save() when a later read depends on it.
+        """
+        global _state_thread
+        pos = state.get("current_position")
+        if not pos:
+            return
+        if _state_thread is None:
+            with _state_thread_lock:
+                if _state_thread is None:
+                    _state_thread = threading.Thread(target=_state_worker, name="state-writer", daemon=True)
+                    _state_thread.start()
+        item = (dict(pos), is_paper_trading())
+        try:
+            _state_queue.put_nowait(item)
+        except queue.Full:
+            # Replace the pending (older) snapshot with this one
+            try:
+                _state_queue.get_nowait()
+            except queue.Empty:
+                pass
+            try:
+                _state_queue.put_nowait(item)
+            except queue.Full:
+                pass
+
     @staticmethod
     def update_position(token_id, price, size, side="BUY", prediction="UP",
                         tp_order_id=None, market_id=""):
@@ -319,30 +686,15 @@ class StateManager:
             cursor.execute("SELECT * FROM positions")
             positions = [dict(row) for row in cursor.fetchall()]
             if positions:
-                _write_json(POSITIONS_JSON, positions)
+                _write_json(POSITIONS_JSON, positions, pretty=False)
                 logger.info(f"  ✅ Migrated {len(positions)} positions")
 
-            # Migrate trades
-            cursor.execute("SELECT * FROM trades ORDER BY id ASC")
-            trades = [dict(row) for row in cursor.fetchall()]
-            if trades:
-                _ensure_csv(TRADES_CSV, TRADES_FIELDS)
-                with open(TRADES_CSV, "w", newline="", encoding="utf-8") as f:
-                    writer = csv.DictWriter(f, fieldnames=TRADES_FIELDS, extrasaction="ignore")
-                    writer.writeheader()
-                    writer.writerows(trades)
-                logger.info(f"  ✅ Migrated {len(trades)} trades")
-
-            # Migrate signals
-            cursor.execute("SELECT * FROM signals ORDER BY id ASC")
-            signals = [dict(row) for row in cursor.fetchall()]
-            if signals:
-                _ensure_csv(SIGNALS_CSV, SIGNALS_FIELDS)
-                with open(SIGNALS_CSV, "w", newline="", encoding="utf-8") as f:
-                    writer = csv.DictWriter(f, fieldnames=SIGNALS_FIELDS, extrasaction="ignore")
-                    writer.writeheader()
-                    writer.writerows(signals)
-                logger.info(f"  ✅ Migrated {len(signals)} signals")
+            # Migrate trades + signals: stream plain tuples straight into csv.writer
+            for table, filepath, fields in (("trades", TRADES_CSV, TRADES_FIELDS),
+                                            ("signals", SIGNALS_CSV, SIGNALS_FIELDS)):
+                count = StateManager._copy_table_to_csv(conn, table, filepath, fields)
+                if count:
+                    logger.info(f"  ✅ Migrated {count} {table}")
 
             # Migrate settings
             cursor.execute("SELECT * FROM settings")
@@ -357,6 +709,29 @@ class StateManager:
         except Exception as e:
             logger.error(f"Migration failed: {e}")
 
+    @staticmethod
+    def _copy_table_to_csv(conn, table, filepath, fields):
+        """Overwrite filepath with every row of table (columns reordered to fields). Returns row count."""
+        cursor = conn.cursor()
+        cursor.row_factory = None  # tuples, not sqlite3.Row
+        cursor.execute(f"SELECT * FROM {table} ORDER BY id ASC")
+        first = cursor.fetchone()
+        if first is None:
+            return 0
+
+        columns = [d[0] for d in cursor.description]
+        idx = [columns.index(f) if f in columns else None for f in fields]
+        count = 0
+
+        _ensure_csv(filepath, fields)
+        with open(filepath, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(fields)
+            for r in itertools.chain((first,), cursor):
+                writer.writerow([r[i] if i is not None else "" for i in idx])
+                count += 1
+        return count
+
     @staticmethod
     def migrate_from_json():
         """Migrate from legacy bot_state_async.json."""
@@ -1,11 +1,16 @@
 import os
+import re
 import json
 import time
+import random
 import asyncio
 import logging
-from datetime import datetime, timezone, timedelta
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
 
 import aiohttp
+import numpy as np
 import websockets
 
 from utils.strategy_utils import Indicators, BayesianPredictor
@@ -23,11 +28,35 @@ from btc_15m.config import (
     use_flashbots,
 )
 from btc_15m.db import db, StateManager
-from btc_15m.dashboard import Dashboard
+from btc_15m.dashboard import Dashboard, DashboardSnapshot
 from btc_15m.risk import RiskManager
 
 logger = logging.getLogger("bot")
 
+FUNDING_CACHE_TTL = 60  # seconds
+QUOTE_CONCURRENCY = 4  # in-flight order-book quotes per strategy cycle
+DASHBOARD_PRICE_INTERVAL = 0.25  # seconds between Coinbase price pushes to the dashboard
+
+
+def _next_backoff(delay, cap):
+    """Double `delay` up to `cap` with +/-20% jitter so retries don't line up."""
+    return min(cap, delay * 2) * random.uniform(0.8, 1.2)
+
+
+# Coinbase ticker frames: fast-path filter and price extraction without building the full dict
+_CB_TICKER_TAG = '"type":"ticker"'
+_CB_PRICE_RE = re.compile(r'"price":"([0-9.]+)"')
+
+# orjson is optional: faster parser for the always-on WS feeds, falls back to stdlib json
+try:
+    import orjson
+
+    def _json_loads(data):
+        return orjson.loads(data)
+except ImportError:
+    def _json_loads(data):
+        return json.loads(data)
+
 try:
     from mev_handler import FastLaneClient
     MEV_AVAILABLE = True
@@ -35,28 +64,80 @@ except ImportError:
     MEV_AVAILABLE = False
 
 
+class _OHLCVRing:
+    """Fixed-capacity [ts, o, h, l, c, v] history in a float64 array.
+
+    Backed by a 2x buffer so `view()` is always a contiguous, oldest-first, zero-copy
+    slice; the tail is shifted to the front only once every `capacity` appends.
+    """
+
+    def __init__(self, capacity):
+        self._cap = capacity
+        self._buf = np.empty((2 * capacity, 6), dtype=np.float64)
+        self._start = 0
+        self._end = 0
+
+    def append(self, row):
+        if self._end == len(self._buf):
+            size = self._end - self._start
+            self._buf[:size] = self._buf[self._start:self._end]
+            self._start, self._end = 0, size
+        self._buf[self._end] = row
+        self._end += 1
+        if self._end - self._start > self._cap:
+            self._start += 1
+
+    def extend(self, rows):
+        """Bulk append an (M, 6) array, keeping only the newest `capacity` rows."""
+        rows = rows[-self._cap:]
+        keep = min(len(self), self._cap - len(rows))
+        self._buf[:keep] = self._buf[self._end - keep:self._end]
+        self._buf[keep:keep + len(rows)] = rows
+        self._start, self._end = 0, keep + len(rows)
+
+    def __len__(self):
+        return self._end - self._start
+
+    def view(self):
+        return self._buf[self._start:self._end]
+
+
 class MarketData:
     def __init__(self, poly_client):
         self.poly = poly_client
         self.risk = poly_client.risk if poly_client.risk else RiskManager()
-        self.closes = []
-        self.closes_1m = []
-        self.candles = []
+        # 15m bars live in a NumPy ring the indicators read without conversion;
+        # 1m closes only feed two deltas, so a deque is enough
+        self._ohlcv = _OHLCVRing(HISTORY_CANDLES)
+        self.closes_1m = deque(maxlen=100)
         self.current_price = 0.0
-        self.last_tsl_check = datetime.now(timezone.utc) - timedelta(days=1)
-        self.last_strategy_run = datetime.now(timezone.utc) - timedelta(days=1)
+        # Monotonic timestamps: the per-message path never builds datetimes
+        self._last_tsl_mono = float("-inf")
+        self._bar_closed = asyncio.Event()
         self.coinbase_price = None
+        self._last_dash_push = float("-inf")
         self.chainlink_price = None
         self.fear_greed_index = 50
         self.current_atr = 0.0
+        self._http = None
+        # Dedicated, bounded pool for the blocking py_clob_client order-book calls
+        self._ob_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="poly-ob")
+        # (value, monotonic ts): funding settles every 8h, no need to ask Binance each run
+        self._funding_cache = (0.0, float("-inf"))
+        # RSI/MACD/ATR/VWAP advance one closed bar at a time instead of re-running over the window
+        self._rsi_state = None
+        self._macd_state = None
+        self._atr_state = None
+        self._vwap_state = None
+        # StateManager.load() result, reused until a positions write bumps db.positions_version
+        self._state_cache = {}
+        self._state_version = None
 
         self.bayesian = BayesianPredictor()
         self.current_market_id = None
         self.latched_strike = None
 
-        asyncio.create_task(self._coinbase_listener())
-        asyncio.create_task(self._chainlink_poller())
-        asyncio.create_task(self._fear_greed_poller())
+        asyncio.create_task(self._pollers())
 
         self.mev = None
         if MEV_AVAILABLE and hasattr(self.poly, 'private_key') and self.poly.private_key:
@@ -66,9 +147,58 @@ class MarketData:
             except Exception as e:
                 logger.warning(f"⚠️ FastLane Init Failed: {e}")
 
+    @property
+    def candles(self):
+        """Oldest-first (N, 6) float64 view: ts, open, high, low, close, volume."""
+        return self._ohlcv.view()
+
+    @property
+    def closes(self):
+        return self._ohlcv.view()[:, 4]
+
+    # --- HTTP Session ---
+
+    async def _ensure_session(self):
+        """Shared keep-alive session for REST pollers (created inside the running loop)."""
+        if self._http is None or self._http.closed:
+            self._http = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=32, ttl_dns_cache=300, keepalive_timeout=60),
+                timeout=aiohttp.ClientTimeout(total=5),
+            )
+        return self._http
+
+    async def close(self):
+        if self._http is not None and not self._http.closed:
+            await self._http.close()
+        self._ob_executor.shutdown(wait=False)
+
+    async def _fetch_order_book(self, token_id):
+        # Shared with PolymarketManager, so the entry path reuses the book evaluated here
+        return await self.poly.get_order_book_cached(token_id, executor=self._ob_executor)
+
+    @property
+    def _state_dirty(self):
+        return self._state_version != db.positions_version
+
+    async def _state(self):
+        """Cached StateManager.load(); a miss reads positions.json off the event loop."""
+        if self._state_dirty:
+            version = db.positions_version
+            self._state_cache = await asyncio.to_thread(StateManager.load)
+            self._state_version = version
+        return self._state_cache
+
     # --- External Data Streams ---
 
+    async def _pollers(self):
+        """Background feeds as one task; the REST pollers share self._http."""
+        await asyncio.gather(self._coinbase_listener(), self._chainlink_poller(), self._fear_greed_poller())
+
     async def _coinbase_listener(self):
+        # Hot-loop names bound once
+        tag, price_search, json_loads = _CB_TICKER_TAG, _CB_PRICE_RE.search, _json_loads
+        monotonic = time.monotonic
+        retry_delay = 1
         while True:
             try:
                 async with websockets.connect(COINBASE_WSS) as ws:
@@ -78,44 +208,70 @@ class MarketData:
                         "channels": ["ticker"]
                     }))
                     logger.info("📡 Connected to Coinbase Pro (Latency Oracle)")
+                    retry_delay = 1
                     async for msg in ws:
-                        data = json.loads(msg)
-                        if data.get("type") == "ticker" and "price" in data:
-                            self.coinbase_price = float(data["price"])
-                            Dashboard.binance_price = self.coinbase_price
+                        # Fast path: exact compact tag + price regex; anything else mentioning
+                        # "ticker" (other spacing/key order) is parsed before being dropped
+                        m = price_search(msg) if tag in msg else None
+                        if m:
+                            price = float(m.group(1))
+                        else:
+                            if "ticker" not in msg:
+                                continue  # heartbeats/errors
+                            data = json_loads(msg)
+                            if data.get("type") != "ticker" or "price" not in data:
+                                continue
+                            price = float(data["price"])
+                        self.coinbase_price = price
+                        # Dashboard only needs the latest price; coalesce ticker bursts
+                        now = monotonic()
+                        if now - self._last_dash_push > DASHBOARD_PRICE_INTERVAL:
+                            self._last_dash_push = now
+                            Dashboard.binance_price = price
             except Exception as e:
                 logger.debug(f"⚠️ Coinbase WS Error: {e}")
-                await asyncio.sleep(5)
+                await asyncio.sleep(retry_delay)
+                retry_delay = _next_backoff(retry_delay, 30)
 
     async def _chainlink_poller(self):
+        retry_delay = 10
         while True:
             try:
-                async with aiohttp.ClientSession() as session:
-                    url = "https://api.coingecko.com/api/v3/simple/price?ids=bitcoin&vs_currencies=usd"
-                    async with session.get(url) as resp:
-                        if resp.status == 200:
-                            data = await resp.json()
-                            self.chainlink_price = data.get("bitcoin", {}).get("usd")
+                session = await self._ensure_session()
+                url = "https://api.coingecko.com/api/v3/simple/price?ids=bitcoin&vs_currencies=usd"
+                async with session.get(url) as resp:
+                    if resp.status == 200:
+                        data = await resp.json()
+                        self.chainlink_price = data.get("bitcoin", {}).get("usd")
+                retry_delay = 10
+                await asyncio.sleep(10)
             except Exception as e:
                 logger.debug(f"⚠️ Chainlink Poller Error: {e}")
-            await asyncio.sleep(10)
+                await asyncio.sleep(retry_delay)
+                retry_delay = _next_backoff(retry_delay, 120)
 
     async def _fear_greed_poller(self):
+        retry_delay = 30
         while True:
             try:
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(FEAR_GREED_API) as resp:
-                        if resp.status == 200:
-                            data = await resp.json()
-                            val = data.get("data", [{}])[0].get("value", "50")
-                            self.fear_greed_index = int(val)
+                session = await self._ensure_session()
+                async with session.get(FEAR_GREED_API) as resp:
+                    if resp.status == 200:
+                        data = await resp.json()
+                        val = data.get("data", [{}])[0].get("value", "50")
+                        self.fear_greed_index = int(val)
+                retry_delay = 30
+                await asyncio.sleep(300)
             except Exception as e:
                 logger.debug(f"⚠️ Fear & Greed Error: {e}")
-            await asyncio.sleep(300)
+                await asyncio.sleep(retry_delay)
+                retry_delay = _next_backoff(retry_delay, 300)
 
     @staticmethod
-    def calculate_time_decay_factor(expiry_dt):
-        remaining_sec = (expiry_dt - datetime.now(timezone.utc)).total_seconds()
+    def calculate_time_decay_factor(expiry_dt, now=None):
+        if now is None:
+            now = datetime.now(timezone.utc)
+        remaining_sec = (expiry_dt - now).total_seconds()
         if remaining_sec < 180:
             return 2.0
         if remaining_sec < 600:
@@ -127,28 +283,32 @@ class MarketData:
     async def fetch_initial_history(self):
         try:
             logger.info("⏳ Fetching 48h History from Binance...")
-            async with aiohttp.ClientSession() as session:
-                url = f"{BINANCE_REST}?symbol=BTCUSDT&interval=15m&limit={HISTORY_CANDLES}"
-                async with session.get(url) as resp:
-                    if resp.status != 200:
-                        logger.error("Failed to fetch history.")
-                        return
-                    data = await resp.json()
-                    for k in data:
-                        self.closes.append(float(k[4]))
-                        self.candles.append([k[0], k[1], k[2], k[3], k[4], k[5]])
+            session = await self._ensure_session()
+            url = f"{BINANCE_REST}?symbol=BTCUSDT&interval=15m&limit={HISTORY_CANDLES}"
+            async with session.get(url, timeout=aiohttp.ClientTimeout(total=15)) as resp:
+                if resp.status != 200:
+                    logger.error("Failed to fetch history.")
+                    return
+                # One C-level parse, then one vectorized fill of the ring (klines carry numeric strings)
+                data = _json_loads(await resp.read())
+                if data:
+                    self._ohlcv.extend(np.asarray(data, dtype=np.float64)[:, :6])
 
             logger.info(f"✅ Loaded {len(self.closes)} Historical Candles!")
-            if self.closes:
-                self.current_price = self.closes[-1]
+            if len(self._ohlcv):
+                self.current_price = float(self.closes[-1])
+            self._update_oscillators()
             await self.run_strategy()
         except Exception as e:
             logger.error(f"History Fetch Error: {e}")
 
     async def stream_prices(self):
-        await asyncio.gather(self.stream_15m_candles(), self.stream_1m_candles())
+        await asyncio.gather(self.stream_15m_candles(), self.stream_1m_candles(), self._periodic_strategy())
 
     async def stream_15m_candles(self):
+        # Hot-loop names bound once
+        TEXT, ERROR = aiohttp.WSMsgType.TEXT, aiohttp.WSMsgType.ERROR
+        json_loads, process_candle = _json_loads, self.process_candle
         retry_delay = 1
         while True:
             try:
@@ -157,9 +317,9 @@ class MarketData:
                         logger.info("🔌 Connected to Binance Websocket (15m)")
                         retry_delay = 1
                         async for msg in ws:
-                            if msg.type == aiohttp.WSMsgType.TEXT:
-                                await self.process_candle(json.loads(msg.data))
-                            elif msg.type == aiohttp.WSMsgType.ERROR:
+                            if msg.type == TEXT:
+                                await process_candle(json_loads(msg.data))
+                            elif msg.type == ERROR:
                                 break
             except Exception as e:
                 logger.error(f"WS (15m) Error: {e}. Retrying in {retry_delay}s...")
@@ -167,6 +327,9 @@ class MarketData:
                 retry_delay = min(retry_delay * 2, 30)
 
     async def stream_1m_candles(self):
+        # Hot-loop names bound once
+        TEXT, ERROR = aiohttp.WSMsgType.TEXT, aiohttp.WSMsgType.ERROR
+        json_loads, append = _json_loads, self.closes_1m.append
         retry_delay = 1
         while True:
             try:
@@ -175,14 +338,11 @@ class MarketData:
                         logger.info("🔌 Connected to Binance Websocket (1m)")
                         retry_delay = 1
                         async for msg in ws:
-                            if msg.type == aiohttp.WSMsgType.TEXT:
-                                data = json.loads(msg.data)
-                                k = data['k']
+                            if msg.type == TEXT:
+                                k = json_loads(msg.data)['k']
                                 if k['x']:
-                                    self.closes_1m.append(float(k['c']))
-                                    if len(self.closes_1m) > 100:
-                                        self.closes_1m.pop(0)
-                            elif msg.type == aiohttp.WSMsgType.ERROR:
+                                    append(float(k['c']))
+                            elif msg.type == ERROR:
                                 break
             except Exception as e:
                 logger.error(f"WS (1m) Error: {e}. Retrying in {retry_delay}s...")
@@ -190,13 +350,18 @@ class MarketData:
                 retry_delay = min(retry_delay * 2, 30)
 
     async def get_btc_funding(self):
+        value, fetched_at = self._funding_cache
+        if time.monotonic() - fetched_at < FUNDING_CACHE_TTL:
+            return value
         try:
-            async with aiohttp.ClientSession() as session:
-                url = f"{BINANCE_FUTURES_REST}?symbol=BTCUSDT"
-                async with session.get(url, timeout=5) as resp:
-                    if resp.status == 200:
-                        data = await resp.json()
-                        return float(data.get('lastFundingRate', 0))
+            session = await self._ensure_session()
+            url = f"{BINANCE_FUTURES_REST}?symbol=BTCUSDT"
+            async with session.get(url) as resp:
+                if resp.status == 200:
+                    data = await resp.json()
+                    value = float(data.get('lastFundingRate', 0))
+                    self._funding_cache = (value, time.monotonic())
+                    return value
             return 0.0
         except Exception:
             return 0.0
@@ -208,64 +373,96 @@ class MarketData:
         is_closed = k['x']
         close_price = float(k['c'])
         self.current_price = close_price
-        Dashboard.btc_price = self.current_price
+        Dashboard.btc_price = close_price
 
-        now_ts = datetime.now(timezone.utc)
-        state = StateManager.load()
+        now = time.monotonic()
+        state = await self._state()
         has_position = state.get("current_position") is not None
         tsl_interval = TSL_INTERVAL_ACTIVE if has_position else TSL_INTERVAL_IDLE
 
-        if (now_ts - self.last_tsl_check).total_seconds() > tsl_interval:
-            self.last_tsl_check = now_ts
+        if now - self._last_tsl_mono > tsl_interval:
+            self._last_tsl_mono = now
             asyncio.create_task(self.poly.check_trailing_stop(
-                current_price=self.current_price, current_atr=self.current_atr
+                current_price=close_price, current_atr=self.current_atr
             ))
 
-        if (datetime.now(timezone.utc) - self.last_strategy_run).total_seconds() > STRATEGY_INTERVAL_SECONDS:
-            self.last_strategy_run = datetime.now(timezone.utc)
-            await self.run_strategy()
-
         if is_closed:
-            self.closes.append(close_price)
-            self.candles.append([k['t'], k['o'], k['h'], k['l'], k['c'], k['v']])
-            if len(self.closes) > HISTORY_CANDLES:
-                self.closes.pop(0)
-                self.candles.pop(0)
+            # Convert once at the boundary; the close was already parsed above
+            self._ohlcv.append((k['t'], float(k['o']), float(k['h']), float(k['l']), close_price, float(k['v'])))
+            self._update_oscillators()
             logger.info(f"🕯️ Candle Closed: ${close_price:,.0f} | Running Strategy...")
-            self.last_strategy_run = datetime.now(timezone.utc)
-            await self.run_strategy()
+            self._bar_closed.set()
+
+    async def _periodic_strategy(self):
+        """Run the strategy every STRATEGY_INTERVAL_SECONDS, or right away when a bar closes."""
+        while True:
+            try:
+                await asyncio.wait_for(self._bar_closed.wait(), timeout=STRATEGY_INTERVAL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+            self._bar_closed.clear()
+            try:
+                await self.run_strategy()
+            except Exception as e:
+                logger.error(f"Strategy Error: {e}")
+
+    def _update_oscillators(self):
+        """Fold the newest closed bar into the RSI/MACD/ATR/VWAP state (seeded from the window once warm)."""
+        if self._rsi_state is None or self._macd_state is None:
+            if len(self._ohlcv) >= WARMUP_CANDLES:
+                candles = self.candles
+                self._rsi_state = Indicators.rsi_state(self.closes)
+                self._macd_state = Indicators.macd_state(self.closes)
+                self._atr_state = Indicators.atr_state(candles)
+                self._vwap_state = Indicators.vwap_state(candles)
+            return
+        ts, _, high, low, close, volume = self.candles[-1].tolist()
+        Indicators.rsi_update(self._rsi_state, close)
+        Indicators.macd_update(self._macd_state, close)
+        Indicators.atr_update(self._atr_state, high, low, close)
+        Indicators.vwap_update(self._vwap_state, ts, high, low, close, volume)
 
     # --- Strategy ---
 
-    async def run_strategy(self):
-        if len(self.closes) < WARMUP_CANDLES:
+    async def run_strategy(self, now=None):
+        if len(self._ohlcv) < WARMUP_CANDLES:
             logger.info("⚠️ Warming up... need more data.")
             return
 
-        indicators = self._calculate_indicators()
+        # One wall-clock read per run, threaded through to the dashboard
+        if now is None:
+            now = datetime.now(timezone.utc)
+        self.poly.invalidate_order_books()
+        if self._rsi_state is None:
+            self._update_oscillators()
+        oscillators = (self._rsi_state["last_rsi"], self._rsi_state["prev_rsi"], self._macd_state["last"],
+                       self._atr_state["atr"], tuple(self._vwap_state["recent"]))
+
+        # Indicator math runs off-loop on a snapshot so WS readers keep appending bars
+        indicators = await asyncio.to_thread(self._calculate_indicators, self.candles.copy(), oscillators)
+        self.current_atr = indicators["atr"] if indicators["atr"] else 0.05
         context = await self._get_market_context()
-        score = self._calculate_score(indicators, context) if context else 0.5
-        self._update_dashboard(score, indicators, context)
+        score = await asyncio.to_thread(self._calculate_score, indicators, context) if context else 0.5
+        self._update_dashboard(score, indicators, context, now)
 
         if not context:
             return
         await self._handle_risk(score, context)
         await self._execute_entry(score, context)
 
-    def _calculate_indicators(self):
-        rsi = Indicators.calculate_rsi(self.closes)
-        atr = Indicators.calculate_atr(self.candles)
-        self.current_atr = atr if atr else 0.05
+    @staticmethod
+    def _calculate_indicators(candles, oscillators):
+        """Pure indicator pass over an (N, 6) OHLCV array; safe to run in a worker thread.
 
-        rsi_prev = Indicators.calculate_rsi(self.closes[:-1])
+        `oscillators` is (rsi, previous rsi, macd dict, atr, last VWAP values) from the incremental state.
+        """
+        rsi, rsi_prev, macd, atr, vwap_recent = oscillators
         rsi_slope = rsi - rsi_prev if (rsi and rsi_prev) else 0
 
-        macd = Indicators.calculate_macd(self.closes)
-        vwap_series = Indicators.calculate_vwap_intraday(self.candles)
-        vwap = vwap_series[-1] if vwap_series else None
-        vwap_slope = (vwap_series[-1] - vwap_series[-4]) if vwap_series and len(vwap_series) > 3 else 0
+        vwap = vwap_recent[-1] if vwap_recent else None
+        vwap_slope = (vwap_recent[-1] - vwap_recent[-4]) if len(vwap_recent) > 3 else 0
 
-        ha = Indicators.calculate_heiken_ashi(self.candles)
+        ha = Indicators.calculate_heiken_ashi(candles)
 
         return {
             "rsi": rsi, "rsi_slope": rsi_slope, "atr": atr,
@@ -283,30 +480,55 @@ class MarketData:
         if not active_markets:
             return None
 
-        for target_m in active_markets:
-            try:
-                poly_ctx = await self._evaluate_market(target_m, context)
-                if poly_ctx:
-                    return poly_ctx
-            except Exception as e:
-                logger.error(f"Error processing market {target_m.get('question')}: {e}")
+        # Markets already quoted by Gamma are screened here, before any order-book fetch
+        active_markets = [
+            m for m in active_markets
+            if m.get("best_bid") is None or m.get("best_ask") is None
+            or self._quote_eligible(m["best_bid"], m["best_ask"])
+        ]
+
+        if not active_markets:
+            logger.warning("No eligible BTC markets found in this cycle.")
+            return None
+
+        # Markets come sorted by expiry and the first eligible one wins: quote them in waves of
+        # QUOTE_CONCURRENCY and stop at the first wave with a match. Funding (not
+        # market-specific) overlaps the first wave.
+        funding = asyncio.ensure_future(self.get_btc_funding())
+        funding_rate = None
+        for i in range(0, len(active_markets), QUOTE_CONCURRENCY):
+            wave = active_markets[i:i + QUOTE_CONCURRENCY]
+            quotes = await asyncio.gather(
+                *(self._get_market_prices(m) for m in wave),
+                return_exceptions=True,
+            )
+            if funding_rate is None:
+                try:
+                    funding_rate = await funding
+                except Exception:
+                    funding_rate = 0.0
+
+            for target_m, quote in zip(wave, quotes):
+                try:
+                    if isinstance(quote, BaseException):
+                        raise quote
+                    poly_ctx = await self._evaluate_market(target_m, context, quote, funding_rate)
+                    if poly_ctx:
+                        return poly_ctx
+                except Exception as e:
+                    logger.error(f"Error processing market {target_m.get('question')}: {e}")
 
         logger.warning("No eligible BTC markets found in this cycle.")
         return None
 
-    async def _evaluate_market(self, target_m, context):
-        bid, ask, ob = await self._get_market_prices(target_m)
-        if not bid or not ask:
+    async def _evaluate_market(self, target_m, context, quote, funding_rate):
+        bid, ask, ob = quote
+        if not self._quote_eligible(bid, ask):
             return None
 
         poly_price = (bid + ask) / 2
         poly_spread = ask - bid
 
-        if poly_price > POLY_PRICE_CEILING or poly_price < POLY_PRICE_FLOOR:
-            return None
-        if poly_spread > MAX_SPREAD:
-            return None
-
         self._latch_market(target_m)
 
         context["market"] = target_m
@@ -321,25 +543,35 @@ class MarketData:
         # OBI
         try:
             if not ob:
-                ob = await asyncio.to_thread(self.poly.client.get_order_book, target_m['yes_id'])
+                ob = await self._fetch_order_book(target_m['yes_id'])
             vol_up, vol_down = Indicators.calculate_weighted_obi(ob, poly_price)
             context["vol_up"] = vol_up
             context["vol_down"] = vol_down
         except Exception:
             pass
 
-        context["funding_rate"] = await self.get_btc_funding()
+        context["funding_rate"] = funding_rate
         context["latency_score"] = self._calculate_latency_score()
 
         return context
 
+    @staticmethod
+    def _quote_eligible(bid, ask):
+        """Mid inside [POLY_PRICE_FLOOR, POLY_PRICE_CEILING] and spread within MAX_SPREAD."""
+        if not bid or not ask:
+            return False
+        poly_price = (bid + ask) / 2
+        if poly_price > POLY_PRICE_CEILING or poly_price < POLY_PRICE_FLOOR:
+            return False
+        return ask - bid <= MAX_SPREAD
+
     async def _get_market_prices(self, target_m):
         bid = target_m.get("best_bid")
         ask = target_m.get("best_ask")
         ob = None
 
         if bid is None or ask is None:
-            ob = await asyncio.to_thread(self.poly.client.get_order_book, target_m['yes_id'])
+            ob = await self._fetch_order_book(target_m['yes_id'])
             if ob.bids and ob.asks:
                 bid = float(ob.bids[0].price)
                 ask = float(ob.asks[0].price)
@@ -373,7 +605,7 @@ class MarketData:
         return 0
 
     def _calculate_score(self, ind, ctx):
-        score, _ = BayesianPredictor.calculate_bayes_score(
+        score = BayesianPredictor.calculate_bayes_prob_fast(
             self.current_price, ind["vwap"], ind["vwap_slope"],
             ind["rsi"], ind["rsi_slope"], ind["macd"],
             ind["ha"]['color'], ind["ha"]['count'],
@@ -387,62 +619,72 @@ class MarketData:
         )
         return score
 
-    def _update_dashboard(self, score, ind, ctx):
-        Dashboard.rsi_val = ind["rsi"] if ind["rsi"] else 0
-        Dashboard.rsi_arrow = "↑" if ind["rsi_slope"] > 0 else "↓"
-        Dashboard.macd_label = "bullish" if ind["macd"] and ind["macd"].get("hist", 0) > 0 else "bearish"
-        Dashboard.ha_label = f"{ind['ha']['color']} x{ind['ha']['count']}"
-        Dashboard.vwap_val = ind["vwap"] if ind["vwap"] else 0
-
+    def _update_dashboard(self, score, ind, ctx, now):
+        price = self.current_price
         delta_1m = self.closes_1m[-1] - self.closes_1m[-2] if len(self.closes_1m) >= 2 else 0.0
         delta_3m = self.closes_1m[-1] - self.closes_1m[-4] if len(self.closes_1m) >= 4 else 0.0
 
-        Dashboard.delta_1m = delta_1m
-        Dashboard.delta_3m = delta_3m
-        Dashboard.impulse = delta_1m
-        Dashboard.predict_conf = max(score, 1 - score) * 100
-        Dashboard.predict_label = "BULLISH" if score > 0.6 else ("BEARISH" if score < 0.4 else "NEUTRAL")
-
-        Dashboard.poly_up = ctx["poly_price"] * 100 if ctx and ctx.get("poly_price") else 0
-        Dashboard.poly_down = (1 - ctx["poly_price"]) * 100 if ctx and ctx.get("poly_price") else 0
+        # Without a market the expiry/strike fields keep their last values
+        prev = Dashboard.state
+        minutes_to_expiry = prev.minutes_to_expiry
+        entry_blocked = prev.entry_blocked
+        price_to_beat = prev.price_to_beat
+        market_question = "-"
+        time_left = "-"
 
         if ctx and ctx.get("market"):
             minutes_left = ctx["market"].get("minutes_to_expiry", 999)
-            Dashboard.minutes_to_expiry = round(minutes_left, 1)
-            Dashboard.entry_blocked = minutes_left < MIN_TIME_TO_EXPIRY_MINS
+            minutes_to_expiry = round(minutes_left, 1)
+            entry_blocked = minutes_left < MIN_TIME_TO_EXPIRY_MINS
             strike_val = ctx["market"].get('strike_price')
             if strike_val:
-                Dashboard.price_to_beat = float(strike_val)
+                price_to_beat = float(strike_val)
             elif ctx["market"].get("is_up_down"):
                 # For Up/Down markets, show BTC reference price
-                Dashboard.price_to_beat = self.current_price
+                price_to_beat = price
             else:
-                Dashboard.price_to_beat = 0.0
-            Dashboard.market_question = ctx["market"].get("question", "-")
+                price_to_beat = 0.0
+            market_question = ctx["market"].get("question", "-")
 
             end_dt = ctx["market"].get("end_dt")
             if end_dt:
-                diff = end_dt - datetime.now(timezone.utc)
+                diff = end_dt - now
                 if diff.total_seconds() > 0:
                     mins, secs = divmod(int(diff.total_seconds()), 60)
-                    Dashboard.time_left = f"{mins}m {secs}s"
+                    time_left = f"{mins}m {secs}s"
                 else:
-                    Dashboard.time_left = "Expired"
-            else:
-                Dashboard.time_left = "-"
-        else:
-            Dashboard.market_question = "-"
-            Dashboard.time_left = "-"
-
-        Dashboard.btc_price = self.current_price
+                    time_left = "Expired"
+
+        poly_price = ctx.get("poly_price") if ctx else None
+        predict_label = "BULLISH" if score > 0.6 else ("BEARISH" if score < 0.4 else "NEUTRAL")
+        Dashboard.state = DashboardSnapshot(
+            market_question=market_question,
+            time_left=time_left,
+            price_to_beat=price_to_beat,
+            predict_label=predict_label,
+            predict_conf=max(score, 1 - score) * 100,
+            rsi_val=ind["rsi"] if ind["rsi"] else 0,
+            rsi_arrow="↑" if ind["rsi_slope"] > 0 else "↓",
+            macd_label="bullish" if ind["macd"] and ind["macd"].get("hist", 0) > 0 else "bearish",
+            ha_label=f"{ind['ha']['color']} x{ind['ha']['count']}",
+            vwap_val=ind["vwap"] if ind["vwap"] else 0,
+            delta_1m=delta_1m,
+            delta_3m=delta_3m,
+            poly_up=poly_price * 100 if poly_price else 0,
+            poly_down=(1 - poly_price) * 100 if poly_price else 0,
+            impulse=delta_1m,
+            entry_blocked=entry_blocked,
+            minutes_to_expiry=minutes_to_expiry,
+        )
+        Dashboard.btc_price = price
         Dashboard.export_state()
 
         db.log_signal(
-            self.current_price, ind["rsi"] if ind["rsi"] else 0, self.current_atr,
+            price, ind["rsi"] if ind["rsi"] else 0, self.current_atr,
             score, 0, 0,
             "LONG" if score >= 0.7 else "SHORT" if score <= 0.3 else "NEUTRAL"
         )
-        logger.info(f"Final Score: {score:.2f} ({Dashboard.predict_label})")
+        logger.info(f"Final Score: {score:.2f} ({predict_label})")
 
     async def _handle_risk(self, score, ctx):
         await self.poly.check_trailing_stop(
@@ -452,7 +694,7 @@ class MarketData:
         # Check pending trade resolutions periodically
         await self.poly.check_pending_resolutions()
 
-        state = StateManager.load()
+        state = await self._state()
         pos = state.get("current_position")
         if not pos:
             return
@@ -471,7 +713,7 @@ class MarketData:
             await self.poly.execute_trade("SELL", pos["token_id"])
 
     async def _execute_entry(self, score, ctx):
-        state = StateManager.load()
+        state = await self._state()
         if state.get("current_position"):
             return
 
@@ -1,6 +1,8 @@
+import asyncio
+import json
 import logging
 import time
-import requests
+import aiohttp
 from web3 import Web3
 from eth_account import Account
 from typing import List, Dict, Any, Optional
@@ -9,9 +11,25 @@ from typing import List, Dict, Any, Optional
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# orjson is optional: serialize bundle payloads straight to bytes
+try:
+    import orjson
+
+    def _json_dumps(obj):
+        return orjson.dumps(obj)
+except ImportError:
+    def _json_dumps(obj):
+        return json.dumps(obj).encode("utf-8")
+
 # Constants
 FASTLANE_RELAY_URL = "https://tx-gateway.polygon.fastlane.xyz"  # FastLane Polygon Relay
 POLYGON_RPC_URL = "https://polygon-rpc.com" # Standard Polygon RPC
+# Re-read the account's pending nonce from the RPC at least this often (seconds)
+NONCE_TTL = 30
+RELAY_HEADERS = {
+    "Content-Type": "application/json",
+    "User-Agent": "FastLane-Python-Client/1.0"
+}
 
 class FastLaneClient:
     """
@@ -22,6 +40,12 @@ class FastLaneClient:
         self.relay_url = relay_url
         self.account = Account.from_key(private_key)
         self.address = self.account.address
+        self._http = None
+        # Next nonce to hand out; None means resync from the RPC on next use
+        self._nonce = None
+        self._nonce_synced = float("-inf")
+        # Target block of the last accepted bundle; once it passes, inclusion is unknown until resync
+        self._pending_block = None
         
         if not self.w3.is_connected():
             logger.error("Failed to connect to Polygon RPC")
@@ -29,69 +53,86 @@ class FastLaneClient:
             
         logger.info(f"FastLaneClient initialized for address: {self.address}")
 
-    def create_bundle(self, txs: List[Dict[str, Any]]) -> List[str]:
+    async def create_bundle(self, txs: List[Dict[str, Any]]) -> List[str]:
         """
         Signs a list of transaction dictionaries.
+        Nonces come from a local counter that only advances after an accepted submit. It is
+        resynced from the RPC's pending count on first use, after a failed submit, after
+        NONCE_TTL seconds, and once an accepted bundle's target block has passed (it may not have landed).
         """
-        signed_txs = []
-        nonce = self.w3.eth.get_transaction_count(self.address)
-        
-        for i, tx in enumerate(txs):
-            # precise nonce management
-            tx['nonce'] = nonce + i
-            
-            # Sign the transaction
-            signed = self.w3.eth.account.sign_transaction(tx, self.account.key)
-            signed_txs.append(signed.rawTransaction.hex())
-            
-        return signed_txs
+        if self._nonce is None or time.monotonic() - self._nonce_synced > NONCE_TTL or (
+                self._pending_block is not None
+                and await asyncio.to_thread(lambda: self.w3.eth.block_number) >= self._pending_block):
+            self._nonce = await asyncio.to_thread(self.w3.eth.get_transaction_count, self.address, "pending")
+            self._nonce_synced = time.monotonic()
+            self._pending_block = None
+        nonce = self._nonce
 
-    def submit_bundle(self, signed_txs: List[str], target_block: int, min_timestamp: Optional[int] = None, max_timestamp: Optional[int] = None) -> bool:
+        # Sign and hex-encode each tx in the thread pool; results keep bundle order
+        return list(await asyncio.gather(*(
+            asyncio.to_thread(self._sign_one, tx, nonce + i) for i, tx in enumerate(txs)
+        )))
+
+    def _sign_one(self, tx: Dict[str, Any], nonce: int) -> str:
+        """Sign one tx at `nonce` and return it as 0x-prefixed hex, ready for eth_sendBundle."""
+        tx['nonce'] = nonce
+        signed = self.w3.eth.account.sign_transaction(tx, self.account.key)
+        raw = getattr(signed, "raw_transaction", None) or signed.rawTransaction
+        return Web3.to_hex(raw)
+
+    async def _ensure(self) -> aiohttp.ClientSession:
+        """Persistent relay session (created inside the running loop) so bundles skip the TLS handshake."""
+        if self._http is None or self._http.closed:
+            self._http = aiohttp.ClientSession(
+                headers=RELAY_HEADERS,
+                timeout=aiohttp.ClientTimeout(total=5),
+            )
+        return self._http
+
+    async def close(self):
+        if self._http is not None and not self._http.closed:
+            await self._http.close()
+
+    async def submit_bundle(self, signed_txs: List[str], target_block: int, min_timestamp: Optional[int] = None, max_timestamp: Optional[int] = None) -> bool:
         """
         Submits a bundle of signed transactions to the FastLane relay.
         Uses the `eth_sendBundle` JSON-RPC method.
         """
-        
+        bundle = {
+            "txs": signed_txs,
+            "blockNumber": hex(target_block),
+            "minTimestamp": min_timestamp,
+            "maxTimestamp": max_timestamp,
+        }
         payload = {
             "jsonrpc": "2.0",
             "id": 1,
             "method": "eth_sendBundle",
-            "params": [
-                {
-                    "txs": signed_txs,
-                    "blockNumber": hex(target_block),
-                    "minTimestamp": min_timestamp,
-                    "maxTimestamp": max_timestamp,
-                }
-            ]
+            "params": [{k: v for k, v in bundle.items() if v is not None}]
         }
-        
-        # Remove None values from params
-        if min_timestamp is None:
-            del payload["params"][0]["minTimestamp"]
-        if max_timestamp is None:
-            del payload["params"][0]["maxTimestamp"]
-            
+
         try:
             logger.info(f"Submitting bundle to {self.relay_url} for block {target_block}")
-            headers = {
-                "Content-Type": "application/json",
-                "User-Agent": "FastLane-Python-Client/1.0"
-            }
-            response = requests.post(self.relay_url, json=payload, headers=headers, timeout=5)
-            response.raise_for_status()
-            
-            result = response.json()
-            
+            session = await self._ensure()
+            async with session.post(self.relay_url, data=_json_dumps(payload)) as response:
+                response.raise_for_status()
+                result = await response.json(content_type=None)
+
             if "error" in result:
                 logger.error(f"Bundle submission error: {result['error']}")
+                self._nonce = None
                 return False
-                
+
             logger.info(f"Bundle submitted successfully: {result}")
+            # Reserve the nonces only now; the target block check in create_bundle undoes this if it never lands
+            if self._nonce is not None:
+                self._nonce += len(signed_txs)
+            self._pending_block = target_block
             return True
-            
-        except requests.exceptions.RequestException as e:
+
+        except (aiohttp.ClientError, TimeoutError) as e:
             logger.error(f"Failed to send bundle request: {e}", exc_info=True)
+            self._nonce = None
             return False
 
     def get_next_block(self):
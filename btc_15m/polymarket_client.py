@@ -3,12 +3,21 @@ import re
 import json
 import math
 import time
+import random
 import asyncio
 import logging
 import traceback
-from datetime import datetime, timezone, timedelta, date
+from decimal import Decimal
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+from operator import itemgetter
+from datetime import datetime, timezone, timedelta, date, time as dt_time
+from email.utils import parsedate_to_datetime
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
 import aiohttp
+import numpy as np
 
 from btc_15m.config import (
     POLY_MARKET_URL, GAMMA_API_URL, POLYGON_CHAIN_ID,
@@ -31,6 +40,221 @@ from btc_15m.risk import KellyEngine
 
 logger = logging.getLogger("bot")
 
+GAMMA_CACHE_TTL = 15    # seconds a Gamma event list is reused before refetching
+GAMMA_STALE_TTL = 120   # on fetch failure, fall back to a list at most this old
+GHOST_SCAN_CONCURRENCY = 10  # in-flight balance lookups during ghost recovery
+BALANCE_CACHE_TTL = 3  # seconds a CLOB balance lookup is reused
+OB_CACHE_TTL = 0.5     # seconds an order book is shared between callers in one tick
+CLOB_POOL_WORKERS = 16  # threads reserved for blocking ClobClient calls
+RESOLUTION_BATCH = 20        # pending trades checked per resolution cycle
+RESOLUTION_CONCURRENCY = 5   # in-flight Gamma resolution lookups
+RESOLUTION_OPEN_TTL = 30     # seconds an "still open" answer is reused; resolved answers never expire
+RESOLUTION_CACHE_MAX = 4096
+GAMMA_RETRY_ATTEMPTS = 4   # tries for a Gamma GET that hits 429/5xx
+GAMMA_RETRY_MAX_DELAY = 30  # seconds; cap on any single backoff / Retry-After wait
+GAS_PRICE_TTL = 3  # seconds a Polygon gas price quote is reused for MEV fills
+HWM_SAVE_MIN_DELTA = 0.25  # ROI points a new peak must add to be persisted immediately
+HWM_SAVE_INTERVAL = 1.0    # otherwise persist a new peak at most once per this many seconds
+
+# CTF exchange (already EIP-55 checksummed) and the one function the MEV path encodes
+EXCHANGE_ADDR = "0x4bFb41d5B3570DeFd03C39a9A4D8dE6Bd8B8982E"
+ZERO_ADDR = "0x0000000000000000000000000000000000000000"  # no letters, so already checksummed
+FILL_ORDER_ABI = [{
+    "name": "fillOrder", "type": "function", "stateMutability": "nonpayable",
+    "inputs": [
+        {"name": "order", "type": "tuple", "components": [
+            {"name": "salt", "type": "uint256"}, {"name": "maker", "type": "address"},
+            {"name": "signer", "type": "address"}, {"name": "taker", "type": "address"},
+            {"name": "tokenId", "type": "uint256"}, {"name": "makerAmount", "type": "uint256"},
+            {"name": "takerAmount", "type": "uint256"}, {"name": "expiration", "type": "uint256"},
+            {"name": "nonce", "type": "uint256"}, {"name": "feeRateBps", "type": "uint256"},
+            {"name": "side", "type": "uint8"}, {"name": "signatureType", "type": "uint8"},
+            {"name": "signature", "type": "bytes"}
+        ]},
+        {"name": "fillAmount", "type": "uint256"}
+    ]
+}]
+
+# Market titles are in US Eastern wall time; fixed EST only if no tz database is installed
+try:
+    _ET = ZoneInfo("America/New_York")
+except ZoneInfoNotFoundError:
+    _ET = timezone(timedelta(hours=-5), "EST")
+
+# Market-title parsing, compiled once per process
+_TITLE_WINDOW_RE = re.compile(
+    r"([A-Za-z]+) (\d{1,2}), (\d{1,2}:\d{2})\s*([AP]M)\s*[-\u2013\u2014]\s*(\d{1,2}:\d{2})\s*([AP]M)\s*ET"
+)
+# Asset and price keywords in one alternation; the two sets never overlap, so one finditer sees both
+_BTC_SCAN_RE = re.compile(r"(?P<asset>Bitcoin|BTC)|(?P<kw>>|Above|Below|Price|High|Low|Up|Down|Settle)")
+_QUESTION_DOLLAR_RE = re.compile(r"\$([\d,]+(\.\d+)?)")
+_DESC_DOLLAR_RE = re.compile(r"\$([\d,]+(?:\.\d+)?)")
+_MONTHS = {
+    name: i for i, name in enumerate(
+        ("january", "february", "march", "april", "may", "june", "july",
+         "august", "september", "october", "november", "december"), start=1)
+}
+
+
+def _level_prices(levels):
+    """Book level prices as a float64 array; NumPy parses the decimal strings in C, not per-level float()."""
+    return np.array([level.price for level in levels], dtype=np.float64)
+
+
+def _best_bid_price(bids):
+    """Highest bid as float (book order is not relied on)."""
+    return float(_level_prices(bids).max())
+
+
+def _best_ask_price(asks):
+    """Lowest ask as float (book order is not relied on)."""
+    return float(_level_prices(asks).min())
+
+
+@lru_cache(maxsize=64)
+def _checksum(addr):
+    """EIP-55 form of `addr`; maker/signer repeat across fills, so the keccak runs once per address."""
+    return Web3.to_checksum_address(addr)
+
+
+def _to_6d(val):
+    """Amount -> integer 6-decimal units (USDC/CTF), truncated like int() but without float round-off."""
+    if isinstance(val, int):
+        return val * 1_000_000
+    # repr() is the shortest round-tripping form of a float, so e.g. 0.29 stays 0.29
+    d = Decimal(val if isinstance(val, str) else repr(val))
+    return int(d.scaleb(6))
+
+
+def _retry_after_seconds(value):
+    """Retry-After header (delta-seconds or HTTP-date) -> seconds, or None if absent/unparseable."""
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max((parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+def _clock_time(t_str, ampm):
+    """'H:MM' + 'AM'/'PM' -> time, same range checks as strptime('%I:%M %p')."""
+    h, m = t_str.split(":")
+    h, m = int(h), int(m)
+    if not (1 <= h <= 12 and 0 <= m <= 59):
+        raise ValueError(t_str)
+    return dt_time(h % 12 + (12 if ampm == "PM" else 0), m)
+
+
+@lru_cache(maxsize=2048)
+def _parse_iso_utc(s):
+    """Gamma ISO timestamp -> aware UTC datetime. Raises ValueError like fromisoformat."""
+    # Fast path for the fixed 'YYYY-MM-DDTHH:MM:SSZ' / '...+00:00' shapes Gamma sends
+    n = len(s)
+    if (n == 20 and s[19] in "Zz") or (n == 25 and s.endswith("+00:00")):
+        if s[4] == "-" and s[7] == "-" and s[10] in "Tt " and s[13] == ":" and s[16] == ":":
+            return datetime(int(s[:4]), int(s[5:7]), int(s[8:10]),
+                            int(s[11:13]), int(s[14:16]), int(s[17:19]), tzinfo=timezone.utc)
+
+    dt = datetime.fromisoformat(s.replace("Z", "+00:00"))
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt
+
+
+@lru_cache(maxsize=1024)
+def _classify_question(question):
+    """(is_btc_price_market, is_up_down) for a market title, scanned once per distinct title.
+
+    Up/down means a binary 'Up or Down' market with no fixed dollar strike.
+    """
+    seen = set()
+    for m in _BTC_SCAN_RE.finditer(question):
+        seen.add(m.lastgroup)
+        if len(seen) == 2:
+            break
+    if len(seen) < 2:
+        return False, False
+
+    q_lower = question.lower()
+    # Every accepted up/down form contains both words
+    if "up" not in q_lower or "down" not in q_lower:
+        return True, False
+    return True, "$" not in question or "up or down" in q_lower or "up/down" in q_lower
+
+
+@lru_cache(maxsize=1024)
+def _strike_from_fields(threshold, strike_price, target_price, line, question, desc):
+    """Strike from a market's raw fields; the same market re-parses to the same value every poll."""
+    # Tier 1: groupItemThreshold
+    if threshold:
+        try:
+            val = float(threshold)
+            if val > 0:
+                return val
+        except Exception:
+            pass
+
+    # Tier 2: Structured fields
+    for v in (strike_price, target_price, line):
+        if v:
+            try:
+                val = float(v)
+                if val > 0:
+                    return val
+            except Exception:
+                pass
+
+    # Tier 3: Regex fallback — dollar amount in question
+    match = _QUESTION_DOLLAR_RE.search(question)
+    if match:
+        try:
+            val = float(match.group(1).replace(",", ""))
+            if val > 0:
+                return val
+        except Exception:
+            pass
+
+    # Tier 4: For "Up or Down" markets, try to extract reference price
+    # from the market description (e.g. "Resolves based on BTC price at $97,500")
+    if desc:
+        desc_match = _DESC_DOLLAR_RE.search(desc)
+        if desc_match:
+            try:
+                val = float(desc_match.group(1).replace(",", ""))
+                if val > 1000:  # Sanity check: BTC prices are > $1000
+                    return val
+            except Exception:
+                pass
+
+    return None
+
+
+@lru_cache(maxsize=512)
+def _parse_title_window(question, year):
+    """(start_dt, end_dt) from a market title, or (None, None). Titles repeat every poll."""
+    match = _TITLE_WINDOW_RE.search(question)
+    if not match:
+        return None, None
+
+    try:
+        month_str, day_str, start_t, start_ap, end_t, end_ap = match.groups()
+
+        dt_date = date(year, _MONTHS[month_str.lower()], int(day_str))
+
+        start_dt = datetime.combine(dt_date, _clock_time(start_t, start_ap), tzinfo=_ET)
+        end_dt = datetime.combine(dt_date, _clock_time(end_t, end_ap), tzinfo=_ET)
+        if end_dt < start_dt:
+            end_dt += timedelta(days=1)
+
+        # ET -> UTC with the DST offset in force on that date
+        return start_dt.astimezone(timezone.utc), end_dt.astimezone(timezone.utc)
+    except Exception:
+        return None, None
+
 try:
     from mev_handler import FastLaneClient
     from web3 import Web3
@@ -38,11 +262,39 @@ try:
 except ImportError:
     MEV_AVAILABLE = False
 
+# orjson is optional: faster parse for Gamma payloads and the embedded token/price arrays
+try:
+    import orjson
+
+    def _json_loads(data):
+        return orjson.loads(data)
+except ImportError:
+    def _json_loads(data):
+        return json.loads(data)
+
+# httpx ships with py_clob_client; use it (HTTP/2 when h2 is installed) for Gamma, else aiohttp
+try:
+    import httpx
+    try:
+        import h2  # noqa: F401
+        HTTP2_AVAILABLE = True
+    except ImportError:
+        HTTP2_AVAILABLE = False
+except ImportError:
+    httpx = None
+    HTTP2_AVAILABLE = False
+
 try:
     from py_clob_client.exceptions import PolyApiException
 except ImportError:
     PolyApiException = Exception
 
+# Lets the public /book endpoint be read over our async client into the same type ClobClient returns
+try:
+    from py_clob_client.utilities import parse_raw_orderbook_summary
+except ImportError:
+    parse_raw_orderbook_summary = None
+
 
 class PolymarketManager:
     def __init__(self, key_path, risk_manager=None):
@@ -55,6 +307,27 @@ class PolymarketManager:
         self.last_exit_time = 0
         self.current_market = None
         self.latched_strike = None
+        self._http_session = None
+        self._httpx = None
+        # (monotonic ts, raw Gamma events); re-parsed on every call so expiry math stays current
+        self._events_cache = (float("-inf"), [])
+        # (asset_type, token_id) -> (balance, monotonic ts); dropped for both legs after a trade
+        self._bal_cache = {}
+        # token_id -> (monotonic ts, order book); cleared at the start of each strategy run
+        self._ob_cache = {}
+        # self._load_state() result, valid while db.positions_version is unchanged
+        self._state_cache = {}
+        self._state_version = None
+        self._sig_type = int(os.getenv("CLOB_SIGNATURE_TYPE", "2"))
+        # token_id (None = collateral) -> BalanceAllowanceParams, built once per token
+        self._bal_params = {}
+        # market_id -> (monotonic ts, resolution or None), LRU-ordered
+        self._resolution_cache = OrderedDict()
+        # token_id -> peak ROI seen in-process; may run ahead of the throttled saves
+        self._hwm = {}
+        self._last_hwm_save = float("-inf")
+        # Blocking ClobClient I/O gets its own pool so fan-outs don't queue behind the default executor
+        self._clob_pool = ThreadPoolExecutor(max_workers=CLOB_POOL_WORKERS, thread_name_prefix="clob")
 
         self.is_paper = is_paper_trading()
         self.virtual_balance = float(db.get_setting("paper_balance", str(get_paper_balance())))
@@ -73,7 +346,7 @@ class PolymarketManager:
             self.private_key = key.strip()
 
             funder = os.getenv("PROXY_WALLET_ADDRESS")
-            sig_type = int(os.getenv("CLOB_SIGNATURE_TYPE", "2"))
+            sig_type = self._sig_type
 
             creds = self._load_api_credentials()
 
@@ -109,20 +382,106 @@ class PolymarketManager:
 
     def _init_mev(self):
         self.mev = None
+        self._fill_contract = None
+        # (gas price in wei, monotonic ts)
+        self._gas_cache = (0, float("-inf"))
         if MEV_AVAILABLE and self.private_key:
             try:
                 self.mev = FastLaneClient(self.private_key)
+                # Parse the fillOrder ABI once; every MEV fill reuses the bound contract
+                self._fill_contract = self.mev.w3.eth.contract(address=EXCHANGE_ADDR, abi=FILL_ORDER_ABI)
                 logger.info("MEV/FastLane Integration Active.")
             except Exception as e:
                 logger.warning(f"⚠️ MEV Init Failed: {e}")
 
+    # --- HTTP Session ---
+
+    async def _session(self):
+        """Shared keep-alive session for Gamma REST calls (created inside the running loop)."""
+        if self._http_session is None or self._http_session.closed:
+            self._http_session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=20, keepalive_timeout=75, ttl_dns_cache=300),
+                timeout=aiohttp.ClientTimeout(total=10, connect=3),
+            )
+        return self._http_session
+
+    async def aclose(self):
+        if self._httpx is not None:
+            await self._httpx.aclose()
+        if self._http_session is not None and not self._http_session.closed:
+            await self._http_session.close()
+        if self.mev:
+            await self.mev.close()
+        self._clob_pool.shutdown(wait=False)
+
+    async def _to_clob(self, fn, *args, **kwargs):
+        """Run a blocking CLOB call on the dedicated pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._clob_pool, partial(fn, *args, **kwargs))
+
+    async def _get_raw(self, url, params=None):
+        """(status, Retry-After header, body bytes) for a GET over the long-lived client."""
+        if httpx is not None:
+            if self._httpx is None:
+                self._httpx = httpx.AsyncClient(
+                    http2=HTTP2_AVAILABLE,
+                    limits=httpx.Limits(max_connections=50, max_keepalive_connections=20),
+                    timeout=httpx.Timeout(10.0, connect=3.0),
+                )
+            r = await self._httpx.get(url, params=params)
+            return r.status_code, r.headers.get("Retry-After"), r.content
+
+        session = await self._session()
+        async with session.get(url, params=params) as resp:
+            return resp.status, resp.headers.get("Retry-After"), await resp.read()
+
+    async def _get_json(self, url, params=None):
+        """GET a JSON endpoint (Gamma, public CLOB) over the long-lived client; None on a non-200 response."""
+        status, _, body = await self._get_raw(url, params)
+        if status != 200:
+            return None
+        return _json_loads(body)
+
+    async def _gamma_get(self, url, params=None, attempts=GAMMA_RETRY_ATTEMPTS):
+        """_get_json that backs off on 429/5xx (honouring Retry-After); None once attempts run out."""
+        for attempt in range(attempts):
+            status, retry_after, body = await self._get_raw(url, params)
+            if status == 200:
+                return _json_loads(body)
+            if status != 429 and status < 500:
+                return None
+            if attempt == attempts - 1:
+                break
+            delay = 2 ** attempt + random.random() * 0.25
+            hinted = _retry_after_seconds(retry_after)
+            if hinted is not None:
+                delay = max(delay, hinted)
+            delay = min(delay, GAMMA_RETRY_MAX_DELAY)
+            logger.debug(f"Gamma {status} for {url}; retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
+        logger.warning(f"⚠️ Gamma gave up after {attempts} attempts (last status {status}): {url}")
+        return None
+
     # --- Market Discovery ---
 
     async def get_btc_markets(self):
-        try:
-            events = await self._fetch_gamma_events()
-            if not events:
+        fetched_at, events = self._events_cache
+        age = time.monotonic() - fetched_at
+        if age >= GAMMA_CACHE_TTL:
+            try:
+                fresh = await self._fetch_gamma_events()
+            except Exception as e:
+                logger.error(f"Market Fetch Error: {e}")
+                fresh = None
+            if fresh is not None:
+                events = fresh
+                self._events_cache = (time.monotonic(), events)
+            elif age >= GAMMA_STALE_TTL:
                 return []
+
+        if not events:
+            return []
+        try:
             return self._parse_market_events(events)
         except Exception as e:
             logger.error(f"Market Fetch Error: {e}")
@@ -138,45 +497,56 @@ class PolymarketManager:
             "order": "endDate",
             "ascending": "true",
         }
-        async with aiohttp.ClientSession() as session:
-            async with session.get(GAMMA_API_URL, params=params) as resp:
-                if resp.status != 200:
-                    return []
-                return await resp.json()
+        return await self._get_json(GAMMA_API_URL, params)
 
     def _parse_market_events(self, events):
         now_utc = datetime.now(timezone.utc)
-        targets = []
+        candidates = []
+
+        # Bind the per-market helpers once; the loop below runs for every market on every poll
+        is_started = self._is_event_started
+        market_candidate = self._market_candidate
+        add = candidates.append
 
         for event in events:
-            if not self._is_event_started(event, now_utc):
+            if not is_started(event, now_utc):
                 continue
 
-            for market in event.get("markets", []):
-                parsed = self._parse_single_market(market, now_utc)
-                if parsed:
-                    targets.append(parsed)
+            for market in event.get("markets", ()):
+                cand = market_candidate(market, now_utc)
+                if cand:
+                    add(cand)
+
+        if not candidates:
+            return []
+
+        # Trading-window filter over all candidates at once (epoch seconds, SoA)
+        n = len(candidates)
+        starts = np.fromiter((c[3].timestamp() for c in candidates), dtype=np.float64, count=n)
+        ends = np.fromiter((c[4].timestamp() for c in candidates), dtype=np.float64, count=n)
+        now_ts = now_utc.timestamp()
+        mask = (starts <= now_ts) & (now_ts < ends) & (ends - starts <= MAX_MARKET_DURATION_MINS * 60)
 
-        targets.sort(key=lambda x: x['end_dt'])
+        build = self._build_market
+        targets = [build(candidates[i], now_utc) for i in np.flatnonzero(mask)]
+        targets.sort(key=itemgetter("end_dt"))
         return targets
 
     def _is_event_started(self, event, now_utc):
         event_start_str = event.get("eventStartTime")
         if not event_start_str:
             return True
-        event_start_str = event_start_str.replace("Z", "+00:00")
         try:
-            event_start_dt = datetime.fromisoformat(event_start_str)
-            if event_start_dt.tzinfo is None:
-                event_start_dt = event_start_dt.replace(tzinfo=timezone.utc)
-            return event_start_dt <= now_utc
+            return _parse_iso_utc(event_start_str) <= now_utc
         except Exception:
             return True
 
-    def _parse_single_market(self, market, now_utc):
+    def _market_candidate(self, market, now_utc):
+        """(market, question, tokens, start_dt, end_dt, is_up_down) for a parseable BTC market, else None."""
         question = market.get("question", "")
 
-        if not self._is_btc_price_market(question):
+        is_btc, is_up_down = _classify_question(question)
+        if not is_btc:
             return None
 
         tokens = self._extract_tokens(market)
@@ -186,10 +556,10 @@ class PolymarketManager:
         start_dt, end_dt = self._parse_time_window(market, question, now_utc)
         if not end_dt:
             return None
+        return market, question, tokens, start_dt, end_dt, is_up_down
 
-        if not self._is_within_trading_window(start_dt, end_dt, now_utc):
-            return None
-
+    def _build_market(self, candidate, now_utc):
+        market, question, tokens, start_dt, end_dt, is_up_down = candidate
         strike_price = self._extract_strike_price(market, question)
         best_bid = market.get("bestBid")
         best_ask = market.get("bestAsk")
@@ -208,21 +578,15 @@ class PolymarketManager:
             "best_bid": float(best_bid) if best_bid else None,
             "best_ask": float(best_ask) if best_ask else None,
             "last_trade": float(last_trade) if last_trade else None,
-            "is_up_down": self._is_up_down_market(question),
+            "is_up_down": is_up_down,
             "minutes_to_expiry": round(minutes_to_expiry, 1),
         }
 
-    def _is_btc_price_market(self, question):
-        if "Bitcoin" not in question and "BTC" not in question:
-            return False
-        keywords = [">", "Above", "Below", "Price", "High", "Low", "Up", "Down", "Settle"]
-        return any(kw in question for kw in keywords)
-
     def _extract_tokens(self, market):
         raw_tokens = market.get("clobTokenIds")
         if not raw_tokens:
             return None
-        tokens = json.loads(raw_tokens) if isinstance(raw_tokens, str) else raw_tokens
+        tokens = _json_loads(raw_tokens) if isinstance(raw_tokens, str) else raw_tokens
         return tokens if len(tokens) == 2 else None
 
     def _parse_time_window(self, market, question, now_utc):
@@ -232,52 +596,22 @@ class PolymarketManager:
         return self._parse_time_from_api(market)
 
     def _parse_time_from_title(self, question, now_utc):
-        pattern = r"([A-Za-z]+) (\d{1,2}), (\d{1,2}:\d{2})\s*([AP]M)\s*[-\u2013\u2014]\s*(\d{1,2}:\d{2})\s*([AP]M)\s*ET"
-        match = re.search(pattern, question)
-        if not match:
-            return None, None
-
-        try:
-            month_str, day_str, start_t, start_ap, end_t, end_ap = match.groups()
-
-            def to_time(t_str, ampm):
-                return datetime.strptime(f"{t_str} {ampm}", "%I:%M %p").time()
-
-            month_num = datetime.strptime(month_str, "%B").month
-            dt_date = date(now_utc.year, month_num, int(day_str))
-
-            start_dt = datetime.combine(dt_date, to_time(start_t, start_ap))
-            end_dt = datetime.combine(dt_date, to_time(end_t, end_ap))
-            if end_dt < start_dt:
-                end_dt += timedelta(days=1)
-
-            # ET = UTC-5 (EST)
-            start_dt = start_dt.replace(tzinfo=timezone.utc) + timedelta(hours=5)
-            end_dt = end_dt.replace(tzinfo=timezone.utc) + timedelta(hours=5)
-            return start_dt, end_dt
-        except Exception:
-            return None, None
+        return _parse_title_window(question, now_utc.year)
 
     def _parse_time_from_api(self, market):
         end_str = market.get("endDateIso") or market.get("endDate")
         if not end_str:
             return None, None
 
-        end_str = end_str.replace("Z", "+00:00")
         try:
-            end_dt = datetime.fromisoformat(end_str)
-            if end_dt.tzinfo is None:
-                end_dt = end_dt.replace(tzinfo=timezone.utc)
+            end_dt = _parse_iso_utc(end_str)
         except ValueError:
             return None, None
 
         start_str = market.get("startDateIso") or market.get("startDate")
         if start_str:
-            start_str = start_str.replace("Z", "+00:00")
             try:
-                start_dt = datetime.fromisoformat(start_str)
-                if start_dt.tzinfo is None:
-                    start_dt = start_dt.replace(tzinfo=timezone.utc)
+                start_dt = _parse_iso_utc(start_str)
             except Exception:
                 start_dt = end_dt - timedelta(minutes=15)
         else:
@@ -285,69 +619,97 @@ class PolymarketManager:
 
         return start_dt, end_dt
 
-    def _is_within_trading_window(self, start_dt, end_dt, now_utc):
-        duration_minutes = (end_dt - start_dt).total_seconds() / 60
-        if not (start_dt <= now_utc < end_dt):
-            return False
-        if duration_minutes > MAX_MARKET_DURATION_MINS:
-            return False
-        return True
-
-    def _is_up_down_market(self, question):
-        """Detect if this is a binary 'Up or Down' market (no fixed dollar strike)."""
-        q_lower = question.lower()
-        return ("up or down" in q_lower or "up/down" in q_lower
-                or ("up" in q_lower and "down" in q_lower and "$" not in question))
-
     def _extract_strike_price(self, market, question):
-        # Tier 1: groupItemThreshold
-        threshold = market.get("groupItemThreshold")
-        if threshold:
-            try:
-                val = float(threshold)
-                if val > 0:
-                    return val
-            except Exception:
-                pass
-
-        # Tier 2: Structured fields
-        for field in ["strikePrice", "targetPrice", "line"]:
-            v = market.get(field)
-            if v:
-                try:
-                    val = float(v)
-                    if val > 0:
-                        return val
-                except Exception:
-                    pass
+        args = (market.get("groupItemThreshold"), market.get("strikePrice"), market.get("targetPrice"),
+                market.get("line"), question, market.get("description", ""))
+        try:
+            return _strike_from_fields(*args)
+        except TypeError:  # unhashable field value: parse without the cache
+            return _strike_from_fields.__wrapped__(*args)
+
+    # --- Position State ---
+
+    def _load_state(self):
+        """StateManager.load() served from memory until a position write bumps db.positions_version."""
+        version = db.positions_version
+        if version != self._state_version:
+            self._state_cache = StateManager.load()
+            self._state_version = version
+        pos = self._state_cache.get("current_position")
+        # Callers edit the position before saving: hand out a copy
+        return {"current_position": dict(pos)} if pos else {}
+
+    # --- Order Books ---
+
+    def _cached_ob(self, token_id, max_age):
+        hit = self._ob_cache.get(token_id)
+        if hit and time.monotonic() - hit[0] < max_age:
+            return hit[1]
+        return None
 
-        # Tier 3: Regex fallback — dollar amount in question
-        match = re.search(r"\$([\d,]+(\.\d+)?)", question)
-        if match:
-            try:
-                val = float(match.group(1).replace(",", ""))
-                if val > 0:
-                    return val
-            except Exception:
-                pass
+    async def get_order_book_cached(self, token_id, max_age=OB_CACHE_TTL, executor=None):
+        """Order book for `token_id`, fetched off-loop (on `executor`, else the CLOB pool) unless one is under `max_age` old."""
+        ob = self._cached_ob(token_id, max_age)
+        if ob is None:
+            ob = await self._get_order_book_async(token_id)
+            if ob is None:
+                loop = asyncio.get_running_loop()
+                ob = await loop.run_in_executor(executor or self._clob_pool, self.client.get_order_book, token_id)
+            self._ob_cache[token_id] = (time.monotonic(), ob)
+        return ob
+
+    async def _get_order_book_async(self, token_id):
+        """Public /book read on the event loop (no thread hop); None means use the sync client."""
+        if parse_raw_orderbook_summary is None:
+            return None
+        try:
+            raw = await self._get_json(f"{POLY_MARKET_URL}/book", {"token_id": token_id})
+        except Exception as e:
+            logger.debug(f"Async OB fetch failed, using sync client: {e}")
+            return None
+        return parse_raw_orderbook_summary(raw) if raw else None
 
-        # Tier 4: For "Up or Down" markets, try to extract reference price
-        # from the market description (e.g. "Resolves based on BTC price at $97,500")
-        desc = market.get("description", "")
-        if desc:
-            desc_match = re.search(r"\$([\d,]+(?:\.\d+)?)", desc)
-            if desc_match:
-                try:
-                    val = float(desc_match.group(1).replace(",", ""))
-                    if val > 1000:  # Sanity check: BTC prices are > $1000
-                        return val
-                except Exception:
-                    pass
+    def _get_ob_sync(self, token_id, max_age=OB_CACHE_TTL):
+        """Blocking variant for the TSL helpers, sharing the same cache."""
+        ob = self._cached_ob(token_id, max_age)
+        if ob is None:
+            ob = self.client.get_order_book(token_id)
+            self._ob_cache[token_id] = (time.monotonic(), ob)
+        return ob
 
-        return None
+    def invalidate_order_books(self):
+        self._ob_cache.clear()
 
     # --- Balance & Valuation ---
 
+    def _balance_params(self, token_id=None):
+        """Memoized BalanceAllowanceParams: collateral when token_id is None, else the conditional token."""
+        params = self._bal_params.get(token_id)
+        if params is None:
+            from py_clob_client.clob_types import BalanceAllowanceParams, AssetType
+            if token_id is None:
+                params = BalanceAllowanceParams(asset_type=AssetType.COLLATERAL, signature_type=self._sig_type)
+            else:
+                params = BalanceAllowanceParams(asset_type=AssetType.CONDITIONAL, token_id=token_id,
+                                                signature_type=self._sig_type)
+            if len(self._bal_params) >= 256:  # markets roll every 15m; don't grow forever
+                self._bal_params.clear()
+            self._bal_params[token_id] = params
+        return params
+
+    async def _cached_balance(self, key, fetch):
+        """Run the blocking `fetch` off-loop unless `key` was fetched within BALANCE_CACHE_TTL."""
+        hit = self._bal_cache.get(key)
+        if hit and time.monotonic() - hit[1] < BALANCE_CACHE_TTL:
+            return hit[0]
+        value = await self._to_clob(fetch)
+        self._bal_cache[key] = (value, time.monotonic())
+        return value
+
+    def _invalidate_balances(self, token_id):
+        self._bal_cache.pop(("COLLATERAL", None), None)
+        self._bal_cache.pop(("CONDITIONAL", token_id), None)
+
     async def get_usdc_balance(self):
         if self.is_paper:
             return self.virtual_balance
@@ -356,20 +718,18 @@ class PolymarketManager:
             return 0.0
 
         try:
-            from py_clob_client.clob_types import BalanceAllowanceParams, AssetType
-            sig_type = int(os.getenv("CLOB_SIGNATURE_TYPE", "2"))
-            resp = await asyncio.to_thread(
-                self.client.get_balance_allowance,
-                BalanceAllowanceParams(asset_type=AssetType.COLLATERAL, signature_type=sig_type)
-            )
-            return float(resp.get('balance', 0)) / USDC_DECIMALS
+            def fetch():
+                resp = self.client.get_balance_allowance(self._balance_params())
+                return float(resp.get('balance', 0)) / USDC_DECIMALS
+
+            return await self._cached_balance(("COLLATERAL", None), fetch)
         except Exception as e:
             logger.warning(f"Balance Fetch Error: {e}")
             return 0.0
 
     async def get_total_account_value(self):
         usdc = await self.get_usdc_balance()
-        state = StateManager.load()
+        state = self._load_state()
         pos = state.get("current_position")
         if not pos:
             return usdc
@@ -379,7 +739,7 @@ class PolymarketManager:
         size = float(pos["size"])
 
         try:
-            ob = await asyncio.to_thread(self.client.get_order_book, token_id)
+            ob = await self.get_order_book_cached(token_id)
         except Exception:
             return usdc + size * entry_price
 
@@ -389,7 +749,7 @@ class PolymarketManager:
                 return usdc + size * max(entry_price, LOW_LIQUIDITY_PRICE_FLOOR)
             return usdc + size * SAFE_MIDPOINT_FALLBACK
 
-        best_bid = float(sorted(ob.bids, key=lambda x: float(x.price), reverse=True)[0].price)
+        best_bid = _best_bid_price(ob.bids)
         return usdc + size * best_bid
 
     # --- Ghost Position Recovery ---
@@ -401,37 +761,42 @@ class PolymarketManager:
             return
         self.last_recovery_time = time.time()
 
-        state = StateManager.load()
+        state = self._load_state()
         if state.get("current_position"):
             return
 
         try:
-            from py_clob_client.clob_types import BalanceAllowanceParams, AssetType
-            sig_type = int(os.getenv("CLOB_SIGNATURE_TYPE", "2"))
             markets = await self.get_btc_markets()
             if not markets:
                 return
 
-            for m in markets:
-                for token_id in [m["yes_id"], m["no_id"]]:
-                    resp = await asyncio.to_thread(
-                        self.client.get_balance_allowance,
-                        BalanceAllowanceParams(
-                            asset_type=AssetType.CONDITIONAL,
-                            token_id=token_id,
-                            signature_type=sig_type
-                        )
+            # Fan the balance lookups out, capped to stay inside CLOB rate limits
+            limit = asyncio.Semaphore(GHOST_SCAN_CONCURRENCY)
+
+            async def fetch_balance(token_id):
+                async with limit:
+                    return await self._to_clob(self.client.get_balance_allowance, self._balance_params(token_id))
+
+            token_meta = [(m, token_id) for m in markets for token_id in (m["yes_id"], m["no_id"])]
+            results = await asyncio.gather(
+                *(fetch_balance(token_id) for _, token_id in token_meta), return_exceptions=True
+            )
+
+            # First hit in market order (YES before NO), as the serial scan did
+            for (m, token_id), resp in zip(token_meta, results):
+                if isinstance(resp, BaseException):
+                    logger.debug(f"Ghost balance check failed for {token_id}: {resp}")
+                    continue
+                bal = float(resp.get('balance', 0)) / USDC_DECIMALS
+                if bal >= DUST_FILTER:
+                    pred = "UP" if token_id == m["yes_id"] else "DOWN"
+                    logger.warning(f"🔁 Ghost Position Found: {bal} shares on {m['question']} ({pred})")
+                    StateManager.update_position(
+                        token_id, SAFE_MIDPOINT_FALLBACK, bal,
+                        side="BUY", prediction=pred,
+                        market_id=m.get("id", "")
                     )
-                    bal = float(resp.get('balance', 0)) / USDC_DECIMALS
-                    if bal >= DUST_FILTER:
-                        pred = "UP" if token_id == m["yes_id"] else "DOWN"
-                        logger.warning(f"🔁 Ghost Position Found: {bal} shares on {m['question']} ({pred})")
-                        StateManager.update_position(
-                            token_id, SAFE_MIDPOINT_FALLBACK, bal,
-                            side="BUY", prediction=pred,
-                            market_id=m.get("id", "")
-                        )
-                        return
+                    return
         except Exception as e:
             logger.error(f"Ghost Recovery Error: {e}")
 
@@ -457,10 +822,13 @@ class PolymarketManager:
         meta = signed["meta"]
 
         # Submit order
-        if use_flashbots and self.mev and direction == "BUY":
-            resp = await self._submit_via_mev(primary_order, meta)
-        else:
-            resp = await self._async_post_signed_order(primary_order)
+        try:
+            if use_flashbots and self.mev and direction == "BUY":
+                resp = await self._submit_via_mev(primary_order, meta)
+            else:
+                resp = await self._async_post_signed_order(primary_order)
+        finally:
+            self._invalidate_balances(token_id)
 
         if not resp:
             return
@@ -486,7 +854,7 @@ class PolymarketManager:
                 if tp_resp:
                     tp_id = tp_resp.get("orderID") or tp_resp.get("id")
                     if tp_id:
-                        state = StateManager.load()
+                        state = self._load_state()
                         pos = state.get("current_position")
                         if pos:
                             pos["tp_order_id"] = tp_id
@@ -501,7 +869,7 @@ class PolymarketManager:
             return
 
         try:
-            ob = await asyncio.to_thread(self.client.get_order_book, token_id)
+            ob = await self._to_clob(self.client.get_order_book, token_id)
         except Exception as e:
             logger.error(f"🧪 [PAPER] OB Fetch Error: {e}")
             return
@@ -509,7 +877,7 @@ class PolymarketManager:
         if direction == "BUY":
             if not ob.asks:
                 return
-            best_ask = float(sorted(ob.asks, key=lambda x: float(x.price))[0].price)
+            best_ask = _best_ask_price(ob.asks)
             usd_size = KellyEngine.calculate_size(self.virtual_balance, score, best_ask)
             if usd_size < MIN_TRADE_USD:
                 return
@@ -523,8 +891,8 @@ class PolymarketManager:
         else:
             if not ob.bids:
                 return
-            best_bid = float(sorted(ob.bids, key=lambda x: float(x.price), reverse=True)[0].price)
-            state = StateManager.load()
+            best_bid = _best_bid_price(ob.bids)
+            state = self._load_state()
             pos = state.get("current_position")
             if not pos:
                 return
@@ -537,21 +905,33 @@ class PolymarketManager:
                 self.risk.update_pnl(pnl)
             logger.info(f"🧪 [PAPER] SELL @ ${sell_price:.2f} | Proceeds: ${proceeds:.2f}")
 
+    def _gas_price(self):
+        """Gas price from the TTL cache; a stale entry costs one RPC round trip."""
+        price, ts = self._gas_cache
+        if time.monotonic() - ts > GAS_PRICE_TTL:
+            price = self.mev.w3.eth.gas_price
+            self._gas_cache = (price, time.monotonic())
+        return price
+
     async def _submit_via_mev(self, primary_order, meta):
+        # The bundle is best-effort: relay acceptance is not inclusion, so the CLOB post
+        # below stays the source of truth for the fill (the exchange fills an order hash once)
         try:
+            # Refresh a stale quote off the loop so the synchronous TX prep only reads the cache
+            await asyncio.to_thread(self._gas_price)
             tx = self._prepare_onchain_fill_tx(primary_order, meta['size'])
             if tx:
-                bundle = self.mev.create_bundle(tx)
-                result = await asyncio.to_thread(self.mev.send_bundle, bundle)
+                bundle = await self.mev.create_bundle([tx])
+                target_block = await asyncio.to_thread(self.mev.get_next_block)
+                result = await self.mev.submit_bundle(bundle, target_block)
                 logger.info(f"⚡ FastLane Bundle: {result}")
-                return result
         except Exception as e:
             logger.warning(f"⚠️ MEV Bundle Failed: {e}")
         return await self._async_post_signed_order(primary_order)
 
     async def _async_post_signed_order(self, signed_order):
         try:
-            return await asyncio.to_thread(self.client.post_order, signed_order)
+            return await self._to_clob(self.client.post_order, signed_order)
         except Exception as e:
             logger.error(f"❌ Async Post Failed: {e}")
             raise
@@ -561,15 +941,22 @@ class PolymarketManager:
             from py_clob_client.order_builder.constants import BUY, SELL
             side = BUY if direction == "BUY" else SELL
 
+            # A dust/empty position needs no book: settle that before the OB roundtrip
+            real_bal = None
+            if side == SELL:
+                real_bal = await self._get_token_balance(token_id)
+                if real_bal < MIN_SELL_BALANCE:
+                    return {"action": "CLEAR_STATE"}
+
             try:
-                ob = await asyncio.to_thread(self.client.get_order_book, token_id)
+                ob = await self.get_order_book_cached(token_id)
             except Exception as e:
                 logger.error(f"Failed to fetch OB: {e}")
                 return None
 
             if side == BUY:
                 return await self._prepare_buy_order(ob, token_id, score)
-            return await self._prepare_sell_order(ob, token_id)
+            return await self._prepare_sell_order(ob, token_id, real_bal)
         except Exception as e:
             logger.error(f"Order Prep Error: {e}")
             return None
@@ -582,8 +969,7 @@ class PolymarketManager:
             if not ob.asks:
                 return None
 
-            sorted_asks = sorted(ob.asks, key=lambda x: float(x.price))
-            best_ask = float(sorted_asks[0].price)
+            best_ask = _best_ask_price(ob.asks)
 
             max_price = MAX_BUY_PRICE_AGGRESSIVE if is_aggressive_mode() else MAX_BUY_PRICE
             if best_ask > max_price:
@@ -618,9 +1004,11 @@ class PolymarketManager:
             logger.info(f"💣 CONFIDENCE {score:.2f} | Bal: ${usdc_bal:.0f} | Risking {implied_risk:.1%} (${usd_size:.1f}) -> {size} Shares")
 
             args = OrderArgs(price=limit_price, size=size, side=BUY, token_id=token_id)
-            signed_order = self.client.create_order(args)
-
-            tp_signed = self._sign_tp_order(limit_price, size, token_id)
+            # Sign the entry and its TP concurrently; a TP failure yields None, an entry failure raises
+            signed_order, tp_signed = await asyncio.gather(
+                self._to_clob(self.client.create_order, args),
+                self._sign_tp_order_async(limit_price, size, token_id),
+            )
 
             return {
                 "primary_order": signed_order,
@@ -631,6 +1019,9 @@ class PolymarketManager:
             logger.error(f"Buy Prep Error: {e}")
             return None
 
+    async def _sign_tp_order_async(self, entry_price, size, token_id):
+        return await self._to_clob(self._sign_tp_order, entry_price, size, token_id)
+
     def _sign_tp_order(self, entry_price, size, token_id):
         try:
             from py_clob_client.clob_types import OrderArgs
@@ -645,26 +1036,21 @@ class PolymarketManager:
             logger.warning(f"⚠️ Failed to sign TP Order: {e}")
             return None
 
-    async def _prepare_sell_order(self, ob, token_id):
+    async def _prepare_sell_order(self, ob, token_id, real_bal):
         try:
-            from py_clob_client.clob_types import OrderArgs, BalanceAllowanceParams, AssetType
+            from py_clob_client.clob_types import OrderArgs
             from py_clob_client.order_builder.constants import SELL
 
             if not ob.bids:
                 return None
 
-            real_bal = await self._get_token_balance(token_id)
-            if real_bal < MIN_SELL_BALANCE:
-                return {"action": "CLEAR_STATE"}
-
             self._cancel_pending_tp(token_id)
 
             size = math.floor(real_bal * 100) / 100
             if size <= 0:
                 size = real_bal
 
-            sorted_bids = sorted(ob.bids, key=lambda x: float(x.price), reverse=True)
-            best_bid = float(sorted_bids[0].price)
+            best_bid = _best_bid_price(ob.bids)
             limit_price = max(best_bid - SELL_PRICE_DUMP_OFFSET, 0.01)
 
             logger.warning(f"📉 DUMPING {size} Shares (RealBal: {real_bal}) @ {limit_price}")
@@ -683,23 +1069,21 @@ class PolymarketManager:
 
     async def _get_token_balance(self, token_id):
         if self.is_paper:
-            state = StateManager.load()
+            state = self._load_state()
             pos = state.get("current_position")
             return float(pos.get("size", 0)) if pos and pos.get("token_id") == token_id else 0.0
 
         try:
-            from py_clob_client.clob_types import BalanceAllowanceParams, AssetType
-            sig_type = int(os.getenv("CLOB_SIGNATURE_TYPE", "2"))
-            resp = await asyncio.to_thread(
-                self.client.get_balance_allowance,
-                BalanceAllowanceParams(asset_type=AssetType.CONDITIONAL, token_id=token_id, signature_type=sig_type)
-            )
-            return float(resp.get('balance', 0)) / USDC_DECIMALS
+            def fetch():
+                resp = self.client.get_balance_allowance(self._balance_params(token_id))
+                return float(resp.get('balance', 0)) / USDC_DECIMALS
+
+            return await self._cached_balance(("CONDITIONAL", token_id), fetch)
         except Exception:
             return 0.0
 
     def _cancel_pending_tp(self, token_id):
-        state = StateManager.load()
+        state = self._load_state()
         pos = state.get("current_position")
         if not pos or not pos.get("tp_order_id"):
             return
@@ -717,7 +1101,7 @@ class PolymarketManager:
 
     def _sync_check_tsl(self, current_price, current_atr):
         try:
-            state = StateManager.load()
+            state = self._load_state()
             pos = state.get("current_position")
             if not pos:
                 return
@@ -757,11 +1141,8 @@ class PolymarketManager:
             logger.error(f"TSL Error: {e}")
 
     def _check_position_balance(self, token_id, entry_ts, size):
-        from py_clob_client.clob_types import BalanceAllowanceParams, AssetType
         try:
-            resp = self.client.get_balance_allowance(
-                BalanceAllowanceParams(asset_type=AssetType.CONDITIONAL, token_id=token_id, signature_type=2)
-            )
+            resp = self.client.get_balance_allowance(self._balance_params(token_id))
             bal = float(resp.get('balance', 0)) / USDC_DECIMALS
         except Exception:
             bal = 0.0
@@ -775,21 +1156,32 @@ class PolymarketManager:
 
     def _get_best_bid(self, token_id):
         try:
-            ob = self.client.get_order_book(token_id)
+            ob = self._get_ob_sync(token_id)
         except Exception as e:
             logger.warning(f"⚠️ TSL Orderbook Fetch Failed: {e}. Skipping check.")
             return None
         if not ob.bids:
             return None
-        return float(sorted(ob.bids, key=lambda x: float(x.price), reverse=True)[0].price)
+        return _best_bid_price(ob.bids)
 
     def _update_high_water_mark(self, pos, state, roi_pct, highest_roi):
-        if roi_pct > highest_roi:
-            pos["highest_roi"] = roi_pct
+        token_id = pos["token_id"]
+        saved_roi = highest_roi
+        peak = self._hwm.get(token_id)
+        if peak is not None and peak > highest_roi:
+            highest_roi = peak
+        if roi_pct <= highest_roi:
+            return highest_roi
+
+        # The trailing stop always sees the new peak; the disk write is throttled and off-thread
+        self._hwm = {token_id: roi_pct}
+        pos["highest_roi"] = roi_pct
+        now = time.monotonic()
+        if roi_pct - saved_roi > HWM_SAVE_MIN_DELTA or now - self._last_hwm_save > HWM_SAVE_INTERVAL:
             state["current_position"] = pos
-            StateManager.save(state)
-            return roi_pct
-        return highest_roi
+            StateManager.save_async(state)
+            self._last_hwm_save = now
+        return roi_pct
 
     def _calculate_trail_distance(self, current_atr, current_price):
         trail_dist = TRAIL_MIN_DIST_PCT
@@ -821,11 +1213,12 @@ class PolymarketManager:
             if not ob.bids:
                 return
 
-            best_bid = float(sorted(ob.bids, key=lambda x: float(x.price), reverse=True)[0].price)
+            best_bid = _best_bid_price(ob.bids)
             limit = max(best_bid - SELL_PRICE_DUMP_OFFSET, 0.01)
             self.client.create_and_post_order(
                 OrderArgs(price=limit, size=amount, side=SELL, token_id=token_id)
             )
+            self._invalidate_balances(token_id)
             pnl = StateManager.update_position(token_id, limit, amount, side="SELL")
             if self.risk and pnl:
                 self.risk.update_pnl(pnl)
@@ -838,7 +1231,7 @@ class PolymarketManager:
         try:
             ob = self.client.get_order_book(token_id)
             if ob.bids:
-                best_bid = float(sorted(ob.bids, key=lambda x: float(x.price), reverse=True)[0].price)
+                best_bid = _best_bid_price(ob.bids)
                 sell_price = max(best_bid - 0.01, 0.01)
                 proceeds = sell_price * amount
                 self.virtual_balance += proceeds
@@ -858,19 +1251,14 @@ class PolymarketManager:
         if not self.mev:
             return None
         try:
-            EXCHANGE_ADDR = Web3.to_checksum_address("0x4bFb41d5B3570DeFd03C39a9A4D8dE6Bd8B8982E")
-
-            def to_6d(val):
-                return int(float(val) * 10**6) if isinstance(val, str) else int(val * 10**6)
-
             order_struct = {
                 "salt": int(clob_order.get('salt', 0)),
-                "maker": Web3.to_checksum_address(clob_order.get('maker', clob_order.get('maker_address'))),
-                "signer": Web3.to_checksum_address(clob_order.get('signer', clob_order.get('signer_address', clob_order.get('maker_address')))),
-                "taker": Web3.to_checksum_address(clob_order.get('taker', "0x0000000000000000000000000000000000000000")),
+                "maker": _checksum(clob_order.get('maker', clob_order.get('maker_address'))),
+                "signer": _checksum(clob_order.get('signer', clob_order.get('signer_address', clob_order.get('maker_address')))),
+                "taker": _checksum(clob_order.get('taker', ZERO_ADDR)),
                 "tokenId": int(clob_order.get('token_id', clob_order.get('asset_id'))),
-                "makerAmount": to_6d(clob_order['maker_amount']),
-                "takerAmount": to_6d(clob_order['taker_amount']),
+                "makerAmount": _to_6d(clob_order['maker_amount']),
+                "takerAmount": _to_6d(clob_order['taker_amount']),
                 "expiration": int(clob_order['expiration']),
                 "nonce": int(clob_order.get('nonce', 0)),
                 "feeRateBps": int(clob_order.get('fee_rate_bps', 0)),
@@ -879,29 +1267,14 @@ class PolymarketManager:
                 "signature": Web3.to_bytes(hexstr=clob_order['signature'])
             }
 
-            FILL_ORDER_ABI = [{
-                "name": "fillOrder", "type": "function", "stateMutability": "nonpayable",
-                "inputs": [
-                    {"name": "order", "type": "tuple", "components": [
-                        {"name": "salt", "type": "uint256"}, {"name": "maker", "type": "address"},
-                        {"name": "signer", "type": "address"}, {"name": "taker", "type": "address"},
-                        {"name": "tokenId", "type": "uint256"}, {"name": "makerAmount", "type": "uint256"},
-                        {"name": "takerAmount", "type": "uint256"}, {"name": "expiration", "type": "uint256"},
-                        {"name": "nonce", "type": "uint256"}, {"name": "feeRateBps", "type": "uint256"},
-                        {"name": "side", "type": "uint8"}, {"name": "signatureType", "type": "uint8"},
-                        {"name": "signature", "type": "bytes"}
-                    ]},
-                    {"name": "fillAmount", "type": "uint256"}
-                ]
-            }]
-
             w3 = self.mev.w3
-            contract = w3.eth.contract(address=EXCHANGE_ADDR, abi=FILL_ORDER_ABI)
-            data = contract.encode_abi("fillOrder", [order_struct, to_6d(fill_amount)])
+            if self._fill_contract is None:
+                self._fill_contract = w3.eth.contract(address=EXCHANGE_ADDR, abi=FILL_ORDER_ABI)
+            data = self._fill_contract.encode_abi("fillOrder", [order_struct, _to_6d(fill_amount)])
 
             return {
                 "from": self.mev.address, "to": EXCHANGE_ADDR, "data": data,
-                "gas": 400000, "gasPrice": w3.eth.gas_price, "chainId": POLYGON_CHAIN_ID
+                "gas": 400000, "gasPrice": self._gas_price(), "chainId": POLYGON_CHAIN_ID
             }
         except Exception as e:
             logger.error(f"❌ TX Encoding Failed: {e}")
@@ -915,36 +1288,46 @@ class PolymarketManager:
         Returns: 'Yes', 'No', or None (still open)."""
         if not market_id:
             return None
+
+        cache = self._resolution_cache
+        hit = cache.get(market_id)
+        if hit and (hit[1] is not None or time.monotonic() - hit[0] < RESOLUTION_OPEN_TTL):
+            cache.move_to_end(market_id)
+            return hit[1]
+
+        result = await self._fetch_market_resolution(market_id)
+        cache[market_id] = (time.monotonic(), result)
+        cache.move_to_end(market_id)
+        if len(cache) > RESOLUTION_CACHE_MAX:
+            cache.popitem(last=False)
+        return result
+
+    async def _fetch_market_resolution(self, market_id):
         try:
             url = f"https://gamma-api.polymarket.com/markets/{market_id}"
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, timeout=aiohttp.ClientTimeout(total=10)) as resp:
-                    if resp.status != 200:
-                        return None
-                    data = await resp.json()
-
-                    if not data.get("closed"):
-                        return None
-
-                    # Check outcomePrices for definitive resolution
-                    outcome_prices = data.get("outcomePrices")
-                    if outcome_prices:
-                        try:
-                            prices = json.loads(outcome_prices) if isinstance(outcome_prices, str) else outcome_prices
-                            if len(prices) >= 2:
-                                if float(prices[0]) >= 0.99:
-                                    return "Yes"
-                                elif float(prices[1]) >= 0.99:
-                                    return "No"
-                        except Exception:
-                            pass
-
-                    # Fallback: check resolution field
-                    resolution = data.get("resolution")
-                    if resolution:
-                        return resolution  # 'Yes' or 'No'
-
-                    return None
+            data = await self._gamma_get(url)
+            if not data or not data.get("closed"):
+                return None
+
+            # Check outcomePrices for definitive resolution
+            outcome_prices = data.get("outcomePrices")
+            if outcome_prices:
+                try:
+                    prices = _json_loads(outcome_prices) if isinstance(outcome_prices, str) else outcome_prices
+                    if len(prices) >= 2:
+                        if float(prices[0]) >= 0.99:
+                            return "Yes"
+                        elif float(prices[1]) >= 0.99:
+                            return "No"
+                except Exception:
+                    pass
+
+            # Fallback: check resolution field
+            resolution = data.get("resolution")
+            if resolution:
+                return resolution  # 'Yes' or 'No'
+
+            return None
         except Exception as e:
             logger.debug(f"Resolution check failed for {market_id}: {e}")
             return None
@@ -954,7 +1337,7 @@ class PolymarketManager:
         if not self.is_paper:
             return
 
-        state = StateManager.load()
+        state = self._load_state()
         pos = state.get("current_position")
         if not pos or not pos.get("market_id") or not pos.get("token_id"):
             return
@@ -997,13 +1380,21 @@ class PolymarketManager:
         if not pending:
             return
 
-        for trade in pending[:5]:  # Limit to 5 per cycle
-            market_id = trade.get("market_id", "")
-            token_id = trade.get("token_id", "")
-            if not market_id:
-                continue
+        # Overlap the Gamma round trips; outcomes are still applied in pending order
+        limit = asyncio.Semaphore(RESOLUTION_CONCURRENCY)
+
+        async def resolve(market_id):
+            async with limit:
+                return await self.check_market_resolution(market_id)
 
-            resolution = await self.check_market_resolution(market_id)
+        batch = [t for t in pending[:RESOLUTION_BATCH] if t.get("market_id")]
+        market_ids = list(dict.fromkeys(t["market_id"] for t in batch))  # one lookup per market
+        results = await asyncio.gather(*(resolve(mid) for mid in market_ids))
+        by_market = dict(zip(market_ids, results))
+
+        for trade in batch:
+            token_id = trade.get("token_id", "")
+            resolution = by_market[trade["market_id"]]
             if resolution is None:
                 continue  # Market still open
 
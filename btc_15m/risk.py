@@ -1,5 +1,5 @@
 import logging
-from datetime import datetime, timezone, timedelta
+import time
 
 from btc_15m.config import (
     MAX_DAILY_LOSS_PCT,
@@ -14,6 +14,23 @@ from btc_15m.config import (
 
 logger = logging.getLogger("bot")
 
+# Sizing parameters resolved from AGGRESSIVE_MODE, refreshed at most once a second
+_AGG_TTL = 1.0
+_AGG_CACHE = {"t": float("-inf"), "mult": KELLY_MULTIPLIER, "cap": MAX_RISK_CAP}
+
+
+def _agg_params():
+    """(kelly multiplier, balance cap fraction) for the current mode."""
+    now = time.monotonic()
+    if now - _AGG_CACHE["t"] > _AGG_TTL:
+        agg = is_aggressive_mode()
+        _AGG_CACHE.update(
+            t=now,
+            mult=KELLY_MULTIPLIER_AGGRESSIVE if agg else KELLY_MULTIPLIER,
+            cap=MAX_RISK_CAP_AGGRESSIVE if agg else MAX_RISK_CAP,
+        )
+    return _AGG_CACHE["mult"], _AGG_CACHE["cap"]
+
 
 class KellyEngine:
     @staticmethod
@@ -28,35 +45,32 @@ class KellyEngine:
         if kelly_f <= 0:
             return 0
 
-        multiplier = KELLY_MULTIPLIER_AGGRESSIVE if is_aggressive_mode() else KELLY_MULTIPLIER
-        risk_cap = MAX_RISK_CAP_AGGRESSIVE if is_aggressive_mode() else MAX_RISK_CAP
-        raw_size = balance * kelly_f * multiplier
-        max_size = balance * risk_cap
-        return min(raw_size, max_size, balance * 0.95)
+        multiplier, cap = _agg_params()
+        return min(balance * kelly_f * multiplier, balance * cap, balance * 0.95)
 
 
 class RiskManager:
     def __init__(self):
         self.daily_start_balance = None
-        self.last_reset_date = None
+        # Epoch of the next UTC midnight; 0 forces a reset on the first check
+        self._day_end_epoch = 0.0
         self.realized_pnl_daily = 0.0
         self.max_daily_loss_pct = MAX_DAILY_LOSS_PCT
         self.is_halted = False
-        self.halt_until = None
+        self._halt_until_epoch = 0.0
 
     def check_circuit_breaker(self, current_balance):
-        now = datetime.now(timezone.utc)
-        today = now.date()
+        now = time.time()
 
-        if self.last_reset_date != today:
+        if now >= self._day_end_epoch:
             logger.info(f"New Trading Day: Setting reference balance to ${current_balance:.2f}")
             self.daily_start_balance = current_balance
-            self.last_reset_date = today
+            self._day_end_epoch = (now // 86400 + 1) * 86400
             self.is_halted = False
             return False
 
         if self.is_halted:
-            if now > self.halt_until:
+            if now > self._halt_until_epoch:
                 logger.info("🟢 Circuit Breaker Reset period over. Resuming...")
                 self.is_halted = False
                 self.daily_start_balance = current_balance
@@ -70,7 +84,7 @@ class RiskManager:
         if drawdown >= self.max_daily_loss_pct:
             logger.error(f"🚨 CIRCUIT BREAKER TRIPPED! Drawdown: {drawdown:.1%}. Halting for {CIRCUIT_BREAKER_HALT_HOURS} hours.")
             self.is_halted = True
-            self.halt_until = now + timedelta(hours=CIRCUIT_BREAKER_HALT_HOURS)
+            self._halt_until_epoch = now + CIRCUIT_BREAKER_HALT_HOURS * 3600
             return True
 
         return False
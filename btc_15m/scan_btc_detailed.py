@@ -3,11 +3,33 @@ import aiohttp
 import json
 import time
 import os
+import re
 import sys
 from datetime import datetime
 from collections import deque
 import logging
 
+import numpy as np
+
+# orjson is optional: faster parse for every WS frame and REST payload
+try:
+    import orjson
+
+    def _json_loads(data):
+        return orjson.loads(data)
+except ImportError:
+    def _json_loads(data):
+        return json.loads(data)
+
+# numba is optional: JIT the EMA recurrence, fall back to a plain Python loop
+try:
+    from numba import njit
+except ImportError:
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+        return lambda fn: fn
+
 # Configure Logging
 logging.basicConfig(level=logging.ERROR)
 logger = logging.getLogger("Assistant")
@@ -27,42 +49,70 @@ BINANCE_WSS = "wss://stream.binance.com:9443/ws/btcusdt@kline_1m"
 BINANCE_REST = "https://api.binance.com/api/v3/klines"
 POLYMARKET_GAMMA = "https://gamma-api.polymarket.com/events"
 POLY_WS_URL = "wss://ws-live-data.polymarket.com"
+HISTORY_BARS = 100
+# Both phrases, in either order, in one search
+_MARKET_RE = re.compile(r"Bitcoin.*Up or Down|Up or Down.*Bitcoin")
+
+# Screen clear + banner, identical every frame
+_FRAME_HEADER = (
+    "\033[H\033[J"
+    f"{Colors.CYAN}{Colors.BOLD}╔════════════════════════════════════════════╗{Colors.RESET}\n"
+    f"{Colors.CYAN}║      POLYMARKET BTC 15m ASSISTANT      ║{Colors.RESET}\n"
+    f"{Colors.CYAN}╚════════════════════════════════════════════╝{Colors.RESET}\n"
+)
 
 # --- TA Calculations ---
+@njit(cache=True, fastmath=True)
+def _ema(data, period):
+    # Simple EMA seeded with the first value (lightweight approx)
+    k = 2 / (period + 1)
+    res = np.empty(data.size)
+    res[0] = data[0]
+    for i in range(1, data.size):
+        res[i] = data[i] * k + res[i-1] * (1 - k)
+    return res
+
+@njit(cache=True, fastmath=True)
+def _rsi_last(data, period):
+    # diff, gain/loss split and the averages in one pass over the last `period` deltas
+    gain = 0.0
+    loss = 0.0
+    for i in range(data.size - period, data.size):
+        d = data[i] - data[i-1]
+        if d > 0:
+            gain += d
+        else:
+            loss -= d
+    if loss == 0: return 100.0
+    return 100 - (100 / (1 + gain / loss))
+
+# Compile (or load the cached build) at import, not on the first WS message
+_ema(np.zeros(32), 9)
+_rsi_last(np.zeros(32), 14)
+
 def calculate_rsi(prices, period=14):
     if len(prices) < period + 1: return 50.0
-    deltas = [prices[i] - prices[i-1] for i in range(1, len(prices))]
-    gains = [d if d > 0 else 0 for d in deltas]
-    losses = [-d if d < 0 else 0 for d in deltas]
-    
-    avg_gain = sum(gains[-period:]) / period
-    avg_loss = sum(losses[-period:]) / period
-    
-    if avg_loss == 0: return 100.0
-    rs = avg_gain / avg_loss
-    return 100 - (100 / (1 + rs))
+    return float(_rsi_last(np.fromiter(prices, dtype=np.float64, count=len(prices)), period))
 
 def calculate_macd(prices, fast=12, slow=26, signal=9):
     if len(prices) < slow + signal: return 0, 0, 0
-    # Simple EMA for lightweight approx
-    def ema(data, period):
-        k = 2 / (period + 1)
-        res = [data[0]]
-        for i in range(1, len(data)):
-            res.append(data[i] * k + res[i-1] * (1-k))
-        return res
+    x = np.fromiter(prices, dtype=np.float64, count=len(prices))
+    macd_line = _ema(x, fast) - _ema(x, slow)
+    signal_line = _ema(macd_line, signal)
     
-    emas_fast = ema(prices, fast)
-    emas_slow = ema(prices, slow)
-    macd_line = [f - s for f, s in zip(emas_fast, emas_slow)]
-    signal_line = ema(macd_line, signal)
-    
-    return macd_line[-1], signal_line[-1], macd_line[-1] - signal_line[-1]
+    return float(macd_line[-1]), float(signal_line[-1]), float(macd_line[-1] - signal_line[-1])
 
 # --- Main Assistant Class ---
 class PolymarketAssistant:
+    # Fixed attribute set: per-tick reads hit slots instead of the instance dict
+    __slots__ = (
+        "closes", "current_price", "poly_price", "ref_price", "market",
+        "rsi", "macd_hist", "ha_color", "prediction", "predict_confidence",
+        "last_print", "_indicator_key", "_indicator_text", "_frame_key", "_http",
+    )
+
     def __init__(self):
-        self.closes = []
+        self.closes = deque(maxlen=HISTORY_BARS)
         self.current_price = 0.0
         self.poly_price = None  # Clob price
         self.ref_price = None   # Chainlink/Ref price
@@ -77,50 +127,71 @@ class PolymarketAssistant:
 
         # Output Buffer
         self.last_print = 0
+        self._indicator_key = None
+        self._indicator_text = ""
+        self._frame_key = None
+
+        # One keep-alive session for REST + WS, created inside the running loop
+        self._http = None
+
+    async def _session(self):
+        if self._http is None or self._http.closed:
+            self._http = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=32, ttl_dns_cache=300, keepalive_timeout=60),
+                timeout=aiohttp.ClientTimeout(total=10),
+            )
+        return self._http
+
+    async def aclose(self):
+        if self._http is not None and not self._http.closed:
+            await self._http.close()
 
     async def find_latest_market(self):
         print(f"{Colors.YELLOW}🔍 Scanning for latest 15m BTC Market...{Colors.RESET}")
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(POLYMARKET_GAMMA, params={
-                    "limit": 50, "active": "true", "archived": "false", 
-                    "closed": "false", "order": "startDate", "ascending": "false"
-                }) as resp:
-                    if resp.status == 200:
-                        data = await resp.json()
-                        for event in data:
-                            markets = event.get("markets", [])
-                            for m in markets:
-                                q = m.get("question", "")
-                                if "Bitcoin" in q and "Up or Down" in q:
-                                    # Found it
-                                    self.market = m
-                                    self.market['slug'] = event.get('slug')
-                                    print(f"{Colors.GREEN}✅ Found: {q} (End: {m.get('endDate')}){Colors.RESET}")
-                                    return
+            session = await self._session()
+            async with session.get(POLYMARKET_GAMMA, params={
+                "limit": 50, "active": "true", "archived": "false", 
+                "closed": "false", "order": "startDate", "ascending": "false"
+            }) as resp:
+                if resp.status == 200:
+                    data = _json_loads(await resp.read())
+                    for event in data:
+                        markets = event.get("markets", [])
+                        for m in markets:
+                            q = m.get("question", "")
+                            if _MARKET_RE.search(q):
+                                # Found it
+                                self.market = m
+                                self.market['slug'] = event.get('slug')
+                                print(f"{Colors.GREEN}✅ Found: {q} (End: {m.get('endDate')}){Colors.RESET}")
+                                return
         except Exception as e:
             print(f"{Colors.RED}scan error: {e}{Colors.RESET}")
 
     async def fetch_history(self):
         print(f"{Colors.YELLOW}⏳ Fetching History for TA...{Colors.RESET}")
         try:
-            async with aiohttp.ClientSession() as session:
-                url = f"{BINANCE_REST}?symbol=BTCUSDT&interval=1m&limit=100"
-                async with session.get(url) as resp:
-                    data = await resp.json()
-                    self.closes = [float(k[4]) for k in data]
-                    print(f"{Colors.GREEN}✅ History Loaded ({len(self.closes)} candles){Colors.RESET}")
+            session = await self._session()
+            url = f"{BINANCE_REST}?symbol=BTCUSDT&interval=1m&limit={HISTORY_BARS}"
+            async with session.get(url) as resp:
+                data = _json_loads(await resp.read())
+                self.closes = deque((float(k[4]) for k in data), maxlen=HISTORY_BARS)
+                print(f"{Colors.GREEN}✅ History Loaded ({len(self.closes)} candles){Colors.RESET}")
         except:
             pass
 
-    def run_analysis(self):
-        # Update Indicators
+    def update_indicators(self):
+        # RSI/MACD read closed bars only: recompute on candle close, not on every tick
         if not self.closes: return
         
         self.rsi = calculate_rsi(self.closes)
         _, _, self.macd_hist = calculate_macd(self.closes)
+
+    def run_analysis(self):
+        if not self.closes: return
         
-        # Simple Prediction Logic
+        # Simple Prediction Logic (cheap; the trend term follows the live price)
         score = 0
         if self.rsi > 60: score += 1
         if self.rsi < 40: score -= 1
@@ -140,51 +211,68 @@ class PolymarketAssistant:
             self.predict_confidence = 50.0
 
     async def stream_binance(self):
-        async with aiohttp.ClientSession() as session:
-            async with session.ws_connect(BINANCE_WSS) as ws:
-                async for msg in ws:
-                    if msg.type == aiohttp.WSMsgType.TEXT:
-                        data = json.loads(msg.data)
-                        k = data['k']
-                        self.current_price = float(k['c'])
-                        if k['x']: # Candle closed
-                            self.closes.append(self.current_price)
-                            if len(self.closes) > 100: self.closes.pop(0)
-                        
-                        self.run_analysis()
-                        self.print_dashboard()
+        session = await self._session()
+        async with session.ws_connect(BINANCE_WSS) as ws:
+            async for msg in ws:
+                if msg.type == aiohttp.WSMsgType.TEXT:
+                    data = _json_loads(msg.data)
+                    k = data['k']
+                    self.current_price = float(k['c'])
+                    if k['x']: # Candle closed
+                        self.closes.append(self.current_price)  # deque drops the oldest bar
+                        self.update_indicators()
+                    
+                    self.run_analysis()
+                    self.print_dashboard()
 
     def print_dashboard(self):
         if time.time() - self.last_print < 1.0: return
+        # Dirty bit: nothing on screen would change, so skip building the frame
+        frame_key = (self.current_price, self.rsi, self.macd_hist, self.prediction,
+                     self.predict_confidence, self.market.get('question') if self.market else None)
+        if frame_key == self._frame_key: return
+        self._frame_key = frame_key
         self.last_print = time.time()
         
-        # Clear Screen (ANSI)
-        print("\033[H\033[J", end="")
-        
-        print(f"{Colors.CYAN}{Colors.BOLD}╔════════════════════════════════════════════╗{Colors.RESET}")
-        print(f"{Colors.CYAN}║      POLYMARKET BTC 15m ASSISTANT      ║{Colors.RESET}")
-        print(f"{Colors.CYAN}╚════════════════════════════════════════════╝{Colors.RESET}\n")
+        # Whole frame (screen clear included) goes out in one write + flush
+        lines = [_FRAME_HEADER]
         
         if self.market:
-            print(f"🎯 Market: {self.market.get('question')}")
+            lines.append(f"🎯 Market: {self.market.get('question')}")
         
-        print(f"\n💰 {Colors.BOLD}BTC Price:{Colors.RESET} ${self.current_price:,.2f}")
+        lines.append(f"\n💰 {Colors.BOLD}BTC Price:{Colors.RESET} ${self.current_price:,.2f}")
+        lines.append(self._indicator_lines())
         
-        rsi_color = Colors.GREEN if self.rsi > 55 else (Colors.RED if self.rsi < 45 else Colors.YELLOW)
-        print(f"📊 {Colors.BOLD}RSI (1m):{Colors.RESET}  {rsi_color}{self.rsi:.1f}{Colors.RESET}")
+        lines.append(f"\n🔮 {Colors.BOLD}PREDICTION:{Colors.RESET}  {self.prediction}")
+        lines.append(f"🛡️ {Colors.BOLD}Confidence:{Colors.RESET} {self.predict_confidence:.1f}%")
         
+        lines.append(f"\n{Colors.BLUE}Press Ctrl+C to stop{Colors.RESET}\n")
+        sys.stdout.write("\n".join(lines))
+        sys.stdout.flush()
+
+    def _indicator_lines(self):
+        """Colorized RSI/MACD rows, rebuilt only when the displayed values change."""
+        rsi_color = Colors.GREEN if self.rsi > 55 else (Colors.RED if self.rsi < 45 else Colors.YELLOW)
         macd_color = Colors.GREEN if self.macd_hist > 0 else Colors.RED
-        print(f"🌊 {Colors.BOLD}MACD:{Colors.RESET}      {macd_color}{self.macd_hist:.2f}{Colors.RESET}")
-        
-        print(f"\n🔮 {Colors.BOLD}PREDICTION:{Colors.RESET}  {self.prediction}")
-        print(f"🛡️ {Colors.BOLD}Confidence:{Colors.RESET} {self.predict_confidence:.1f}%")
-        
-        print(f"\n{Colors.BLUE}Press Ctrl+C to stop{Colors.RESET}")
+        rsi_txt = f"{self.rsi:.1f}"
+        macd_txt = f"{self.macd_hist:.2f}"
+        key = (rsi_color, rsi_txt, macd_color, macd_txt)
+        if key != self._indicator_key:
+            self._indicator_text = (
+                f"📊 {Colors.BOLD}RSI (1m):{Colors.RESET}  {rsi_color}{rsi_txt}{Colors.RESET}\n"
+                f"🌊 {Colors.BOLD}MACD:{Colors.RESET}      {macd_color}{macd_txt}{Colors.RESET}"
+            )
+            self._indicator_key = key
+        return self._indicator_text
 
     async def run(self):
-        await self.find_latest_market()
-        await self.fetch_history()
-        await self.stream_binance()
+        try:
+            await self.find_latest_market()
+            await self.fetch_history()
+            self.update_indicators()
+            await self.stream_binance()
+        finally:
+            await self.aclose()
 
 if __name__ == "__main__":
     try:
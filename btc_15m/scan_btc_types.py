@@ -1,17 +1,32 @@
 import requests
 import json
+from requests.adapters import HTTPAdapter
 
 GAMMA_API_URL = "https://gamma-api.polymarket.com/events"
 
+# orjson is optional: parse the event payload straight from bytes
+try:
+    import orjson
+
+    def _json_loads(data):
+        return orjson.loads(data)
+except ImportError:
+    def _json_loads(data):
+        return json.loads(data)
+
+# Keep-alive session shared by every scan in this process
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+
 def scan_btc_markets():
     print("🔍 Scanning for Bitcoin Markets...")
     try:
-        resp = requests.get(GAMMA_API_URL, params={
+        resp = _SESSION.get(GAMMA_API_URL, params={
             "limit": 100, "active": "true", "archived": "false", "closed": "false",
             "order": "volume24hr", "ascending": "false"
-        })
+        }, timeout=10)
         resp.raise_for_status()
-        events = resp.json()
+        events = _json_loads(resp.content)
     except Exception as e:
         print(f"Error: {e}")
         return
@@ -1,5 +1,67 @@
 import math
-from datetime import datetime, timezone
+from collections import deque
+
+import numpy as np
+
+# numba is optional: JIT the scalar recurrences, fall back to plain Python loops
+try:
+    from numba import njit
+except ImportError:
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+        return lambda fn: fn
+
+# sqrt of 15m bars per year, to annualize a per-bar volatility
+_ANNUALIZE_15M = math.sqrt(4 * 24 * 365)
+
+
+def _logistic(log_odds):
+    # exp(-x) cannot overflow inside +/-700
+    if log_odds > 700: return 1.0
+    if log_odds < -700: return 0.0
+    return 1.0 / (1.0 + math.exp(-log_odds))
+
+
+@njit(cache=True)
+def _wilder_smooth(values, period):
+    # SMA seed over the first `period` values, then Wilder's smoothing
+    out = np.empty(values.size - period + 1)
+    out[0] = values[:period].mean()
+    for i in range(1, out.size):
+        out[i] = (out[i-1] * (period - 1) + values[period + i - 1]) / period
+    return out
+
+
+@njit(cache=True)
+def _wilder_last(values, period):
+    # Same recurrence as _wilder_smooth, keeping only the final value
+    avg = values[:period].mean()
+    for i in range(period, values.size):
+        avg = (avg * (period - 1) + values[i]) / period
+    return avg
+
+
+@njit(cache=True)
+def _ema_recurrence(values, length):
+    # SMA seed over the first `length` values, then the EMA recurrence
+    k = 2 / (length + 1)
+    out = np.empty(values.size - length + 1)
+    out[0] = values[:length].mean()
+    for i in range(length, values.size):
+        out[i - length + 1] = values[i] * k + out[i - length] * (1 - k)
+    return out
+
+
+@njit(cache=True)
+def _ha_open_series(opens, closes, ha_close):
+    # HA open is the only truly sequential part: midpoint of the previous HA candle
+    out = np.empty(ha_close.size)
+    out[0] = (opens[0] + closes[0]) / 2
+    for i in range(1, out.size):
+        out[i] = (out[i-1] + ha_close[i-1]) / 2
+    return out
+
 
 class Indicators:
     @staticmethod
@@ -7,83 +69,94 @@ class Indicators:
         if len(data) < period: return None
         return sum(data[-period:]) / period
 
+    @staticmethod
+    def rsi_series(closes, period=14):
+        """Wilder RSI for every bar. First `period` entries are NaN."""
+        x = np.asarray(closes, dtype=np.float64)
+        out = np.full(x.shape, np.nan)
+        if x.size < period + 1: return out
+
+        deltas = np.diff(x)
+        gains = np.maximum(deltas, 0.0)
+        losses = -np.minimum(deltas, 0.0)
+
+        # 1. Initial SMA seed, then 2. Wilder's smoothing
+        avg_gain = _wilder_smooth(gains, period)
+        avg_loss = _wilder_smooth(losses, period)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rsi = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+        out[period:] = np.where(avg_loss == 0, 100.0, rsi)
+        return out
+
     @staticmethod
     def calculate_rsi(closes, period=14):
         if len(closes) < period + 1: return None
-        
-        gains = []
-        losses = []
-        
-        # 1. Initial SMA RS
-        for i in range(1, period + 1):
-            change = closes[i] - closes[i-1]
-            if change > 0:
-                gains.append(change)
-                losses.append(0)
-            else:
-                gains.append(0)
-                losses.append(abs(change))
-        
-        avg_gain = sum(gains) / period
-        avg_loss = sum(losses) / period
-        
-        if avg_loss == 0: return 100
-        
-        # 2. Wilder's Smoothing
-        current_avg_gain = avg_gain
-        current_avg_loss = avg_loss
-        
-        for i in range(period + 1, len(closes)):
-            change = closes[i] - closes[i-1]
-            gain = change if change > 0 else 0
-            loss = abs(change) if change < 0 else 0
-            
-            current_avg_gain = (current_avg_gain * (period - 1) + gain) / period
-            current_avg_loss = (current_avg_loss * (period - 1) + loss) / period
-        
-        if current_avg_loss == 0: return 100
-        rs = current_avg_gain / current_avg_loss
-        return 100 - (100 / (1 + rs))
+        # Only the last value is needed: smooth gains/losses, skip the per-bar RSI array
+        deltas = np.diff(np.asarray(closes, dtype=np.float64))
+        avg_gain = _wilder_last(np.maximum(deltas, 0.0), period)
+        avg_loss = _wilder_last(-np.minimum(deltas, 0.0), period)
+        return Indicators._rsi_from_avgs(float(avg_gain), float(avg_loss))
 
     @staticmethod
-    def calculate_macd(closes, fast=12, slow=26, sign=9):
-        if len(closes) < slow + sign: return None
-        
-        def get_ema_series(values, length):
-            k = 2 / (length + 1)
-            emas = []
-            seed = sum(values[:length]) / length
-            emas.append(seed)
-            curr = seed
-            for val in values[length:]:
-                curr = (val * k) + (curr * (1 - k))
-                emas.append(curr)
-            return emas
-
-        ema12 = get_ema_series(closes, fast)
-        ema26 = get_ema_series(closes, slow)
-        
-        # Align series
-        overlap_len = min(len(ema12), len(ema26))
-        macd_line = []
-        
-        # Walk backwards to align
-        for i in range(1, overlap_len + 1):
-            val_slow = ema26[-i]
-            val_fast = ema12[-i] 
-            macd_line.insert(0, val_fast - val_slow)
-            
-        if len(macd_line) < sign: return None
-        signal_line = get_ema_series(macd_line, sign)
-        
-        last_macd = macd_line[-1]
-        last_signal = signal_line[-1]
-        prev_macd = macd_line[-2]
-        prev_signal = signal_line[-2]
-        
+    def rsi_state(closes, period=14):
+        """Seed state for rsi_update from a batch pass (needs period + 2 closes)."""
+        x = np.asarray(closes, dtype=np.float64)
+        if x.size < period + 2: return None
+
+        deltas = np.diff(x)
+        avg_gain = _wilder_smooth(np.maximum(deltas, 0.0), period)
+        avg_loss = _wilder_smooth(-np.minimum(deltas, 0.0), period)
+        state = {"period": period, "last_close": float(x[-1]),
+                 "avg_gain": float(avg_gain[-2]), "avg_loss": float(avg_loss[-2]),
+                 "last_rsi": None, "prev_rsi": None}
+        state["last_rsi"] = Indicators._rsi_from_avgs(state["avg_gain"], state["avg_loss"])
+        state["avg_gain"], state["avg_loss"] = float(avg_gain[-1]), float(avg_loss[-1])
+        Indicators._roll_rsi(state)
+        return state
+
+    @staticmethod
+    def rsi_update(state, close):
+        """Advance a rsi_state by one closed bar with Wilder's recurrence (O(1))."""
+        n = state["period"]
+        delta = close - state["last_close"]
+        state["last_close"] = close
+        state["avg_gain"] = (state["avg_gain"] * (n - 1) + max(delta, 0.0)) / n
+        state["avg_loss"] = (state["avg_loss"] * (n - 1) + max(-delta, 0.0)) / n
+        Indicators._roll_rsi(state)
+        return state
+
+    @staticmethod
+    def _roll_rsi(state):
+        state["prev_rsi"] = state["last_rsi"]
+        state["last_rsi"] = Indicators._rsi_from_avgs(state["avg_gain"], state["avg_loss"])
+
+    @staticmethod
+    def _rsi_from_avgs(avg_gain, avg_loss):
+        if avg_loss == 0: return 100.0
+        return 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+
+    @staticmethod
+    def ema_series(values, length):
+        """EMA seeded with the SMA of the first `length` values (len - length + 1 points)."""
+        return _ema_recurrence(np.ascontiguousarray(values, dtype=np.float64), length)
+
+    @staticmethod
+    def _macd_lines(x, fast, slow, sign):
+        """(fast EMA, slow EMA, MACD line, signal line), aligned on the most recent bars."""
+        ema_fast = Indicators.ema_series(x, fast)
+        ema_slow = Indicators.ema_series(x, slow)
+        overlap_len = min(ema_fast.size, ema_slow.size)
+        macd_line = ema_fast[-overlap_len:] - ema_slow[-overlap_len:]
+        return ema_fast, ema_slow, macd_line, Indicators.ema_series(macd_line, sign)
+
+    @staticmethod
+    def _macd_last(macd_line, signal_line):
+        last_macd = float(macd_line[-1])
+        last_signal = float(signal_line[-1])
         hist = last_macd - last_signal
-        prev_hist = prev_macd - prev_signal
-        
+        prev_hist = float(macd_line[-2] - signal_line[-2])
+
         return {
             "macd": last_macd, 
             "signal": last_signal, 
@@ -91,121 +164,171 @@ class Indicators:
             "hist_delta": hist - prev_hist
         }
 
+    @staticmethod
+    def calculate_macd(closes, fast=12, slow=26, sign=9):
+        if len(closes) < max(fast, slow) + sign: return None
+        _, _, macd_line, signal_line = Indicators._macd_lines(
+            np.asarray(closes, dtype=np.float64), fast, slow, sign)
+        return Indicators._macd_last(macd_line, signal_line)
+
+    @staticmethod
+    def macd_state(closes, fast=12, slow=26, sign=9):
+        """Seed state for macd_update from a batch pass; state["last"] matches calculate_macd."""
+        if len(closes) < max(fast, slow) + sign: return None
+        # One pass over the window feeds both the seed EMAs and the initial "last" reading
+        ema_fast, ema_slow, macd_line, signal_line = Indicators._macd_lines(
+            np.asarray(closes, dtype=np.float64), fast, slow, sign)
+
+        return {
+            "alphas": (2 / (fast + 1), 2 / (slow + 1), 2 / (sign + 1)),
+            "ema_fast": float(ema_fast[-1]), "ema_slow": float(ema_slow[-1]),
+            "signal": float(signal_line[-1]),
+            "last": Indicators._macd_last(macd_line, signal_line),
+        }
+
+    @staticmethod
+    def macd_update(state, close):
+        """Advance a macd_state by one closed bar with the EMA recurrence (O(1))."""
+        a_fast, a_slow, a_sign = state["alphas"]
+        state["ema_fast"] = a_fast * close + (1 - a_fast) * state["ema_fast"]
+        state["ema_slow"] = a_slow * close + (1 - a_slow) * state["ema_slow"]
+        macd = state["ema_fast"] - state["ema_slow"]
+        state["signal"] = a_sign * macd + (1 - a_sign) * state["signal"]
+
+        hist = macd - state["signal"]
+        state["last"] = {
+            "macd": macd,
+            "signal": state["signal"],
+            "hist": hist,
+            "hist_delta": hist - state["last"]["hist"],
+        }
+        return state
+
+    @staticmethod
+    def _day_length(last_ts):
+        # Candle stamps are ms if past 1e12, else seconds
+        return 86_400_000 if last_ts > 1e12 else 86_400
+
+    @staticmethod
+    def _session_start(ts):
+        """Index of the first candle at or after the last candle's UTC midnight."""
+        day = Indicators._day_length(ts[-1])
+        return int(np.searchsorted(ts, ts[-1] - ts[-1] % day, side="left"))
+
+    @staticmethod
+    def _to_soa(candles):
+        """Split [ts, o, h, l, c, v] rows into six contiguous float64 columns."""
+        x = np.asarray(candles, dtype=np.float64)
+        return tuple(np.ascontiguousarray(x[:, i]) for i in range(6))
+
     @staticmethod
     def calculate_atr(candles, period=14):
         # candles: [ts, o, h, l, c, v]
         if len(candles) < period + 1: return None
-        
-        tr_list = []
-        for i in range(1, len(candles)):
-            curr = candles[i]
-            prev = candles[i-1]
-            
-            h = float(curr[2])
-            l = float(curr[3])
-            cp = float(prev[4])
-            
-            tr1 = h - l
-            tr2 = abs(h - cp)
-            tr3 = abs(l - cp)
-            tr = max(tr1, tr2, tr3)
-            tr_list.append(tr)
-            
-        if len(tr_list) < period: return None
-        
-        current_atr = sum(tr_list[:period]) / period
-        for i in range(period, len(tr_list)):
-            tr = tr_list[i]
-            current_atr = ((current_atr * (period - 1)) + tr) / period
-            
-        return current_atr
+        _, _, h, l, c, _ = Indicators._to_soa(candles)
+
+        prev_c = c[:-1]
+        tr = np.maximum.reduce([h[1:] - l[1:], np.abs(h[1:] - prev_c), np.abs(l[1:] - prev_c)])
+        return float(_wilder_last(tr, period))
+
+    @staticmethod
+    def atr_state(candles, period=14):
+        """Seed state for atr_update from a batch pass; state["atr"] matches calculate_atr."""
+        atr = Indicators.calculate_atr(candles, period)
+        if atr is None: return None
+        return {"period": period, "prev_close": float(candles[-1][4]), "atr": atr}
+
+    @staticmethod
+    def atr_update(state, high, low, close):
+        """Advance an atr_state by one closed bar with Wilder's recurrence (O(1))."""
+        n = state["period"]
+        cp = state["prev_close"]
+        tr = max(high - low, abs(high - cp), abs(low - cp))
+        state["atr"] = (state["atr"] * (n - 1) + tr) / n
+        state["prev_close"] = close
+        return state
 
     @staticmethod
     def calculate_vwap_intraday(candles):
         # candles: [ts, o, h, l, c, v]
-        if not candles: return []
-        
-        start_index = 0
-        last_ts = float(candles[-1][0])
-        # Handle ms timestamp
-        try:
-            last_dt = datetime.fromtimestamp(last_ts / 1000, tz=timezone.utc)
-        except:
-             # Fallback for seconds
-             last_dt = datetime.fromtimestamp(last_ts, tz=timezone.utc)
-
-        day_start_ts = last_dt.replace(hour=0, minute=0, second=0, microsecond=0).timestamp() * 1000
+        if len(candles) == 0: return []
+        ts, _, h, l, c, v = Indicators._to_soa(candles)
         
-        for i in range(len(candles)-1, -1, -1):
-            if float(candles[i][0]) < day_start_ts:
-                start_index = i + 1
-                break
-                
-        pv_sum = 0
-        v_sum = 0
-        vwap_series = []
-        for i in range(start_index, len(candles)):
-            c = candles[i]
-            close = float(c[4])
-            vol = float(c[5])
-            tp = (float(c[2]) + float(c[3]) + close) / 3
-            pv_sum += tp * vol
-            v_sum += vol
-            vwap_series.append(pv_sum / v_sum if v_sum else None)
-            
+        start_index = Indicators._session_start(ts)
+
+        # Running sums as cumulative sums over today's columns
+        tp = (h[start_index:] + l[start_index:] + c[start_index:]) / 3
+        pv_sum = np.cumsum(tp * v[start_index:])
+        v_sum = np.cumsum(v[start_index:])
+        with np.errstate(divide="ignore", invalid="ignore"):
+            vwap_series = (pv_sum / v_sum).tolist()
+        # No volume yet (a zero-volume prefix of the day) has no VWAP
+        for i in range(int(np.searchsorted(v_sum, 0.0, side="right"))):
+            vwap_series[i] = None
         return vwap_series
 
+    @staticmethod
+    def vwap_state(candles, tail=4):
+        """Seed state for vwap_update: today's running sums plus the last `tail` VWAP values."""
+        if len(candles) == 0: return None
+        ts, _, h, l, c, v = Indicators._to_soa(candles)
+        day_len = Indicators._day_length(ts[-1])
+        start_index = Indicators._session_start(ts)
+        tp = (h[start_index:] + l[start_index:] + c[start_index:]) / 3
+        return {
+            "day_len": day_len, "day": int(ts[-1] // day_len),
+            "pv_sum": float((tp * v[start_index:]).sum()), "v_sum": float(v[start_index:].sum()),
+            "recent": deque(Indicators.calculate_vwap_intraday(candles)[-tail:], maxlen=tail),
+        }
+
+    @staticmethod
+    def vwap_update(state, ts, high, low, close, volume):
+        """Fold one closed bar into a vwap_state (O(1)); sums reset on the UTC day rollover."""
+        day = int(ts // state["day_len"])
+        if day != state["day"]:
+            state["day"] = day
+            state["pv_sum"] = state["v_sum"] = 0.0
+            state["recent"].clear()
+        state["pv_sum"] += (high + low + close) / 3 * volume
+        state["v_sum"] += volume
+        state["recent"].append(state["pv_sum"] / state["v_sum"] if state["v_sum"] else None)
+        return state
+
     @staticmethod
     def calculate_heiken_ashi(candles):
-        ha_candles = []
-        c0 = candles[0]
-        o0, h0, l0, cl0 = float(c0[1]), float(c0[2]), float(c0[3]), float(c0[4])
-        
-        ha_open = (o0 + cl0) / 2
-        ha_close = (o0 + h0 + l0 + cl0) / 4
-        ha_candles.append({'open': ha_open, 'close': ha_close, 'is_green': ha_close >= ha_open})
-        
-        for i in range(1, len(candles)):
-            c = candles[i]
-            curr_o, curr_h, curr_l, curr_c = float(c[1]), float(c[2]), float(c[3]), float(c[4])
-            prev_ha = ha_candles[-1]
-            
-            ha_close = (curr_o + curr_h + curr_l + curr_c) / 4
-            ha_open = (prev_ha['open'] + prev_ha['close']) / 2 
-            
-            ha_candles.append({'open': ha_open, 'close': ha_close, 'is_green': ha_close >= ha_open})
-            
-        last = ha_candles[-1]
-        target = last['is_green']
-        count = 0
-        for i in range(len(ha_candles)-1, -1, -1):
-            if ha_candles[i]['is_green'] == target: count += 1
-            else: break
-        
-        return {'color': 'green' if target else 'red', 'count': count}
+        _, o, h, l, c, _ = Indicators._to_soa(candles)
+        ha_close = (o + h + l + c) / 4
+        green = ha_close >= _ha_open_series(o, c, ha_close)
+
+        # Trailing run of the last candle's color: first mismatch scanning backwards
+        rev = green[::-1]
+        changed = rev != rev[0]
+        first = int(np.argmax(changed))
+        count = first if changed[first] else rev.size
+        return {'color': 'green' if rev[0] else 'red', 'count': count}
 
     @staticmethod
     def calculate_realized_volatility(closes, window=20):
-        if len(closes) < window + 1: return 0.5
-        returns = []
-        for i in range(len(closes) - window, len(closes)):
-            if closes[i-1] > 0:
-                returns.append(math.log(closes[i] / closes[i-1]))
-        if not returns: return 0.5
-        std = (sum((r - sum(returns)/len(returns))**2 for r in returns) / len(returns)) ** 0.5
-        return std * math.sqrt(4 * 24 * 365) # Annualize
+        x = np.asarray(closes, dtype=np.float64)
+        if x.size < window + 1: return 0.5
+        prev, curr = x[-window - 1:-1], x[-window:]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            returns = np.log(curr / prev)
+        # Drop bars with a non-positive price on either side
+        returns = returns[np.isfinite(returns) & (prev > 0)]
+        if returns.size == 0: return 0.5
+        return float(returns.std()) * _ANNUALIZE_15M
 
     @staticmethod
     def calculate_weighted_obi(ob, mid_price):
         if not ob.bids or not ob.asks: return 0, 0
-        
-        def weight(price):
-            dist = abs(mid_price - float(price))
-            return 1 / (1 + dist)
+        return Indicators._weighted_depth(ob.bids, mid_price), Indicators._weighted_depth(ob.asks, mid_price)
 
-        weighted_bids = sum(float(b.size) * weight(b.price) for b in ob.bids[:5])
-        weighted_asks = sum(float(a.size) * weight(a.price) for a in ob.asks[:5])
-        return weighted_bids, weighted_asks
+    @staticmethod
+    def _weighted_depth(levels, mid_price, depth=5):
+        """Top-`depth` sizes weighted by 1 / (1 + |mid - price|); NumPy parses the decimal strings in C."""
+        book = np.array([(level.price, level.size) for level in levels[:depth]], dtype=np.float64)
+        return float((book[:, 1] / (1.0 + np.abs(mid_price - book[:, 0]))).sum())
 
 
 class BayesianPredictor:
@@ -216,11 +339,11 @@ class BayesianPredictor:
     def __init__(self, prior_prob=0.5):
         self.prior_log_odds = math.log(prior_prob / (1 - prior_prob))
         self.evidence_log_odds = 0.0
-        self.components = {}
+        self._log_components = {}
 
     def reset(self):
         self.evidence_log_odds = 0.0
-        self.components = {}
+        self._log_components = {}
 
     def add_evidence(self, name, bayes_factor):
         """
@@ -229,19 +352,19 @@ class BayesianPredictor:
         Bayes Factor < 1.0 supports Null (DOWN)
         """
         if bayes_factor <= 0: return # Invalid
-        
-        lo = math.log(bayes_factor)
-        self.evidence_log_odds += lo
-        self.components[name] = bayes_factor
+        self.add_log_evidence(name, math.log(bayes_factor))
+
+    def add_log_evidence(self, name, log_bf):
+        """Same as add_evidence for an already-logged Bayes factor (see the LBF_* constants)."""
+        self.evidence_log_odds += log_bf
+        self._log_components[name] = log_bf
+
+    @property
+    def components(self):
+        return {name: math.exp(lo) for name, lo in self._log_components.items()}
 
     def get_probability(self):
-        total_log_odds = self.prior_log_odds + self.evidence_log_odds
-        try:
-            odds = math.exp(total_log_odds)
-            prob = odds / (1 + odds)
-            return prob
-        except OverflowError:
-            return 1.0 if total_log_odds > 0 else 0.0
+        return _logistic(self.prior_log_odds + self.evidence_log_odds)
 
     def get_components(self):
         return self.components
@@ -317,71 +440,162 @@ class BayesianPredictor:
         and return the final probability.
         """
         predictor = BayesianPredictor()
-        
-        # Access constants via class
-        BP = BayesianPredictor
+        predictor.evidence_log_odds = _bayes_log_odds(
+            price, vwap, vwap_slope, rsi, rsi_slope, macd, ha_color, ha_count,
+            poly_price, poly_spread, vol_up, vol_down, funding_rate, latency_score,
+            moneyness, time_decay, last_close, explain=predictor._log_components,
+        )
+        return predictor.get_probability(), predictor
+
+    @staticmethod
+    def calculate_bayes_prob_fast(
+        price, vwap, vwap_slope,
+        rsi, rsi_slope,
+        macd,
+        ha_color, ha_count,
+        poly_price=None, poly_spread=None,
+        vol_up=0, vol_down=0,
+        funding_rate=0.0,
+        latency_score=0,
+        moneyness=None,
+        time_decay=1.0,
+        fear_greed=50,
+        last_close=None
+    ):
+        """Probability only, same inputs as calculate_bayes_score: no predictor or components dict is built."""
+        # Neutral 0.5 prior -> zero prior log-odds
+        return _logistic(_bayes_log_odds(
+            price, vwap, vwap_slope, rsi, rsi_slope, macd, ha_color, ha_count,
+            poly_price, poly_spread, vol_up, vol_down, funding_rate, latency_score,
+            moneyness, time_decay, last_close,
+        ))
+
+
+# Pre-logged Bayes factors (LBF_X = log(BF_X)): scoring adds constants instead of calling math.log
+for _name in [n for n in vars(BayesianPredictor) if n.startswith("BF_")]:
+    setattr(BayesianPredictor, "L" + _name, math.log(getattr(BayesianPredictor, _name)))
+del _name
+
+
+def _specialize_bayes_score(BP):
+    """Build the scoring kernel with every threshold and log factor bound as a closure constant.
+
+    The returned function is the whole rule set as straight-line code: no class attribute
+    lookups and no predictor object per call. Log factors of fired rules are recorded in
+    `explain` only when a dict is passed.
+    """
+    th_rsi_high, th_rsi_low = BP.TH_RSI_HIGH, BP.TH_RSI_LOW
+    th_poly_spread, th_poly_high, th_poly_low = BP.TH_POLY_SPREAD, BP.TH_POLY_PRICE_HIGH, BP.TH_POLY_PRICE_LOW
+    th_obi = BP.TH_OBI_RATIO
+    th_funding_high, th_funding_low = BP.TH_FUNDING_HIGH, BP.TH_FUNDING_LOW
+    th_trend = BP.TH_TREND_CHANGE
+
+    lbf_trend_strong, lbf_trend_weak = BP.LBF_TREND_STRONG, BP.LBF_TREND_WEAK
+    lbf_slope_up, lbf_slope_down = BP.LBF_SLOPE_UP, BP.LBF_SLOPE_DOWN
+    lbf_mom_strong, lbf_mom_weak = BP.LBF_MOMENTUM_STRONG, BP.LBF_MOMENTUM_WEAK
+    lbf_macd_exp_up, lbf_macd_exp_down = BP.LBF_MACD_EXP_UP, BP.LBF_MACD_EXP_DOWN
+    lbf_macd_trend_up, lbf_macd_trend_down = BP.LBF_MACD_TREND_UP, BP.LBF_MACD_TREND_DOWN
+    lbf_ha_up, lbf_ha_down = BP.LBF_HA_TREND_UP, BP.LBF_HA_TREND_DOWN
+    lbf_itm, lbf_otm = BP.LBF_MONEYNESS_ITM, BP.LBF_MONEYNESS_OTM
+    lbf_crowd_bull, lbf_crowd_bear = BP.LBF_CROWD_BULL, BP.LBF_CROWD_BEAR
+    lbf_obi_bull, lbf_obi_bear = BP.LBF_OBI_BULL, BP.LBF_OBI_BEAR
+    lbf_squeeze_long, lbf_squeeze_short = BP.LBF_SQUEEZE_LONG, BP.LBF_SQUEEZE_SHORT
+    lbf_arb_up, lbf_arb_down = BP.LBF_LATENCY_ARB_UP, BP.LBF_LATENCY_ARB_DOWN
+    lbf_candle_up, lbf_candle_down = BP.LBF_CANDLE_TREND_UP, BP.LBF_CANDLE_TREND_DOWN
+    log = math.log
+
+    def bayes_log_odds(price, vwap, vwap_slope, rsi, rsi_slope, macd, ha_color, ha_count,
+                       poly_price, poly_spread, vol_up, vol_down, funding_rate, latency_score,
+                       moneyness, time_decay, last_close, explain=None):
+        lo = 0.0
 
         # 1. Price vs VWAP (Trend)
         if price and vwap:
-            if price > vwap: predictor.add_evidence("vwap_trend", BP.BF_TREND_STRONG)
-            elif price < vwap: predictor.add_evidence("vwap_trend", BP.BF_TREND_WEAK)
-        
-        if vwap_slope > 0: predictor.add_evidence("vwap_slope", BP.BF_SLOPE_UP)
-        elif vwap_slope < 0: predictor.add_evidence("vwap_slope", BP.BF_SLOPE_DOWN)
+            x = lbf_trend_strong if price > vwap else (lbf_trend_weak if price < vwap else 0.0)
+            if x:
+                lo += x
+                if explain is not None: explain["vwap_trend"] = x
+
+        x = lbf_slope_up if vwap_slope > 0 else (lbf_slope_down if vwap_slope < 0 else 0.0)
+        if x:
+            lo += x
+            if explain is not None: explain["vwap_slope"] = x
 
         # 2. RSI (Momentum)
         if rsi and rsi_slope:
-            if rsi > BP.TH_RSI_HIGH and rsi_slope > 0: predictor.add_evidence("rsi_mom", BP.BF_MOMENTUM_STRONG)
-            elif rsi < BP.TH_RSI_LOW and rsi_slope < 0: predictor.add_evidence("rsi_mom", BP.BF_MOMENTUM_WEAK)
-        
+            x = (lbf_mom_strong if rsi > th_rsi_high and rsi_slope > 0 else
+                 lbf_mom_weak if rsi < th_rsi_low and rsi_slope < 0 else 0.0)
+            if x:
+                lo += x
+                if explain is not None: explain["rsi_mom"] = x
+
         # 3. MACD (Momentum)
         if macd:
-            if macd['hist'] > 0 and macd['hist_delta'] > 0: predictor.add_evidence("macd_exp", BP.BF_MACD_EXP_UP)
-            elif macd['hist'] < 0 and macd['hist_delta'] < 0: predictor.add_evidence("macd_exp", BP.BF_MACD_EXP_DOWN)
-            
-            if macd['macd'] > 0: predictor.add_evidence("macd_trend", BP.BF_MACD_TREND_UP)
-            elif macd['macd'] < 0: predictor.add_evidence("macd_trend", BP.BF_MACD_TREND_DOWN)
+            hist, hist_delta, line = macd['hist'], macd['hist_delta'], macd['macd']
+            x = (lbf_macd_exp_up if hist > 0 and hist_delta > 0 else
+                 lbf_macd_exp_down if hist < 0 and hist_delta < 0 else 0.0)
+            if x:
+                lo += x
+                if explain is not None: explain["macd_exp"] = x
+
+            x = lbf_macd_trend_up if line > 0 else (lbf_macd_trend_down if line < 0 else 0.0)
+            if x:
+                lo += x
+                if explain is not None: explain["macd_trend"] = x
 
         # 4. Heiken Ashi (Trend Consistency)
-        if ha_color == 'green' and ha_count >= 2: predictor.add_evidence("ha_trend", BP.BF_HA_TREND_UP)
-        elif ha_color == 'red' and ha_count >= 2: predictor.add_evidence("ha_trend", BP.BF_HA_TREND_DOWN)
-
-        # 5. Moneyness (Strike Bias)
-        if moneyness is not None:
-            # Time Decay amplification
-            decay_mult = time_decay if time_decay >= 1.0 else 1.0
-            
-            if moneyness > 0: # ITM for UP
-                # If ITM + Late expiry -> Strong confidence it stays ITM
-                bf = BP.BF_MONEYNESS_ITM * decay_mult
-                predictor.add_evidence("moneyness", bf)
-            elif moneyness < 0: # OTM for UP (ITM for DOWN)
-                bf = BP.BF_MONEYNESS_OTM / decay_mult
-                predictor.add_evidence("moneyness", bf)
+        if ha_count >= 2:
+            x = lbf_ha_up if ha_color == 'green' else (lbf_ha_down if ha_color == 'red' else 0.0)
+            if x:
+                lo += x
+                if explain is not None: explain["ha_trend"] = x
+
+        # 5. Moneyness (Strike Bias), amplified by time decay late in the window
+        if moneyness is not None and moneyness != 0:
+            log_decay = log(time_decay) if time_decay > 1.0 else 0.0
+            x = lbf_itm + log_decay if moneyness > 0 else lbf_otm - log_decay
+            lo += x
+            if explain is not None: explain["moneyness"] = x
 
         # 6. Polymarket Wisdom (Crowd)
-        if poly_price and poly_spread and poly_spread < BP.TH_POLY_SPREAD:
-            if poly_price > BP.TH_POLY_PRICE_HIGH: predictor.add_evidence("poly_crowd", BP.BF_CROWD_BULL)
-            elif poly_price < BP.TH_POLY_PRICE_LOW: predictor.add_evidence("poly_crowd", BP.BF_CROWD_BEAR)
+        if poly_price and poly_spread and poly_spread < th_poly_spread:
+            x = lbf_crowd_bull if poly_price > th_poly_high else (lbf_crowd_bear if poly_price < th_poly_low else 0.0)
+            if x:
+                lo += x
+                if explain is not None: explain["poly_crowd"] = x
 
         # 7. OBI (Order Flow)
         if vol_up > 0 and vol_down > 0:
             obi = (vol_up - vol_down) / (vol_up + vol_down)
-            if obi > BP.TH_OBI_RATIO: predictor.add_evidence("obi", BP.BF_OBI_BULL)
-            elif obi < -BP.TH_OBI_RATIO: predictor.add_evidence("obi", BP.BF_OBI_BEAR)
+            x = lbf_obi_bull if obi > th_obi else (lbf_obi_bear if obi < -th_obi else 0.0)
+            if x:
+                lo += x
+                if explain is not None: explain["obi"] = x
 
-        # 8. Funding Rate (Squeeze)
-        if funding_rate < BP.TH_FUNDING_LOW: predictor.add_evidence("funding_squeeze", BP.BF_SQUEEZE_SHORT) # Short Squeeze likely
-        elif funding_rate > BP.TH_FUNDING_HIGH: predictor.add_evidence("funding_squeeze", BP.BF_SQUEEZE_LONG) # Long Squeeze likely
+        # 8. Funding Rate (Squeeze): negative -> short squeeze likely, positive -> long squeeze
+        x = (lbf_squeeze_short if funding_rate < th_funding_low else
+             lbf_squeeze_long if funding_rate > th_funding_high else 0.0)
+        if x:
+            lo += x
+            if explain is not None: explain["funding_squeeze"] = x
+
+        # 9. Latency Arb (Oracle) - STRONGEST SIGNAL: Coinbase leading UP/DOWN
+        x = lbf_arb_up if latency_score > 0 else (lbf_arb_down if latency_score < 0 else 0.0)
+        if x:
+            lo += x
+            if explain is not None: explain["latency_arb"] = x
 
-        # 9. Latency Arb (Oracle) - STRONGEST SIGNAL
-        if latency_score > 0: predictor.add_evidence("latency_arb", BP.BF_LATENCY_ARB_UP) # Coinbase leading UP
-        elif latency_score < 0: predictor.add_evidence("latency_arb", BP.BF_LATENCY_ARB_DOWN) # Coinbase leading DOWN
-        
         # 10. Trend Continuation
         if last_close and price:
             change = (price - last_close) / last_close
-            if change > BP.TH_TREND_CHANGE: predictor.add_evidence("candle_trend", BP.BF_CANDLE_TREND_UP)
-            elif change < -BP.TH_TREND_CHANGE: predictor.add_evidence("candle_trend", BP.BF_CANDLE_TREND_DOWN)
+            x = lbf_candle_up if change > th_trend else (lbf_candle_down if change < -th_trend else 0.0)
+            if x:
+                lo += x
+                if explain is not None: explain["candle_trend"] = x
 
-        return predictor.get_probability(), predictor
+        return lo
+
+    return bayes_log_odds
+
+
+_bayes_log_odds = _specialize_bayes_score(BayesianPredictor)
@@ -1,11 +1,34 @@
 import csv
+import heapq
+import io
 import os
 import json
+from datetime import datetime
+from functools import lru_cache
+from itertools import islice
+from operator import itemgetter
+
+import numpy as np
 from fastapi import FastAPI, Request
-from fastapi.templating import Jinja2Templates
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import FileResponse, HTMLResponse, JSONResponse, Response
+
+# orjson is optional: faster parse of the bot's JSON files and faster API bodies
+try:
+    import orjson
+
+    def _json_loads(data):
+        return orjson.loads(data)
+
+    class FastJSONResponse(JSONResponse):
+        def render(self, content):
+            return orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY)
+except ImportError:
+    def _json_loads(data):
+        return json.loads(data)
 
-app = FastAPI(title="Polymarket Bot Dashboard")
+    FastJSONResponse = JSONResponse
+
+app = FastAPI(title="Polymarket Bot Dashboard", default_response_class=FastJSONResponse)
 
 # Paths
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -16,74 +39,200 @@ SIGNALS_CSV = os.path.join(DATA_DIR, "signals.csv")
 POSITIONS_JSON = os.path.join(DATA_DIR, "positions.json")
 STATE_FILE = os.path.join(BOT_DIR, "dashboard_state.json")
 TEMPLATES_DIR = os.path.join(BASE_DIR, "templates")
+INDEX_HTML = os.path.join(TEMPLATES_DIR, "index.html")
 
-templates = Jinja2Templates(directory=TEMPLATES_DIR)
+# limit-capped CSV reads only look at this much of the file's end (grown for large limits)
+CSV_TAIL_BYTES = 64 * 1024
+CSV_TAIL_BYTES_PER_ROW = 512
 
 
 # --- File Helpers ---
 
+def _file_key(filepath):
+    """(mtime_ns, size) of a file, or None if it is missing; changes whenever the bot rewrites it."""
+    try:
+        st = os.stat(filepath)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+@lru_cache(maxsize=16)
+def _read_csv_cached(filepath, file_key):
+    with open(filepath, "r", newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    rows.reverse()
+    return tuple(rows)
+
+
+@lru_cache(maxsize=16)
+def _read_json_cached(filepath, file_key):
+    with open(filepath, "rb") as f:
+        return _json_loads(f.read())
+
+
+@lru_cache(maxsize=16)
+def _tail_csv_cached(filepath, file_key, limit):
+    """Newest `limit` rows parsed from the header plus the file's last few KB."""
+    size = file_key[1]
+    chunk = max(CSV_TAIL_BYTES, limit * CSV_TAIL_BYTES_PER_ROW)
+    with open(filepath, "rb") as f:
+        header = f.readline()
+        if size - len(header) <= chunk:
+            return _read_csv_cached(filepath, file_key)[:limit]
+        f.seek(size - chunk)
+        # The first line of the chunk is usually cut mid-row; rows never embed newlines
+        lines = [line for line in f.read().split(b"\n")[1:] if line.strip()]
+    if len(lines) < limit:
+        return _read_csv_cached(filepath, file_key)[:limit]
+
+    text = (header + b"\n".join(lines[-limit:])).decode("utf-8")
+    rows = list(csv.DictReader(io.StringIO(text, newline="")))
+    rows.reverse()
+    return tuple(rows)
+
+
 def read_csv(filepath, limit=None):
-    """Read CSV file, return list of dicts (newest first)."""
+    """Read CSV file, return list of dicts (newest first).
+
+    Parsed rows are cached per file version, so polls between writes skip the disk read;
+    with a `limit` only the end of the file is read and parsed.
+    Rows are shared with the cache: treat them as read-only.
+    """
     try:
-        if not os.path.exists(filepath):
+        key = _file_key(filepath)
+        if key is None:
             return []
-        with open(filepath, "r", newline="", encoding="utf-8") as f:
-            rows = list(csv.DictReader(f))
-        rows.reverse()
         if limit:
-            rows = rows[:limit]
-        return rows
+            return list(_tail_csv_cached(filepath, key, limit))
+        return list(_read_csv_cached(filepath, key))
     except Exception:
         return []
 
 
 def read_json(filepath, default=None):
-    """Read JSON file, return default if missing/corrupt."""
+    """Read JSON file, return default if missing/corrupt (cached per file version, read-only)."""
     if default is None:
         default = {}
     try:
-        if os.path.exists(filepath):
-            with open(filepath, "r", encoding="utf-8") as f:
-                return json.load(f)
+        key = _file_key(filepath)
+        if key is not None:
+            return _read_json_cached(filepath, key)
     except (json.JSONDecodeError, IOError):
         pass
     return default
 
 
+@lru_cache(maxsize=4)
+def _trade_stats_cached(filepath, file_key):
+    trades = _read_csv_cached(filepath, file_key)
+    # One pass to pull the columns, then the aggregates are array ops
+    roi = np.fromiter((float(t.get("roi", 0) or 0) for t in trades), dtype=np.float64, count=len(trades))
+    outcome = np.array([(t.get("outcome") or "").upper() for t in trades], dtype=object)
+    sell = np.array([(t.get("side") or "").upper() == "SELL" for t in trades], dtype=bool)
+
+    # Wins/losses from the outcome field (preferred) or ROI sign on unlabelled SELL rows
+    fallback = (outcome == "") & sell
+    wins = int(np.count_nonzero((outcome == "WIN") | (fallback & (roi > 0))))
+    losses = int(np.count_nonzero((outcome == "LOSS") | (fallback & (roi < 0))))
+    return float(roi.sum()), len(trades), wins, losses
+
+
+def trade_stats(filepath):
+    """(total ROI, trade count, wins, losses) for a trades CSV, computed once per file version."""
+    key = _file_key(filepath)
+    if key is None:
+        return 0.0, 0, 0, 0
+    try:
+        return _trade_stats_cached(filepath, key)
+    except Exception:
+        return 0.0, 0, 0, 0
+
+
+def file_etag(*filepaths):
+    """Strong ETag over the versions of `filepaths`; changes whenever any of them is rewritten."""
+    parts = []
+    for filepath in filepaths:
+        key = _file_key(filepath)
+        parts.append("%x-%x" % key if key else "0")
+    return '"%s"' % ".".join(parts)
+
+
+def not_modified(request, etag):
+    """304 response if the client already holds `etag`, else None."""
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    return None
+
+
 def read_live_state():
     return read_json(STATE_FILE)
 
 
+@lru_cache(maxsize=4096)
+def _parse_ts(ts):
+    """ISO-8601 timestamp -> epoch seconds; missing/unparseable sorts last."""
+    try:
+        return datetime.fromisoformat(ts).timestamp()
+    except (TypeError, ValueError):
+        return float("-inf")
+
+
+def _signal_entries(rows):
+    for r in rows:
+        label = r.get("result", "NEUTRAL")
+        score = float(r.get("score", 0) or 0)
+        price = float(r.get("price", 0) or 0)
+        ts = r.get("timestamp", "")
+        yield _parse_ts(ts), {
+            "time": ts,
+            "message": f"Signal: {label} (score {score:.2f}) @ ${price:,.0f}",
+            "type": "signal",
+        }
+
+
+def _trade_entries(rows):
+    for r in rows:
+        roi = float(r.get("roi", 0) or 0)
+        price = float(r.get("price", 0) or 0)
+        size = float(r.get("size", 0) or 0)
+        outcome = r.get("outcome", "")
+        roi_str = f" → PnL: ${roi:.2f}" if roi else ""
+        outcome_badge = f" [{outcome}]" if outcome else ""
+        ts = r.get("timestamp", "")
+        yield _parse_ts(ts), {
+            "time": ts,
+            "message": f"Trade: {r.get('side', '?')} {size:.1f} shares @ ${price:.2f}{roi_str}{outcome_badge}",
+            "type": "trade",
+            "outcome": outcome,
+        }
+
+
 # --- Pages ---
 
 @app.get("/", response_class=HTMLResponse)
-async def read_root(request: Request):
-    return templates.TemplateResponse("index.html", {"request": request})
+def read_root(request: Request):
+    # The page is static (the JS polls the API), so serve the file and let browsers revalidate
+    etag = file_etag(INDEX_HTML)
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+    return FileResponse(INDEX_HTML, media_type="text/html",
+                        headers={"ETag": etag, "Cache-Control": "max-age=60"})
 
 
 # --- API Endpoints ---
+# Plain `def`: these stat/read files, so FastAPI runs them in its threadpool off the event loop
 
 @app.get("/api/stats")
-async def get_stats():
-    trades = read_csv(TRADES_CSV)
-    total_pnl = sum(float(t.get("roi", 0) or 0) for t in trades)
-    trade_count = len(trades)
-
-    # Count wins from outcome field (preferred) or ROI fallback
-    wins = 0
-    losses = 0
-    for t in trades:
-        outcome = t.get("outcome", "").upper()
-        if outcome == "WIN":
-            wins += 1
-        elif outcome == "LOSS":
-            losses += 1
-        elif outcome == "" and t.get("side", "").upper() == "SELL":
-            # Fallback: use ROI if no explicit outcome
-            if float(t.get("roi", 0) or 0) > 0:
-                wins += 1
-            elif float(t.get("roi", 0) or 0) < 0:
-                losses += 1
+def get_stats(request: Request):
+    # Stats only change when the bot rewrites trades or positions
+    etag = file_etag(TRADES_CSV, POSITIONS_JSON)
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+
+    total_pnl, trade_count, wins, losses = trade_stats(TRADES_CSV)
 
     decided = wins + losses
     win_rate = (wins / decided * 100) if decided > 0 else 0.0
@@ -97,7 +246,7 @@ async def get_stats():
         for p in positions
     )
 
-    return {
+    return FastJSONResponse({
         "total_pnl": round(total_pnl, 2),
         "trade_count": trade_count,
         "win_rate": round(win_rate, 1),
@@ -105,11 +254,11 @@ async def get_stats():
         "losses": losses,
         "active_positions": active_positions,
         "total_position_value": round(total_value, 2),
-    }
+    }, headers={"ETag": etag, "Cache-Control": "no-cache"})
 
 
 @app.get("/api/live_state")
-async def get_live_state():
+def get_live_state():
     state = read_live_state()
     if not state:
         return {
@@ -123,12 +272,12 @@ async def get_live_state():
 
 
 @app.get("/api/trades")
-async def get_trades(limit: int = 50):
+def get_trades(limit: int = 50):
     return read_csv(TRADES_CSV, limit=limit)
 
 
 @app.get("/api/positions")
-async def get_positions():
+def get_positions():
     positions = read_json(POSITIONS_JSON, default=[])
     if isinstance(positions, dict):
         positions = [positions] if positions else []
@@ -136,41 +285,21 @@ async def get_positions():
 
 
 @app.get("/api/signals")
-async def get_signals(limit: int = 100):
+def get_signals(limit: int = 100):
     rows = read_csv(SIGNALS_CSV, limit=limit)
     return rows[::-1]  # chronological order for charts
 
 
 @app.get("/api/activity")
-async def get_activity(limit: int = 30):
-    entries = []
-
-    for r in read_csv(SIGNALS_CSV, limit=limit):
-        label = r.get("result", "NEUTRAL")
-        score = float(r.get("score", 0) or 0)
-        price = float(r.get("price", 0) or 0)
-        entries.append({
-            "time": r.get("timestamp", ""),
-            "message": f"Signal: {label} (score {score:.2f}) @ ${price:,.0f}",
-            "type": "signal",
-        })
-
-    for r in read_csv(TRADES_CSV, limit=limit):
-        roi = float(r.get("roi", 0) or 0)
-        price = float(r.get("price", 0) or 0)
-        size = float(r.get("size", 0) or 0)
-        outcome = r.get("outcome", "")
-        roi_str = f" → PnL: ${roi:.2f}" if roi else ""
-        outcome_badge = f" [{outcome}]" if outcome else ""
-        entries.append({
-            "time": r.get("timestamp", ""),
-            "message": f"Trade: {r.get('side', '?')} {size:.1f} shares @ ${price:.2f}{roi_str}{outcome_badge}",
-            "type": "trade",
-            "outcome": outcome,
-        })
-
-    entries.sort(key=lambda x: x["time"] or "", reverse=True)
-    return entries[:limit]
+def get_activity(limit: int = 30):
+    # Both readers return rows newest-first, so a lazy merge on the parsed time yields the
+    # newest `limit` entries without formatting or sorting the rest
+    merged = heapq.merge(
+        _signal_entries(read_csv(SIGNALS_CSV, limit=limit)),
+        _trade_entries(read_csv(TRADES_CSV, limit=limit)),
+        key=itemgetter(0), reverse=True,
+    )
+    return [entry for _, entry in islice(merged, limit)]
 
 
 if __name__ == "__main__":